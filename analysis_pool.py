@@ -0,0 +1,145 @@
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from analysis_store import AnalysisStore
+from analyzer import TextAnalyzer
+from categorizer import CompanyCategorizer
+from corpus import TextCorpus, read_text
+from metrics import Histogram, Metrics
+from records import CompanyAnalysis
+from project_constants import ANALYSIS_BATCH_SIZE
+
+# Result for companies whose website could not be scraped, shared by all of them
+NOT_SCRAPED_RESULT = CompanyAnalysis(category='Not Relevant')
+
+
+def combined_text(data: Dict) -> Optional[str]:
+    """Text analyzed for a scraped page, or None if the page was not scraped"""
+    if not data['status'].startswith('success'):
+        return None
+    return f"{data['title']} {data['description']} {data['content']}"
+
+
+def analyze_combined_text(text: Optional[str], analyzer: TextAnalyzer,
+                          categorizer: CompanyCategorizer) -> CompanyAnalysis:
+    """Analyze and categorize one company's combined text; timings go to the analyzer's metrics"""
+    if text is None:
+        return NOT_SCRAPED_RESULT
+    
+    analysis = analyzer.analyze_text(text)
+    if analyzer.metrics is not None:
+        with analyzer.metrics.time('categorize'):
+            return categorizer.categorize_company(analysis)
+    return categorizer.categorize_company(analysis)
+
+
+# Per-process analyzer state, built once by _init_worker
+_worker_analyzer = None
+_worker_categorizer = None
+
+
+def _init_worker():
+    """Compile keyword patterns once per worker process"""
+    global _worker_analyzer, _worker_categorizer
+    _worker_analyzer = TextAnalyzer(Metrics())
+    _worker_categorizer = CompanyCategorizer()
+
+
+def _analyze_batch(texts: List[str]) -> Tuple[List[CompanyAnalysis], Dict[str, Histogram]]:
+    """Results for a batch, plus the stage timings recorded while analyzing it"""
+    results = [analyze_combined_text(text, _worker_analyzer, _worker_categorizer) for text in texts]
+    return results, _worker_analyzer.metrics.take_stages()
+
+
+def _analyze_spans(path: str, spans: List[Tuple[int, int]]) -> Tuple[List[CompanyAnalysis], Dict[str, Histogram]]:
+    """_analyze_batch for texts read by (offset, length) from the corpus file at path"""
+    return _analyze_batch([read_text(path, offset, length) for offset, length in spans])
+
+
+class AnalysisPool:
+    """
+    Runs TextAnalyzer/CompanyCategorizer work on a pool of worker processes.
+    Pages are sent in batches of combined text to keep IPC cheap; companies that
+    failed to scrape are resolved locally without a round trip.
+    
+    With a corpus, each page's text is appended to it and workers are sent only
+    its (offset, length), reading the text from the memory-mapped corpus file;
+    the text then needs to be kept neither in flight nor in this process.
+    """
+    
+    def __init__(self, workers: int, batch_size: int = ANALYSIS_BATCH_SIZE, metrics: Optional[Metrics] = None,
+                 corpus: Optional[TextCorpus] = None):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.metrics = metrics
+        self.corpus = corpus
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+    
+    def map(self, items: Iterable[Tuple[Any, Dict]],
+            store: Optional[AnalysisStore] = None) -> Iterator[Tuple[Any, CompanyAnalysis]]:
+        """
+        Analyze scraped pages in the pool.
+        
+        Items are consumed lazily and at most 2 * workers batches are in flight,
+        so this works on lists and on streams alike.
+        
+        Args:
+            items: Iterable of (key, scraped_data) pairs; keys stay in this process
+            store: Optional AnalysisStore; stored results are reused and new ones saved.
+                Every scraped text goes to the pool's corpus, if it has one, stored or not
+            
+        Yields:
+            (key, analysis) pairs in completion order, each analysis a
+            categorized CompanyAnalysis
+        """
+        items = iter(items)
+        pending = {}
+        
+        while True:
+            batch = list(islice(items, self.batch_size))
+            if batch:
+                # With a corpus, texts holds corpus document numbers instead of the texts
+                keys, texts = [], []
+                for key, data in batch:
+                    text = combined_text(data)
+                    if text is None:
+                        yield key, NOT_SCRAPED_RESULT
+                        continue
+                    stored = store.get(text) if store is not None else None
+                    if self.corpus is not None:
+                        text = self.corpus.add(data.get('url', ''), text)
+                    if stored is not None:
+                        yield key, stored
+                    else:
+                        keys.append(key)
+                        texts.append(text)
+                if texts and self.corpus is not None:
+                    self.corpus.flush()
+                    spans = [self.corpus.span(doc) for doc in texts]
+                    pending[self.executor.submit(_analyze_spans, self.corpus.path, spans)] = (keys, texts)
+                elif texts:
+                    pending[self.executor.submit(_analyze_batch, texts)] = (keys, texts)
+            
+            if not pending:
+                if not batch:
+                    return
+                continue
+            
+            # Wait for a slot, or drain everything once input is exhausted
+            if batch and len(pending) < self.workers * 2:
+                continue
+            
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                keys, texts = pending.pop(future)
+                results, stages = future.result()
+                if self.metrics is not None:
+                    self.metrics.merge_stages(stages)
+                for key, text, result in zip(keys, texts, results):
+                    if store is not None:
+                        store.put(self.corpus.text(text) if self.corpus is not None else text, result)
+                    yield key, result
+    
+    def close(self):
+        self.executor.shutdown()
@@ -0,0 +1,177 @@
+import os
+from typing import TYPE_CHECKING, Dict, List
+
+from analyzer import TextAnalyzer
+from categorizer import CompanyCategorizer, FLAG_COLUMNS
+from output import COLUMNS
+from records import CompanyAnalysis
+# pyarrow is optional; without it no snapshot is saved and rule tuning is unavailable.
+# It is imported by load_pyarrow() when a snapshot is first written or read.
+import lazy_pyarrow as arrow
+from lazy_pyarrow import load_pyarrow, pyarrow_available
+from project_constants import SNAPSHOT_BATCH_ROWS
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# Keyword categories that set the analysis flags, in FLAG_COLUMNS order
+KEYWORD_CATEGORIES = {flag: category for category, flag in TextAnalyzer.CATEGORY_FLAGS.items()}
+
+
+def _keywords_column(category: str) -> str:
+    return f'keywords_{category}'
+
+
+def snapshot_schema():
+    fields = [('name', arrow.pa.string()), ('website', arrow.pa.string()), ('status', arrow.pa.string()),
+              ('health_segments', arrow.pa.list_(arrow.pa.string()))]
+    fields += [(_keywords_column(KEYWORD_CATEGORIES[flag]), arrow.pa.list_(arrow.pa.string()))
+               for flag in FLAG_COLUMNS]
+    return arrow.pa.schema(fields)
+
+
+def snapshot_available() -> bool:
+    """Whether pyarrow is installed, checked without importing it"""
+    return pyarrow_available()
+
+
+class AnalysisSnapshotWriter:
+    """
+    Writes the per-company analysis of a run (matched keywords per category and
+    health segments) to a zstd-compressed Parquet file, so scoring rules can be
+    re-applied later with rescore_snapshot() without scraping or analyzing again.
+    Rows are written in row groups as they arrive; the file replaces the
+    previous snapshot only when the writer is closed. pyarrow is imported when
+    the first row group is written.
+    """
+    
+    def __init__(self, path: str, batch_rows: int = SNAPSHOT_BATCH_ROWS):
+        if not snapshot_available():
+            raise ImportError("Saving analysis snapshots requires pyarrow")
+        self.path = path
+        self.batch_rows = batch_rows
+        self._tmp_path = f'{path}.tmp'
+        self._schema = None
+        self._writer = None
+        self._closed = False
+        self._rows: List[Dict] = []
+        self.rows_written = 0
+    
+    def _open(self):
+        load_pyarrow()
+        self._schema = snapshot_schema()
+        self._writer = arrow.pq.ParquetWriter(self._tmp_path, self._schema, compression='zstd')
+    
+    def add(self, company: Dict, scraped: Dict, analysis: CompanyAnalysis):
+        """Record one company's analysis result (as returned by analyze_combined_text)"""
+        matched = analysis.matched_keywords
+        row = {
+            'name': company['name'],
+            'website': company['website'],
+            'status': scraped.get('status', 'unknown'),
+            'health_segments': list(analysis.segment_names)
+        }
+        for flag in FLAG_COLUMNS:
+            category = KEYWORD_CATEGORIES[flag]
+            row[_keywords_column(category)] = list(matched.get(category, []))
+    
+        self._rows.append(row)
+        if len(self._rows) >= self.batch_rows:
+            self._flush()
+    
+    def _flush(self):
+        if self._rows:
+            if self._writer is None:
+                self._open()
+            self._writer.write_table(arrow.pa.Table.from_pylist(self._rows, schema=self._schema))
+            self.rows_written += len(self._rows)
+            self._rows = []
+    
+    def close(self):
+        """
+        Write the remaining rows and replace the previous snapshot; a run that
+        recorded no rows keeps the previous snapshot
+        """
+        if self._closed:
+            return
+        self._flush()
+        if self._writer is None:
+            self._closed = True
+            return
+        self._writer.close()
+        self._closed = True
+        os.replace(self._tmp_path, self.path)
+    
+    def discard(self):
+        """Drop the rows of an unfinished run, keeping the previous snapshot"""
+        if self._closed:
+            return
+        if self._writer is not None:
+            self._writer.close()
+            os.remove(self._tmp_path)
+        self._rows = []
+        self._closed = True
+
+
+def _list_has(column, value: str) -> 'np.ndarray':
+    """Per row: does the list column contain value?"""
+    import numpy as np
+    column = column.combine_chunks()
+    hits = np.zeros(len(column), dtype=bool)
+    matches = arrow.pc.fill_null(arrow.pc.equal(column.flatten(), value), False).to_numpy(zero_copy_only=False)
+    parents = arrow.pc.list_parent_indices(column).to_numpy()
+    hits[parents[matches]] = True
+    return hits
+
+
+def _list_lengths(column) -> 'np.ndarray':
+    return arrow.pc.fill_null(arrow.pc.list_value_length(column), 0).to_numpy()
+
+
+def rescore_snapshot(path: str, categorizer: CompanyCategorizer) -> 'pd.DataFrame':
+    """
+    Re-apply a categorizer's weights and thresholds to a saved snapshot.
+
+    Args:
+        path: Parquet file written by AnalysisSnapshotWriter
+        categorizer: Categorizer carrying the scoring rules to apply
+
+    Returns:
+        Report DataFrame with the same COLUMNS as a full run would produce
+    """
+    if not snapshot_available():
+        raise ImportError("Re-scoring analysis snapshots requires pyarrow")
+    import pandas as pd
+    load_pyarrow()
+    snapshot = arrow.pq.read_table(path)
+
+    # Unscraped companies carry no keywords, so all their flags are False and they score 0
+    table = pd.DataFrame({
+        flag: _list_lengths(snapshot[_keywords_column(KEYWORD_CATEGORIES[flag])]) > 0
+        for flag in FLAG_COLUMNS
+    })
+    table['health_segment_count'] = _list_lengths(snapshot['health_segments'])
+    table['distributor_lists_probiotics'] = _list_has(snapshot[_keywords_column('distributor')], 'probiotics')
+
+    scores = categorizer.categorize_batch(table)
+
+    segments = arrow.pc.binary_join(snapshot['health_segments'], ', ').to_pandas()
+    segments = segments.where(segments.fillna('') != '', 'None')
+
+    status = snapshot['status'].to_pandas()
+    report = pd.DataFrame({
+        'Company Name': snapshot['name'].to_pandas(),
+        'Website': snapshot['website'].to_pandas(),
+        'Website Accessible': status.str.startswith('success'),
+        'Category': scores['category'].astype(str),
+        'Relevance Score': scores['relevance_score'],
+        'Is F&B': table['is_fb'],
+        'Mentions Probiotics': table['mentions_probiotics'],
+        'Health Segments': segments,
+        'Is Manufacturer': table['is_manufacturer'],
+        'Is Brand': table['is_brand'],
+        'Is Distributor': table['is_distributor'],
+        'Scraping Status': status
+    })
+    return report[COLUMNS]
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import Counter
+from typing import Dict, Optional
+
+from records import CompanyAnalysis
+from project_constants import KEYWORDS
+
+# Bump when analyzer/categorizer logic changes so stored results are recomputed
+STORE_VERSION = 1
+
+
+def rules_fingerprint(scoring_weights: Dict, min_scores: Dict, keywords: Dict = None) -> str:
+    """Hash of everything besides the page text that determines an analysis result"""
+    rules = {
+        'version': STORE_VERSION,
+        'keywords': keywords or KEYWORDS,
+        'scoring_weights': scoring_weights,
+        'min_scores': min_scores
+    }
+    return hashlib.sha256(json.dumps(rules, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+class AnalysisStore:
+    """
+    Persistent SQLite store of combined analysis/categorization results.
+    Results are keyed by a hash of the analyzed text and the rules fingerprint,
+    so a company is only re-analyzed when its text or the rules change.
+    Results stored under other fingerprints are dropped when the store is opened.
+    """
+    
+    COMMIT_EVERY = 500
+    
+    def __init__(self, path: str, fingerprint: str):
+        self.path = path
+        self.fingerprint = fingerprint
+        # Counts of 'reused' and 'computed' results
+        self.stats = Counter()
+        
+        self._lock = threading.Lock()
+        self._uncommitted = 0
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS analyses (
+                text_hash TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                result TEXT NOT NULL
+            )
+        """)
+        self._db.execute("DELETE FROM analyses WHERE fingerprint != ?", (fingerprint,))
+        self._db.commit()
+    
+    def get(self, text: str) -> Optional[CompanyAnalysis]:
+        """Stored result for this text under the current rules, or None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT result FROM analyses WHERE text_hash = ? AND fingerprint = ?",
+                (text_hash(text), self.fingerprint)
+            ).fetchone()
+        if row is None:
+            return None
+        
+        self.stats['reused'] += 1
+        return CompanyAnalysis.from_dict(json.loads(row[0]))
+    
+    def put(self, text: str, result: CompanyAnalysis):
+        """Store a freshly computed result for this text"""
+        self.stats['computed'] += 1
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO analyses VALUES (?, ?, ?)",
+                (text_hash(text), self.fingerprint, json.dumps(result.to_dict()))
+            )
+            self._uncommitted += 1
+            if self._uncommitted >= self.COMMIT_EVERY:
+                self._db.commit()
+                self._uncommitted = 0
+    
+    def close(self):
+        with self._lock:
+            self._db.commit()
+            self._db.close()
@@ -1,30 +1,130 @@
 import re
-from typing import Dict, List
+import time
+from typing import Dict, List, Optional
 from collections import defaultdict
 
+from metrics import Metrics
+from records import CompanyAnalysis, FLAG_BITS, segment_mask
 from project_constants import HEADERS, TIMEOUT, KEYWORDS
 
+
+class KeywordMatcher:
+    """
+    Single-pass keyword matcher built as a token trie over KEYWORDS.
+    Every category and health segment is matched in one scan of cleaned text,
+    following the same leftmost, first-listed-keyword-wins rules as a
+    per-category r'\\b(?:kw1|kw2|...)\\b' regex.
+    """
+
+    _WORD = re.compile(r'\w+')
+    _GROUP = re.compile(r'\(([^()]*\|[^()]*)\)')
+
+    def __init__(self, keywords: Dict = None):
+        self.root = {}
+        self.keys = []
+
+        for category, category_keywords in (keywords or KEYWORDS).items():
+            if isinstance(category_keywords, dict):  # Health segments
+                for segment, seg_keywords in category_keywords.items():
+                    self._add_keywords(f"{category}_{segment}", seg_keywords)
+            else:
+                self._add_keywords(category, category_keywords)
+
+    def _expand(self, keyword: str) -> List[str]:
+        """Expand simple alternation groups such as 'cm(o|os)' into plain keywords"""
+        group = self._GROUP.search(keyword)
+        if not group:
+            return [keyword]
+
+        variants = []
+        for option in group.group(1).split('|'):
+            variants.extend(self._expand(keyword[:group.start()] + option + keyword[group.end():]))
+        return variants
+
+    def _add_keywords(self, key: str, keywords: List[str]):
+        self.keys.append(key)
+
+        for order, keyword in enumerate(keywords):
+            for variant in self._expand(keyword.lower()):
+                tokens = variant.split()
+                # Cleaned text only contains word characters, so e.g. 'gut-brain' can never match
+                if not tokens or not all(self._WORD.fullmatch(token) for token in tokens):
+                    continue
+
+                node = self.root
+                for token in tokens:
+                    node = node.setdefault(token, {})
+                node.setdefault(None, []).append((key, order, len(tokens), variant))
+
+    def match(self, text: str) -> Dict[str, List[str]]:
+        """
+        Find keywords for all categories in a single pass.
+
+        Args:
+            text: Text already normalized by TextAnalyzer.clean_text()
+
+        Returns:
+            Dictionary mapping category keys (e.g. 'f&b', 'health_segments_gut_health')
+            to unique matched keywords, for categories with at least one match
+        """
+        tokens = text.split()
+        total = len(tokens)
+        root = self.root
+        resume_at = {}
+        found = defaultdict(dict)
+
+        for start, token in enumerate(tokens):
+            node = root.get(token)
+            if node is None:
+                continue
+
+            # Collect the preferred keyword per category starting at this token
+            best = {}
+            end = start
+            while True:
+                for key, order, length, keyword in node.get(None, ()):
+                    if resume_at.get(key, 0) <= start and (key not in best or order < best[key][0]):
+                        best[key] = (order, length, keyword)
+                end += 1
+                if end == total:
+                    break
+                node = node.get(tokens[end])
+                if node is None:
+                    break
+
+            for key, (order, length, keyword) in best.items():
+                resume_at[key] = start + length
+                found[key][keyword] = None
+
+        return {key: list(keywords) for key, keywords in found.items()}
+
+
 class TextAnalyzer:
     """
     Analyzes scraped text content to identify relevant keywords and patterns.
     Implements text cleaning, keyword matching, and health segment detection.
     """
+
+    # Category -> analysis flag set when the category has matches
+    CATEGORY_FLAGS = {
+        'f&b': 'is_fb',
+        'probiotics': 'mentions_probiotics',
+        'manufacturer': 'is_manufacturer',
+        'brand': 'is_brand',
+        'distributor': 'is_distributor'
+    }
     
-    def __init__(self):
+    def __init__(self, metrics: Optional[Metrics] = None):
+        """
+        Args:
+            metrics: Optional run metrics receiving clean and match times
+        """
+        self.metrics = metrics
         self._compile_keyword_patterns()
         
     def _compile_keyword_patterns(self):
-        """Pre-compile regex patterns for faster matching"""
-        self.compiled_patterns = {}
-        
-        for category, keywords in KEYWORDS.items():
-            if isinstance(keywords, dict):  # Health segments
-                for segment, seg_keywords in keywords.items():
-                    pattern = re.compile(r'\b(?:' + '|'.join(seg_keywords) + r')\b', re.IGNORECASE)
-                    self.compiled_patterns[f"{category}_{segment}"] = pattern
-            else:
-                pattern = re.compile(r'\b(?:' + '|'.join(keywords) + r')\b', re.IGNORECASE)
-                self.compiled_patterns[category] = pattern
+        """Pre-compile the keyword trie for single-pass matching"""
+        self.matcher = KeywordMatcher(KEYWORDS)
     
     def clean_text(self, text: str) -> str:
         """Normalize and clean text for analysis"""
@@ -51,12 +151,10 @@ class TextAnalyzer:
         Returns:
             List of matched keywords
         """
-        text = self.clean_text(text)
-        if category not in self.compiled_patterns:
+        if category not in self.matcher.keys:
             return []
         
-        matches = self.compiled_patterns[category].findall(text)
-        return list(set(matches))  # Return unique matches
+        return self.matcher.match(self.clean_text(text)).get(category, [])
     
     def detect_health_segments(self, text: str) -> Dict[str, List[str]]:
         """
@@ -65,62 +163,55 @@ class TextAnalyzer:
         Returns:
             Dictionary with segment names as keys and lists of matched keywords as values
         """
-        text = self.clean_text(text)
+        return self._health_segments(self.matcher.match(self.clean_text(text)))
+
+    def _health_segments(self, matches: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """Pick health segment hits out of KeywordMatcher.match() results"""
         segments = {}
         
         for segment in KEYWORDS['health_segments'].keys():
             pattern_key = f"health_segments_{segment}"
-            matches = self.compiled_patterns[pattern_key].findall(text)
-            if matches:
-                segments[segment] = list(set(matches))
+            if pattern_key in matches:
+                segments[segment] = matches[pattern_key]
         
         return segments
     
-    def analyze_text(self, text: str) -> Dict:
+    def analyze_text(self, text: str) -> CompanyAnalysis:
         """
         Perform complete text analysis for all categories.
         
+        The text is cleaned once and scanned once for all categories.
+        
         Returns:
-            Dictionary with analysis results including:
+            Uncategorized CompanyAnalysis with:
             - is_fb: Boolean if F&B company
             - mentions_probiotics: Boolean if probiotics mentioned
-            - health_segments: Detected health segments
+            - segments: Bitmask of detected health segments
             - is_manufacturer: Boolean if manufacturer
             - is_brand: Boolean if brand
             - is_distributor: Boolean if distributor
+            - matched_keywords: Matched keywords of each category that matched
         """
-        analysis = {
-            'is_fb': False,
-            'mentions_probiotics': False,
-            'health_segments': {},
-            'is_manufacturer': False,
-            'is_brand': False,
-            'is_distributor': False,
-            'matched_keywords': defaultdict(list)
-        }
+        analysis = CompanyAnalysis()
         
         if not text:
             return analysis
         
+        start = time.perf_counter()
+        cleaned = self.clean_text(text)
+        cleaned_at = time.perf_counter()
+        matches = self.matcher.match(cleaned)
+        if self.metrics is not None:
+            self.metrics.observe('clean', cleaned_at - start)
+            self.metrics.observe('match', time.perf_counter() - cleaned_at)
+        
         # Check each category
-        for category in ['f&b', 'probiotics', 'manufacturer', 'brand', 'distributor']:
-            matches = self.find_keywords(text, category)
-            if matches:
-                analysis['matched_keywords'][category] = matches
-                
-                # Set flags for important categories
-                if category == 'f&b':
-                    analysis['is_fb'] = True
-                elif category == 'probiotics':
-                    analysis['mentions_probiotics'] = True
-                elif category == 'manufacturer':
-                    analysis['is_manufacturer'] = True
-                elif category == 'brand':
-                    analysis['is_brand'] = True
-                elif category == 'distributor':
-                    analysis['is_distributor'] = True
+        for category, flag in self.CATEGORY_FLAGS.items():
+            if category in matches:
+                analysis.matched_keywords[category] = matches[category]
+                analysis.flags |= FLAG_BITS[flag]
         
         # Detect health segments
-        analysis['health_segments'] = self.detect_health_segments(text)
+        analysis.segments = segment_mask(self._health_segments(matches))
         
-        return analysis
\ No newline at end of file
+        return analysis
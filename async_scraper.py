@@ -0,0 +1,329 @@
+import asyncio
+import queue
+import socket
+import threading
+import time
+from collections import defaultdict
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+from aiohttp.abc import AbstractResolver
+
+from politeness import robots_url
+from retry import network_errors
+from project_constants import (HEADERS, TIMEOUT, ASYNC_MAX_CONCURRENCY, ASYNC_MAX_PER_HOST,
+                               DOWNLOAD_CHUNK_SIZE, ROBOTS_MAX_BYTES)
+
+# Marks the end of AsyncFetchEngine results
+_DONE = object()
+
+class _CachedResolver(AbstractResolver):
+    """aiohttp resolver backed by the scraper's DnsCache, looking up misses in a worker thread"""
+    
+    def __init__(self, dns_cache):
+        self.dns_cache = dns_cache
+    
+    async def resolve(self, host: str, port: int = 0, family: socket.AddressFamily = socket.AF_INET) -> List[Dict]:
+        addresses = self.dns_cache.lookup(host)
+        if addresses is None:
+            addresses = await asyncio.get_running_loop().run_in_executor(None, self.dns_cache.resolve, host)
+        return [{'hostname': host, 'host': address, 'port': port, 'family': address_family, 'proto': 0,
+                 'flags': socket.AI_NUMERICHOST | socket.AI_NUMERICSERV}
+                for address_family, address in addresses if family in (0, address_family)]
+    
+    async def close(self):
+        pass
+
+class AsyncFetchEngine:
+    """
+    asyncio fetch engine for WebsiteScraper.
+    Keeps many requests in flight on a single thread instead of one blocked
+    thread per request, with a global concurrency limit, a per-host concurrency
+    limit, and the scraper's per-host rate limiter and robots.txt cache.
+    """
+    
+    def __init__(self, scraper, max_concurrency: int = ASYNC_MAX_CONCURRENCY,
+                 max_per_host: int = ASYNC_MAX_PER_HOST):
+        self.scraper = scraper
+        self.max_concurrency = max_concurrency
+        self.max_per_host = max_per_host
+    
+    async def _wait_for_host(self, host: str):
+        """Sleep until the scraper's rate limiter lets a request to this host through"""
+        delay = self.scraper.rate_limiter.reserve(host)
+        if delay:
+            self.scraper.metrics.observe('throttle', delay)
+            await asyncio.sleep(delay)
+    
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        """
+        Request tracing that records connect and time-to-first-byte in the
+        scraper's metrics (DNS lookups are recorded by its DnsCache). Connect
+        excludes the DNS lookup it starts with, and time to first byte excludes
+        connection setup.
+        """
+        metrics = self.scraper.metrics
+        trace = aiohttp.TraceConfig()
+        
+        async def on_request_start(session, ctx, params):
+            ctx.start = time.perf_counter()
+            ctx.setup = 0.0
+        
+        async def on_connection_create_start(session, ctx, params):
+            ctx.connect_start = time.perf_counter()
+            ctx.dns = 0.0
+        
+        async def on_dns_resolvehost_start(session, ctx, params):
+            ctx.dns_start = time.perf_counter()
+        
+        async def on_dns_resolvehost_end(session, ctx, params):
+            ctx.dns = time.perf_counter() - ctx.dns_start
+        
+        async def on_connection_create_end(session, ctx, params):
+            elapsed = time.perf_counter() - ctx.connect_start
+            metrics.observe('connect', elapsed - ctx.dns)
+            ctx.setup += elapsed
+        
+        async def on_request_end(session, ctx, params):
+            metrics.observe('ttfb', time.perf_counter() - ctx.start - ctx.setup)
+        
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_create_start.append(on_connection_create_start)
+        trace.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+        trace.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_request_end.append(on_request_end)
+        return trace
+    
+    async def _read_body(self, response: aiohttp.ClientResponse, limit: Optional[int] = None) -> Tuple[bytes, bool]:
+        """Read a response body up to limit (the scraper's max_download_bytes); returns (body, truncated)"""
+        limit = limit or self.scraper.max_download_bytes
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > limit:
+                return b''.join(chunks)[:limit], True
+        return b''.join(chunks), False
+    
+    async def _robots_rules(self, session: aiohttp.ClientSession, url: str, host: str):
+        """
+        The site's robots.txt rules from the scraper's cache, fetched once per
+        site on a miss. As in WebsiteScraper._fetch_robots, a connection error
+        or timeout allows everything for a while rather than failing the page.
+        """
+        robots = self.scraper.robots
+        rules = robots.lookup(url)
+        if rules is not None:
+            return rules
+        
+        async with self._robots_locks[robots_url(url)]:
+            rules = robots.lookup(url)
+            if rules is not None:
+                return rules
+            headers = HEADERS.copy()
+            headers['User-Agent'] = self.scraper.ua.random
+            async with self._host_limits[host]:
+                await self._wait_for_host(host)
+                async with self._global_limit:
+                    try:
+                        async with session.get(robots_url(url), headers=headers, allow_redirects=True) as response:
+                            body = (await self._read_body(response, ROBOTS_MAX_BYTES))[0] if response.ok else b''
+                    except network_errors():
+                        self.scraper.metrics.count('robots_errors')
+                        return robots.store(url, None, b'')
+            self.scraper.metrics.count('robots_fetched')
+            return robots.store(url, response.status, body)
+    
+    async def _fetch_once(self, session: aiohttp.ClientSession, url: str) -> Tuple[bytes, bool]:
+        """
+        Single download attempt, guarded by the scraper's per-host circuit
+        breaker and rate limit and by the site's robots.txt
+        """
+        cache = self.scraper.cache
+        cached = cache.get(url) if cache is not None else None
+        if cached is not None and cached.fresh:
+            return cached.body, False
+        
+        host = urlparse(url).netloc.lower()
+        breaker = self.scraper.breaker
+        
+        # Rotate user agent
+        headers = HEADERS.copy()
+        headers['User-Agent'] = self.scraper.ua.random
+        if cached is not None:
+            headers.update(cache.validators(cached))
+        
+        metrics = self.scraper.metrics
+        breaker.before_request(host)
+        try:
+            if self.scraper.robots is not None:
+                self.scraper._check_robots(url, host, await self._robots_rules(session, url, host))
+            async with self._host_limits[host]:
+                await self._wait_for_host(host)
+                async with self._global_limit:
+                    start = time.perf_counter()
+                    async with session.get(url, headers=headers, allow_redirects=True) as response:
+                        if cached is not None and response.status == 304:
+                            cache.refresh(url)
+                            content, truncated = cached.body, False
+                        else:
+                            response.raise_for_status()
+                            self.scraper._check_content_type(response.headers.get('Content-Type'))
+                            download_start = time.perf_counter()
+                            content, truncated = await self._read_body(response)
+                            metrics.observe('download', time.perf_counter() - download_start)
+                            metrics.count('bytes_fetched', len(content))
+                            if cache is not None:
+                                cache.stats['miss'] += 1
+                                if not truncated:
+                                    cache.put(url, content, response.headers.get('ETag'),
+                                              response.headers.get('Last-Modified'))
+        except Exception as e:
+            metrics.count('fetch_errors')
+            self.scraper._throttled(host, e)
+            breaker.record(host, e)
+            raise
+        
+        metrics.observe_host(host, time.perf_counter() - start)
+        metrics.count('pages_fetched')
+        breaker.record(host)
+        return content, truncated
+    
+    async def _scrape_single_page(self, session: aiohttp.ClientSession, url: str) -> Dict:
+        """Scrape a single webpage, retrying as the scraper's retry policy allows"""
+        loop = asyncio.get_running_loop()
+        policy = self.scraper.retry_policy
+        
+        for attempt in range(policy.attempts):
+            try:
+                content, truncated = await self._fetch_once(session, url)
+                
+                # Parse off the event loop so other fetches keep progressing
+                result = await loop.run_in_executor(None, self.scraper._parse_page, content, url)
+                return self.scraper._mark_truncated(result) if truncated else result
+                
+            except Exception as e:
+                delay = policy.delay(attempt, e) if attempt + 1 < policy.attempts else None
+                if delay is None:
+                    return self.scraper._failed_result(url, e)
+                self.scraper.metrics.count('retries')
+                await asyncio.sleep(delay)  # Backoff holds no semaphore
+    
+    async def _scrape_company(self, session: aiohttp.ClientSession, company: Dict) -> Tuple[Dict, Dict]:
+        try:
+            return company, await self._scrape_single_page(session, company['website'])
+        except Exception as e:
+            return company, self.scraper._failed_result(company['website'], e)
+    
+    async def _scrape_into_queue(self, companies: Iterable[Dict], results: queue.Queue, max_waiting: int):
+        """
+        Scrape companies with at most max_concurrency pages in flight, putting
+        (company, scraped_data) on results as each finishes. Each result takes
+        one of max_waiting slots until the consumer has taken it, and companies
+        are only pulled from the iterable as pages finish.
+        """
+        loop = asyncio.get_running_loop()
+        self._waiting_slots = slots = asyncio.Semaphore(max_waiting)
+        self._global_limit = asyncio.Semaphore(self.max_concurrency)
+        self._host_limits = defaultdict(lambda: asyncio.Semaphore(self.max_per_host))
+        self._robots_locks = defaultdict(asyncio.Lock)
+        
+        # (company, failed result or None); reading the companies and pre-resolution block, so they run off the loop
+        entries = self.scraper._preresolved(companies)
+        
+        # The scraper's DnsCache replaces aiohttp's own
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.max_per_host,
+                                         resolver=_CachedResolver(self.scraper.dns_cache), use_dns_cache=False)
+        timeout = aiohttp.ClientTimeout(total=TIMEOUT)
+        
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         trace_configs=[self._trace_config()]) as session:
+            pending = set()
+            exhausted = False
+            try:
+                while True:
+                    wanted = self.max_concurrency - len(pending)
+                    if not exhausted and wanted > 0:
+                        batch = await loop.run_in_executor(None, list, islice(entries, wanted))
+                        exhausted = len(batch) < wanted
+                        for company, failed in batch:
+                            if failed is not None:
+                                await slots.acquire()
+                                results.put((company, failed))
+                            else:
+                                pending.add(asyncio.ensure_future(self._scrape_company(session, company)))
+                    
+                    if not pending:
+                        if exhausted:
+                            return
+                        continue
+                    
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        await slots.acquire()
+                        results.put(task.result())
+            finally:
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+    
+    def iter_scrape_websites(self, companies: Iterable[Dict],
+                             max_waiting: Optional[int] = None) -> Iterator[Tuple[Dict, Dict]]:
+        """
+        Scrape websites concurrently on an event loop in a background thread,
+        yielding results as they complete.
+        
+        At most max_concurrency pages are in flight and max_waiting finished
+        ones wait to be consumed, so memory stays bounded however many
+        companies there are. Stopping early cancels the requests in flight.
+        
+        Args:
+            companies: Iterable of companies with 'name' and 'website' keys
+            max_waiting: Finished results held for the consumer; 2 * the
+                scraper's max_workers by default
+            
+        Yields:
+            (company, scraped_data) tuples in completion order
+        """
+        results = queue.Queue()
+        loop = asyncio.new_event_loop()
+        task = loop.create_task(self._scrape_into_queue(companies, results,
+                                                        max_waiting or 2 * self.scraper.max_workers))
+        
+        def run():
+            try:
+                loop.run_until_complete(task)
+            except asyncio.CancelledError:
+                pass
+            except BaseException as e:
+                results.put(e)
+            finally:
+                loop.close()
+                results.put(_DONE)
+        
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        finished = False
+        try:
+            for item in iter(results.get, _DONE):
+                if isinstance(item, BaseException):
+                    raise item
+                try:
+                    loop.call_soon_threadsafe(self._waiting_slots.release)
+                except RuntimeError:
+                    pass  # The loop has finished; nothing waits for a slot
+                yield item
+            finished = True
+        finally:
+            if not finished:
+                try:
+                    loop.call_soon_threadsafe(task.cancel)
+                except RuntimeError:
+                    pass
+                while results.get() is not _DONE:
+                    pass
+            thread.join()
@@ -0,0 +1,59 @@
+"""
+Scaling benchmark for process-pool text analysis.
+
+Analyzes a synthetic corpus of scraped pages in the main process and with
+AnalysisPool at 1, 2, 4 and 8 workers, reporting pages per second.
+
+Usage:
+    python benchmarks/bench_analysis_pool.py [--pages 400] [--page-kb 200]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import argparse
+
+from analyzer import TextAnalyzer
+from categorizer import CompanyCategorizer
+from analysis_pool import AnalysisPool, analyze_combined_text, combined_text
+from bench_analyzer import synthetic_page
+
+
+def synthetic_corpus(pages: int, page_kb: int) -> list:
+    return [
+        (i, {'title': f'Company {i}', 'description': '', 'status': 'success',
+             'content': synthetic_page(page_kb / 1024, seed=i)})
+        for i in range(pages)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=400)
+    parser.add_argument('--page-kb', type=int, default=200)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.pages, args.page_kb)
+    print(f"{args.pages} pages of {args.page_kb} KB, {os.cpu_count()} CPUs")
+
+    analyzer, categorizer = TextAnalyzer(), CompanyCategorizer()
+    start = time.perf_counter()
+    for _, data in corpus:
+        analyze_combined_text(combined_text(data), analyzer, categorizer)
+    serial = args.pages / (time.perf_counter() - start)
+    print(f"{'serial':>10}: {serial:8.1f} pages/s")
+
+    for workers in args.workers:
+        pool = AnalysisPool(workers)
+        start = time.perf_counter()
+        results = dict(pool.map(corpus))
+        rate = args.pages / (time.perf_counter() - start)
+        pool.close()
+        assert len(results) == args.pages
+        print(f"{workers:>2} workers: {rate:8.1f} pages/s ({rate / serial:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
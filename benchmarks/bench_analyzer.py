@@ -0,0 +1,100 @@
+"""
+Micro-benchmark for TextAnalyzer.analyze_text on multi-megabyte pages.
+
+Compares the single-pass KeywordMatcher path against the previous approach
+of cleaning the text and running one regex per category.
+
+Usage:
+    python benchmarks/bench_analyzer.py [--sizes 1 4 8] [--repeat 3]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import re
+import time
+import random
+import argparse
+
+from analyzer import TextAnalyzer
+from project_constants import KEYWORDS
+
+FILLER = ['the', 'company', 'global', 'leader', 'innovation', 'quality', 'team',
+          'customers', 'solutions', 'research', 'world', 'people', 'values']
+
+
+def legacy_analyze(analyzer: TextAnalyzer, patterns: dict, text: str) -> dict:
+    """Previous analyze_text: one clean_text + one regex scan per category"""
+    matched = {}
+    for category in ['f&b', 'probiotics', 'manufacturer', 'brand', 'distributor']:
+        matches = patterns[category].findall(analyzer.clean_text(text))
+        if matches:
+            matched[category] = list(set(matches))
+
+    cleaned = analyzer.clean_text(text)
+    for segment in KEYWORDS['health_segments']:
+        matches = patterns[f"health_segments_{segment}"].findall(cleaned)
+        if matches:
+            matched[segment] = list(set(matches))
+    return matched
+
+
+def legacy_patterns() -> dict:
+    patterns = {}
+    for category, keywords in KEYWORDS.items():
+        if isinstance(keywords, dict):
+            for segment, seg_keywords in keywords.items():
+                patterns[f"{category}_{segment}"] = re.compile(r'\b(?:' + '|'.join(seg_keywords) + r')\b', re.IGNORECASE)
+        else:
+            patterns[category] = re.compile(r'\b(?:' + '|'.join(keywords) + r')\b', re.IGNORECASE)
+    return patterns
+
+
+def synthetic_page(size_mb: float, keyword_density: float = 0.02, seed: int = 0) -> str:
+    """Build a page of roughly size_mb megabytes with sprinkled keywords"""
+    rng = random.Random(seed)
+    keywords = []
+    for value in KEYWORDS.values():
+        for kw in (value.values() if isinstance(value, dict) else [value]):
+            keywords.extend(kw)
+
+    words = []
+    size = 0
+    target = int(size_mb * 1024 * 1024)
+    while size < target:
+        word = rng.choice(keywords) if rng.random() < keyword_density else rng.choice(FILLER)
+        if rng.random() < 0.1:
+            word = word.capitalize() + rng.choice(['.', ',', ' -', ':'])
+        words.append(word)
+        size += len(word) + 1
+    return ' '.join(words)
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=float, nargs='+', default=[1, 4, 8], help='Page sizes in MB')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    analyzer = TextAnalyzer()
+    patterns = legacy_patterns()
+
+    print(f"{'size':>8} {'legacy (s)':>12} {'single-pass (s)':>16} {'speedup':>8}")
+    for size_mb in args.sizes:
+        page = synthetic_page(size_mb)
+        legacy = best_of(lambda: legacy_analyze(analyzer, patterns, page), args.repeat)
+        current = best_of(lambda: analyzer.analyze_text(page), args.repeat)
+        print(f"{size_mb:>6.1f}MB {legacy:>12.3f} {current:>16.3f} {legacy / current:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark and equivalence check for batch categorization.
+
+Builds random analysis records, scores them with categorize_company one by
+one and with categorize_batch over an analysis table, checks that every
+category and score is identical, and reports the time for each. Each round
+uses freshly randomized weights and thresholds, as when rules are tuned.
+
+Usage:
+    python benchmarks/bench_categorizer.py [--companies 1000000] [--rounds 3]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import random
+import argparse
+
+from categorizer import CompanyCategorizer, FLAG_COLUMNS, analysis_table
+from records import CompanyAnalysis, FLAG_BITS, SEGMENTS, segment_mask
+
+
+def random_analyses(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    analyses = []
+    for _ in range(count):
+        flags = sum(FLAG_BITS[name] for name in FLAG_COLUMNS if rng.random() < 0.4)
+        segments = segment_mask(segment for segment in SEGMENTS if rng.random() < 0.25)
+        matched = {'distributor': ['probiotics'] if rng.random() < 0.05 else ['supply']}
+        analyses.append(CompanyAnalysis(flags, segments, matched))
+    return analyses
+
+
+def randomize_rules(categorizer: CompanyCategorizer, rng: random.Random):
+    for key in categorizer.scoring_weights:
+        categorizer.scoring_weights[key] = rng.choice([0, 0.1, 0.3, 0.5, 0.7, 1, 1.5, 2, 2.25, 1 / 3])
+    for key in categorizer.min_scores:
+        categorizer.min_scores[key] = rng.choice([1, 1.5, 2, 2.5, 3, 3.3, 4])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--companies', type=int, default=1_000_000)
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    analyses = random_analyses(args.companies)
+    start = time.perf_counter()
+    table = analysis_table(analyses)
+    print(f"{args.companies} companies, analysis table built in {time.perf_counter() - start:.2f}s")
+
+    categorizer = CompanyCategorizer()
+    rng = random.Random(1)
+    for round_number in range(args.rounds):
+        if round_number:
+            randomize_rules(categorizer, rng)
+
+        start = time.perf_counter()
+        for analysis in analyses:
+            categorizer.categorize_company(analysis)
+        scalar_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = categorizer.categorize_batch(table)
+        batch_time = time.perf_counter() - start
+
+        categories = batch['category'].tolist()
+        scores = batch['relevance_score'].tolist()
+        relevant = batch['is_relevant'].tolist()
+        mismatches = sum(
+            (a.category, a.relevance_score, a.is_relevant) != (c, r, v)
+            for a, c, r, v in zip(analyses, categories, scores, relevant)
+        )
+        print(f"round {round_number}: scalar {scalar_time:6.2f}s, batch {batch_time:6.3f}s "
+              f"({scalar_time / batch_time:.0f}x), {mismatches} mismatches")
+        assert mismatches == 0
+
+
+if __name__ == "__main__":
+    main()
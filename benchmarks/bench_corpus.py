@@ -0,0 +1,84 @@
+"""
+Page text handoff to analysis workers: pickled copies vs. a mapped corpus.
+
+Feeds synthetic scraped pages through AnalysisPool the way a run does,
+keeping every company's scraped data until the end (as process_companies does
+for the report), once sending the text itself to the workers and once through
+a TextCorpus, whose pages are dropped from the scraped data once analyzed.
+Each mode runs in a fresh process and reports pages per second and its peak
+resident memory.
+
+Usage:
+    python benchmarks/bench_corpus.py [--pages 2000] [--page-kb 100] [--workers 4]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import time
+import argparse
+import resource
+import subprocess
+
+from analysis_pool import AnalysisPool
+from corpus import TextCorpus
+from bench_analyzer import synthetic_page
+
+MODES = ('copies', 'corpus')
+
+
+def scraped_pages(pages: int, page_kb: int):
+    """Distinct page texts, built from a few generated pages so setup stays fast"""
+    bases = [synthetic_page(page_kb / 1024, seed=seed) for seed in range(16)]
+    for i in range(pages):
+        yield i, {'title': f'Company {i}', 'description': '', 'status': 'success',
+                  'url': f'https://company-{i}.example', 'content': f'{bases[i % len(bases)]} company {i}'}
+
+
+def run_mode(mode: str, args) -> dict:
+    corpus = TextCorpus() if mode == 'corpus' else None
+    pool = AnalysisPool(args.workers, corpus=corpus)
+    kept = {}
+
+    def arriving():
+        for key, data in scraped_pages(args.pages, args.page_kb):
+            kept[key] = data
+            yield key, data
+
+    start = time.perf_counter()
+    for key, _ in pool.map(arriving()):
+        if corpus is not None:
+            kept[key].pop('content')
+    elapsed = time.perf_counter() - start
+
+    pool.close()
+    if corpus is not None:
+        corpus.close()
+    return {'pages_per_second': args.pages / elapsed,
+            'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=2000)
+    parser.add_argument('--page-kb', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args)))
+        return
+
+    print(f"{args.pages} pages of {args.page_kb} KB, {args.workers} workers")
+    for mode in MODES:
+        output = subprocess.run([sys.executable, __file__, '--mode', mode, '--pages', str(args.pages),
+                                 '--page-kb', str(args.page_kb), '--workers', str(args.workers)],
+                                check=True, capture_output=True, text=True).stdout
+        result = json.loads(output)
+        print(f"{mode:<7} {result['pages_per_second']:7.1f} pages/s, peak RSS {result['peak_rss_mb']:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
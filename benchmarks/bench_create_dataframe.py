@@ -0,0 +1,93 @@
+"""
+Time and memory of building the report DataFrame.
+
+Compares ReportGenerator.create_dataframe, which fills typed columns
+directly, with building one dict per company and calling pd.DataFrame(rows).
+Reports build time, peak traced allocations during the build and the
+DataFrame's deep memory usage, and checks both frames hold the same values.
+
+Usage:
+    python benchmarks/bench_create_dataframe.py [--companies 1000000]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import random
+import argparse
+import tracemalloc
+
+import pandas as pd
+
+from company_loader import company_key
+from output import ReportGenerator, COLUMNS
+from records import CompanyAnalysis, FLAG_BITS, segment_mask
+from report_sinks import widen_float_columns
+
+CATEGORIES = ['F&B', 'Bulk (Manufacturer)', 'Bulk (Distributor)', 'Formulation', 'Not Relevant']
+SEGMENTS = [segment_mask(names) for names in
+            ([], ['gut_health'], ['gut_health', 'womens_health'], ['cognitive_health', 'mental_wellness'])]
+# Share of companies with each flag set
+FLAG_RATES = {'is_fb': 0.3, 'mentions_probiotics': 0.4, 'is_manufacturer': 0.3, 'is_brand': 0.5, 'is_distributor': 0.2}
+STATUSES = ['success'] * 8 + ['failed: 404 Client Error', 'skipped: content-type application/pdf']
+
+
+def synthetic_results(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    companies, scraped_data, analysis_results = [], {}, {}
+    for i in range(count):
+        company = {'name': f'Company {i}', 'website': f'https://www.company-{i}.example.com'}
+        companies.append(company)
+        scraped_data[company_key(company)] = {'status': rng.choice(STATUSES)}
+        category = rng.choice(CATEGORIES)
+        score = round(rng.random() * 5, 2)
+        segments = rng.choice(SEGMENTS)
+        flags = sum(bit for flag, bit in FLAG_BITS.items() if rng.random() < FLAG_RATES[flag])
+        analysis_results[company_key(company)] = CompanyAnalysis(flags, segments, category=category, relevance_score=score)
+    return companies, scraped_data, analysis_results
+
+
+def dict_rows_dataframe(report: ReportGenerator, companies, scraped_data, analysis_results) -> pd.DataFrame:
+    rows = []
+    for company in companies:
+        key = company_key(company)
+        rows.append(report.build_row(company, scraped_data.get(key, {}), analysis_results.get(key, CompanyAnalysis())))
+    return pd.DataFrame(rows)
+
+
+def measure(label: str, build, *args) -> pd.DataFrame:
+    # Timed and traced separately, since tracing slows allocation-heavy code down
+    start = time.perf_counter()
+    build(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    df = build(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    size = df.memory_usage(deep=True).sum()
+    print(f"{label:>10}: {elapsed:6.2f}s, peak {peak / 1024 ** 2:7.0f} MB allocated, "
+          f"DataFrame {size / 1024 ** 2:6.0f} MB")
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--companies', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    inputs = synthetic_results(args.companies)
+    report = ReportGenerator()
+    print(f"{args.companies} companies")
+
+    legacy = measure('dict rows', dict_rows_dataframe, report, *inputs)
+    typed = measure('typed', report.create_dataframe, *inputs)
+
+    assert list(typed.columns) == COLUMNS
+    pd.testing.assert_frame_equal(widen_float_columns(typed).astype(object), legacy[COLUMNS].astype(object))
+    print("same values")
+
+
+if __name__ == "__main__":
+    main()
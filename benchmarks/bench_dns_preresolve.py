@@ -0,0 +1,69 @@
+"""
+DNS pre-resolution on a list of cold domains.
+
+Every company gets its own made-up host name, resolved by a local stub
+resolver with a fixed lookup latency (some names do not exist) and served by
+a local FakeWebServer. Scrapes the list with and without preresolve_dns and
+reports pages per second, resolver lookups and how the missing domains ended.
+
+Usage:
+    python benchmarks/bench_dns_preresolve.py [--companies 300] [--dns-latency 0.2] [--missing-rate 0.1]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import argparse
+from collections import Counter
+
+from scraper import WebsiteScraper
+from fake_web import FakeWebServer, StubResolver
+
+
+def scrape(companies: list, resolver: StubResolver, workers: int, preresolve: bool) -> dict:
+    # One page per host: robots.txt fetches would only add the same cost to both runs
+    scraper = WebsiteScraper(max_workers=workers, respect_robots=False, preresolve_dns=preresolve)
+    scraper.dns_cache.resolver = resolver
+    lookups = resolver.lookups
+
+    start = time.perf_counter()
+    results = scraper.scrape_websites(companies)
+    elapsed = time.perf_counter() - start
+    scraper.close()
+
+    outcomes = Counter('success' if r['status'] == 'success' else
+                       'failed: dns' if r['status'] == 'failed: dns' else 'other failure'
+                       for r in results.values())
+    return {
+        'seconds': elapsed,
+        'pages_per_second': len(companies) / elapsed,
+        'lookups': resolver.lookups - lookups,
+        'outcomes': dict(outcomes),
+        'dns_seconds': scraper.metrics.to_dict()['stages'].get('dns', {}).get('sum', 0.0)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--companies', type=int, default=300)
+    parser.add_argument('--workers', type=int, default=5)
+    parser.add_argument('--dns-latency', type=float, default=0.2, help='Seconds per stub lookup')
+    parser.add_argument('--missing-rate', type=float, default=0.1, help='Share of names that do not exist')
+    parser.add_argument('--page-words', type=int, default=200)
+    args = parser.parse_args()
+
+    resolver = StubResolver(latency=args.dns_latency, missing_rate=args.missing_rate)
+    with FakeWebServer(page_words=args.page_words) as server:
+        companies = resolver.companies(server, args.companies)
+        before = scrape(companies, resolver, args.workers, preresolve=False)
+        after = scrape(companies, resolver, args.workers, preresolve=True)
+
+    for name, result in (('resolve in workers', before), ('preresolve_dns', after)):
+        print(f"{name:<19} {result['pages_per_second']:7.1f} pages/s ({result['seconds']:.1f}s), "
+              f"{result['lookups']} lookups ({result['dns_seconds']:.1f}s), {result['outcomes']}")
+    print(f"speedup: {after['pages_per_second'] / before['pages_per_second']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Time and peak memory of writing a large Excel report.
+
+Each mode runs in its own process so peak RSS is measured independently:
+
+    stream     ReportGenerator.stream_excel_report over a row generator
+    dataframe  ReportGenerator.generate_excel_report on a prebuilt DataFrame
+    pandas     Plain DataFrame.to_excel, for comparison
+
+Usage:
+    python benchmarks/bench_excel_report.py [--rows 500000] [--modes stream dataframe pandas]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import random
+import argparse
+import resource
+import subprocess
+import tempfile
+import warnings
+
+from output import ReportGenerator, COLUMNS
+
+CATEGORIES = ['F&B', 'Bulk (Manufacturer)', 'Bulk (Distributor)', 'Formulation', 'Not Relevant']
+SEGMENTS = ['None', 'gut_health', 'gut_health, womens_health', 'cognitive_health, mental_wellness']
+
+
+def synthetic_rows(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {
+            'Company Name': f'Company {i}',
+            'Website': f'https://www.company-{i}.example.com',
+            'Website Accessible': rng.random() < 0.9,
+            'Category': rng.choice(CATEGORIES),
+            'Relevance Score': round(rng.random() * 5, 2),
+            'Is F&B': rng.random() < 0.3,
+            'Mentions Probiotics': rng.random() < 0.4,
+            'Health Segments': rng.choice(SEGMENTS),
+            'Is Manufacturer': rng.random() < 0.3,
+            'Is Brand': rng.random() < 0.5,
+            'Is Distributor': rng.random() < 0.2,
+            'Scraping Status': 'success'
+        }
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_mode(mode: str, rows: int, path: str):
+    import pandas as pd
+
+    report = ReportGenerator(path)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        if mode == 'stream':
+            start = time.perf_counter()
+            report.stream_excel_report(synthetic_rows(rows))
+        else:
+            df = pd.DataFrame(synthetic_rows(rows), columns=COLUMNS)
+            print(f"  DataFrame built, peak RSS {peak_rss_mb():.0f} MB")
+            start = time.perf_counter()
+            if mode == 'dataframe':
+                report.generate_excel_report(df)
+            else:
+                df.to_excel(path, index=False, sheet_name='Prospects', engine='xlsxwriter')
+        elapsed = time.perf_counter() - start
+
+    # xlsxwriter warns for each cell it drops, e.g. URLs past the per-sheet limit
+    print(f"{mode:>10}: {elapsed:7.2f}s, peak RSS {peak_rss_mb():6.0f} MB, "
+          f"{os.path.getsize(path) / 1024 ** 2:.1f} MB file, {len(caught)} cells dropped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--modes', nargs='+', default=['stream', 'dataframe', 'pandas'])
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--output', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_mode(args.child, args.rows, args.output)
+        return
+
+    print(f"{args.rows} rows")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in args.modes:
+            subprocess.run([sys.executable, os.path.abspath(__file__), '--rows', str(args.rows),
+                            '--child', mode, '--output', os.path.join(tmp, f'{mode}.xlsx')], check=True)
+
+
+if __name__ == "__main__":
+    main()
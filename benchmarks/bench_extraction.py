@@ -0,0 +1,104 @@
+"""
+Benchmark and verify the page extraction backends over a corpus of saved pages.
+
+Checks that the streaming extractor returns exactly what the BeautifulSoup
+extractor returns (including failures) for every page, then times both.
+
+Usage:
+    python benchmarks/bench_extraction.py --save-corpus pages/   # save COMPANIES homepages
+    python benchmarks/bench_extraction.py --corpus pages/        # verify and benchmark
+    python benchmarks/bench_extraction.py                        # synthetic pages
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import glob
+import time
+import hashlib
+import argparse
+
+from scraper import WebsiteScraper
+from project_constants import COMPANIES
+from fake_web import PAGE_TEMPLATE
+from bench_analyzer import synthetic_page
+
+
+def save_corpus(directory: str):
+    os.makedirs(directory, exist_ok=True)
+    scraper = WebsiteScraper()
+    for company in COMPANIES:
+        url = company['website']
+        try:
+            content, _ = scraper._fetch_page(url)
+        except Exception as e:
+            print(f"skipped {url}: {e}")
+            continue
+        path = os.path.join(directory, hashlib.md5(url.encode('utf-8')).hexdigest()[:12] + '.html')
+        with open(path, 'wb') as f:
+            f.write(content)
+        print(f"saved {url} -> {path}")
+
+
+def load_corpus(directory: str) -> list:
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.htm*'))):
+        with open(path, 'rb') as f:
+            pages.append((path, f.read()))
+    return pages
+
+
+def synthetic_corpus(count: int = 50) -> list:
+    pages = []
+    for i in range(count):
+        body = synthetic_page(0.1, seed=i)
+        html = PAGE_TEMPLATE.format(name=f'Company {i}', body=body)
+        html = html.replace('</main>', '</main><script>var x = 1;</script><section><p>' + body[:2000] + '</p></section>')
+        pages.append((f'synthetic-{i}', html.encode('utf-8')))
+    return pages
+
+
+def outcome(scraper: WebsiteScraper, content: bytes):
+    try:
+        return scraper._parse_page(content, 'http://example.com/')
+    except Exception as e:
+        return f'{type(e).__name__}: {e}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', help='Directory of saved .html pages')
+    parser.add_argument('--save-corpus', help='Download COMPANIES homepages into this directory and exit')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.save_corpus:
+        save_corpus(args.save_corpus)
+        return
+
+    pages = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    backends = {name: WebsiteScraper(extractor=name) for name in WebsiteScraper.EXTRACTORS}
+
+    mismatches = [name for name, content in pages
+                  if outcome(backends['bs4'], content) != outcome(backends['stream'], content)]
+    print(f"{len(pages)} pages, {len(mismatches)} mismatches")
+    for name in mismatches:
+        print(f"  mismatch: {name}")
+
+    total_mb = sum(len(content) for _, content in pages) / 1024 / 1024
+    timings = {}
+    for name, scraper in backends.items():
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for _, content in pages:
+                outcome(scraper, content)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings[name] = best
+        print(f"{name:>7}: {best:7.3f} s ({total_mb / best:6.2f} MB/s)")
+    print(f"speedup: {timings['bs4'] / timings['stream']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
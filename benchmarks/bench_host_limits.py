@@ -0,0 +1,85 @@
+"""
+Per-host rate limiting against a site that throttles.
+
+Scrapes many pages of one local host that answers 429 (Retry-After: 1) to
+requests beyond --server-rate per second, once without a per-host rate limit
+and once with the shared limiter set just below the server's limit. Reports
+pages per second, 429 responses and failed pages for each, plus how quickly
+the robots.txt cache answers lookups for many sites.
+
+Usage:
+    python benchmarks/bench_host_limits.py [--pages 300] [--workers 10] [--server-rate 20]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import argparse
+
+from politeness import RobotsCache
+from retry import RetryPolicy
+from scraper import WebsiteScraper
+from fake_web import FakeWebServer
+
+ROBOTS = "User-agent: *\nDisallow: /private/\n"
+
+
+def scrape(server: FakeWebServer, companies: list, workers: int, host_rate) -> dict:
+    scraper = WebsiteScraper(max_workers=workers, host_rate=host_rate)
+    scraper.retry_policy = RetryPolicy(base_delay=0.5, max_delay=2.0)
+    served, rate_limited = server.requests_served, server.rate_limited
+
+    start = time.perf_counter()
+    results = scraper.scrape_websites(companies)
+    elapsed = time.perf_counter() - start
+    scraper.close()
+
+    succeeded = sum(1 for r in results.values() if r['status'].startswith('success'))
+    return {
+        'pages_per_second': succeeded / elapsed,
+        'seconds': elapsed,
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'requests': server.requests_served - served,
+        'rate_limited': server.rate_limited - rate_limited
+    }
+
+
+def robots_lookups_per_second(sites: int, lookups: int) -> float:
+    cache = RobotsCache(max_entries=sites)
+    urls = [f'https://company-{i}.example/page' for i in range(sites)]
+    for url in urls:
+        cache.store(url, 200, ROBOTS.encode('utf-8'))
+
+    start = time.perf_counter()
+    for i in range(lookups):
+        cache.lookup(urls[i % sites])
+    return lookups / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=300)
+    parser.add_argument('--workers', type=int, default=10)
+    parser.add_argument('--server-rate', type=float, default=20.0, help='Requests per second before 429s')
+    parser.add_argument('--page-words', type=int, default=200)
+    args = parser.parse_args()
+
+    with FakeWebServer(page_words=args.page_words, rate_limit=args.server_rate, robots=ROBOTS) as server:
+        companies = server.companies(args.pages)
+        unlimited = scrape(server, companies, args.workers, None)
+        time.sleep(1)  # Let the server's bucket refill
+        limited = scrape(server, companies, args.workers, args.server_rate * 0.9)
+
+    for name, result in (('no host limit', unlimited), ('host rate limit', limited)):
+        print(f"{name:<16} {result['succeeded']:5} pages scraped, {result['failed']} failed, "
+              f"{result['pages_per_second']:6.1f} pages/s, {result['requests']} requests, "
+              f"{result['rate_limited']} x 429 ({result['seconds']:.1f}s)")
+
+    sites = 10000
+    print(f"robots.txt cache: {robots_lookups_per_second(sites, 200000):,.0f} lookups/s over {sites} sites")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Cold-start time of main.py.
+
+Starts fresh interpreters that import main (and run `main.py --help`),
+reports the median wall time above a bare interpreter start, lists the
+slowest imports from `python -X importtime`, and checks that heavy
+optional modules (pandas, numpy, xlsxwriter, pyarrow, aiohttp) are not
+loaded just by importing main.
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs 10] [--top 15] [--json results.json]
+"""
+import sys
+import os
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+HEAVY_MODULES = ('pandas', 'numpy', 'xlsxwriter', 'pyarrow', 'aiohttp')
+
+IMPORT_MAIN = f"import sys; sys.path.insert(0, {REPO!r}); import main"
+
+
+def median_wall_time(command: list, runs: int, cwd: str) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=cwd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def slowest_imports(cwd: str, top: int) -> list:
+    """(cumulative microseconds, module) for the top-level imports of main, slowest first"""
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', IMPORT_MAIN], cwd=cwd, check=True,
+                            capture_output=True, text=True).stderr
+    # Modules are listed after their own imports: main's direct imports ('   name')
+    # are the ones since the previous top-level entry (' name') up to ' main'
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not name.startswith('  '):
+            if name.strip() == 'main':
+                return sorted(imports, reverse=True)[:top]
+            imports = []
+        elif not name.startswith('    '):
+            imports.append((int(cumulative), name.strip()))
+    return []
+
+
+def loaded_heavy_modules(cwd: str) -> list:
+    check = f"{IMPORT_MAIN}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, '-c', check], cwd=cwd, check=True,
+                            capture_output=True, text=True).stdout.strip()
+    return output.split(',') if output else []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--top', type=int, default=15, help='Slowest imports to list')
+    parser.add_argument('--json', help='Also write the results to this file')
+    args = parser.parse_args()
+
+    # main.py logs to a file in the working directory
+    with tempfile.TemporaryDirectory() as tmp:
+        bare = median_wall_time([sys.executable, '-c', 'pass'], args.runs, tmp)
+        import_main = median_wall_time([sys.executable, '-c', IMPORT_MAIN], args.runs, tmp)
+        help_main = median_wall_time([sys.executable, os.path.join(REPO, 'main.py'), '--help'], args.runs, tmp)
+        slowest = slowest_imports(tmp, args.top)
+        heavy = loaded_heavy_modules(tmp)
+
+    print(f"interpreter start:    {bare * 1000:7.1f} ms")
+    print(f"import main:          {(import_main - bare) * 1000:7.1f} ms above interpreter start")
+    print(f"main.py --help:       {(help_main - bare) * 1000:7.1f} ms above interpreter start")
+    print(f"\nSlowest imports of main (cumulative):")
+    for microseconds, name in slowest:
+        print(f"  {microseconds / 1000:7.1f} ms  {name}")
+    print(f"\nHeavy modules loaded by importing main: {', '.join(heavy) or 'none'}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'interpreter_seconds': bare,
+                'import_main_seconds': import_main - bare,
+                'help_seconds': help_main - bare,
+                'slowest_imports_ms': {name: microseconds / 1000 for microseconds, name in slowest},
+                'heavy_modules_loaded': heavy
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
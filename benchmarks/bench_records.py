@@ -0,0 +1,77 @@
+"""
+Memory of per-company analysis results: merged dicts vs. CompanyAnalysis records.
+
+Builds random categorized analyses and holds one result per company the way
+process_companies does, once as the merged analysis/categorization dict the
+pipeline used to keep (flags, a joined health segment string and a
+defaultdict of matched keywords) and once as slotted CompanyAnalysis records.
+Reports traced memory per company, the pickled size of a worker batch, and
+checks both forms describe the same results.
+
+Usage:
+    python benchmarks/bench_records.py [--companies 500000] [--batch 64]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import pickle
+import argparse
+import tracemalloc
+from collections import defaultdict
+
+from categorizer import CompanyCategorizer
+from records import CompanyAnalysis
+from bench_categorizer import random_analyses
+
+
+def merged_dict(analysis: CompanyAnalysis) -> dict:
+    """The combined dict analyze_combined_text returned before records"""
+    result = analysis.to_dict()
+    result['health_segments'] = ', '.join(analysis.segment_names) or 'None'
+    result['matched_keywords'] = defaultdict(list, analysis.matched_keywords)
+    return result
+
+
+def record(analysis: CompanyAnalysis) -> CompanyAnalysis:
+    return CompanyAnalysis(analysis.flags, analysis.segments, dict(analysis.matched_keywords),
+                           analysis.category, analysis.relevance_score)
+
+
+def measure(label: str, build, analyses: list, batch: int) -> list:
+    start = time.perf_counter()
+    tracemalloc.start()
+    results = {f'Company {i}': build(analysis) for i, analysis in enumerate(analyses)}
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    elapsed = time.perf_counter() - start
+
+    # Company names are the same in both forms
+    names = sum(sys.getsizeof(name) for name in results)
+    pickled = len(pickle.dumps(list(results.values())[:batch], protocol=pickle.HIGHEST_PROTOCOL))
+    print(f"{label:>8}: {(size - names) / len(analyses):6.0f} bytes per company, "
+          f"{(size - names) / 1024 ** 2:6.0f} MB in all, {pickled / batch:5.0f} bytes pickled per result "
+          f"({elapsed:.2f}s)")
+    return list(results.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--companies', type=int, default=500_000)
+    parser.add_argument('--batch', type=int, default=64, help='Results per worker batch')
+    args = parser.parse_args()
+
+    categorizer = CompanyCategorizer()
+    analyses = [categorizer.categorize_company(analysis) for analysis in random_analyses(args.companies)]
+    print(f"{args.companies} companies")
+
+    dicts = measure('dicts', merged_dict, analyses, args.batch)
+    records = measure('records', record, analyses, args.batch)
+
+    assert all(CompanyAnalysis.from_dict(d) == r for d, r in zip(dicts, records))
+    print("same results")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+Local stand-in web server for benchmarks.
+
+FakeWebServer serves a synthetic company page for every path over HTTP/1.1
+keep-alive, with configurable page size, response latency, error rate,
+keyword density, robots.txt and request rate limit; SlowHostFarm simulates
+many slow hosts on separate ports; StubResolver answers DNS lookups for
+made-up host names. Either way, scraping benchmarks never touch the network.
+"""
+import random
+import socket
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PAGE_TEMPLATE = """<html><head><title>{name}</title>
+<meta name="description" content="{name} makes probiotic food and beverage products">
+</head><body><nav>Home Products About</nav>
+<main><h1>{name}</h1><p>{body}</p></main>
+<footer>Contact us</footer></body></html>"""
+
+
+FILLER = ['the', 'company', 'global', 'leader', 'innovation', 'quality', 'team',
+          'customers', 'solutions', 'research', 'world', 'people', 'values']
+
+
+def _all_keywords() -> list:
+    from project_constants import KEYWORDS
+    keywords = []
+    for value in KEYWORDS.values():
+        for category_keywords in (value.values() if isinstance(value, dict) else [value]):
+            keywords.extend(category_keywords)
+    return keywords
+
+
+class FakeWebHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if not self.server.admit():
+            self.server.requests_served += 1
+            self.server.rate_limited += 1
+            self.send_response(429)
+            self.send_header('Retry-After', '1')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path == '/robots.txt' and self.server.robots is not None:
+            self.server.requests_served += 1
+            body = self.server.robots.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        status = self.server.error_for(self.path)
+        if status:
+            self.server.requests_served += 1
+            self.send_response(status)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = self.server.page_for(self.path).encode('utf-8')
+        etag = f'"{zlib.crc32(body):08x}"'
+        self.server.requests_served += 1
+
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.full_downloads += 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeWebServer(ThreadingHTTPServer):
+    """
+    Threaded local HTTP server; use as a context manager.
+
+    Pages and errors are derived from the request path, so the same company
+    list gets the same responses on every run. Without keyword_density every
+    page repeats a fixed keyword phrase; with it, pages mix random filler
+    words with that fraction of KEYWORDS. A share error_rate of paths fails,
+    half with 503 (retried by the scraper) and half with 404 (not retried).
+    With rate_limit, requests beyond that many per second (after a burst of as
+    many) are answered 429 with Retry-After: 1. robots is served as /robots.txt.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, page_words: int = 2000, port: int = 0, latency: float = 0.0,
+                 error_rate: float = 0.0, keyword_density: float = None, rate_limit: float = None,
+                 robots: str = None):
+        super().__init__(('127.0.0.1', port), FakeWebHandler)
+        self.page_words = page_words
+        self.latency = latency
+        self.error_rate = error_rate
+        self.keyword_density = keyword_density
+        self._keywords = _all_keywords() if keyword_density is not None else None
+        self.rate_limit = rate_limit
+        self.robots = robots
+        self.requests_served = 0
+        self.full_downloads = 0
+        self.rate_limited = 0
+        self._tokens = rate_limit or 0.0
+        self._tokens_updated = time.monotonic()
+        self._tokens_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def admit(self) -> bool:
+        """Token bucket of rate_limit requests per second; False once it is empty"""
+        if not self.rate_limit:
+            return True
+        with self._tokens_lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._tokens_updated) * self.rate_limit)
+            self._tokens_updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def error_for(self, path: str) -> int:
+        """HTTP error status for this path, or 0 to serve the page"""
+        draw = zlib.crc32(path.encode('utf-8')) / 2 ** 32
+        if draw >= self.error_rate:
+            return 0
+        return 503 if draw < self.error_rate / 2 else 404
+
+    def page_for(self, path: str) -> str:
+        name = path.strip('/') or 'index'
+        if self.keyword_density is None:
+            body = ' '.join(['probiotic gut health supplement manufacturer'] * (self.page_words // 5))
+        else:
+            rng = random.Random(path)
+            body = ' '.join(
+                rng.choice(self._keywords) if rng.random() < self.keyword_density else rng.choice(FILLER)
+                for _ in range(self.page_words)
+            )
+        return PAGE_TEMPLATE.format(name=name, body=body)
+
+    def companies(self, count: int) -> list:
+        """Company list in the COMPANIES format pointing at this server"""
+        return [{'name': f'Company {i}', 'website': f'{self.base_url}/company-{i}'} for i in range(count)]
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+class SlowHostFarm:
+    """
+    Many slow local hosts served from one asyncio loop in a background thread.
+
+    Each host is a separate listening port on 127.0.0.1, so clients see a
+    distinct host:port per company. Every response is delayed by `latency`
+    seconds, simulating slow remote sites without a thread per request.
+    """
+
+    def __init__(self, hosts: int = 1000, latency: float = 0.5, page_words: int = 200):
+        self.hosts = hosts
+        self.latency = latency
+        self.page_words = page_words
+        self.ports = []
+        self._loop = None
+        self._servers = []
+        self._ready = threading.Event()
+        self._thread = None
+
+    async def _handle(self, reader, writer):
+        import asyncio
+        try:
+            while True:
+                request = await reader.readuntil(b'\r\n\r\n')
+                path = request.split(b' ', 2)[1].decode('latin-1')
+                await asyncio.sleep(self.latency)
+                name = path.strip('/') or 'index'
+                body = PAGE_TEMPLATE.format(
+                    name=name, body=' '.join(['probiotic gut health food'] * (self.page_words // 4))
+                ).encode('utf-8')
+                writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n'
+                             + f'Content-Length: {len(body)}\r\n\r\n'.encode('ascii') + body)
+                await writer.drain()
+        except Exception:
+            pass
+        finally:
+            writer.close()
+
+    def _run(self):
+        import asyncio
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        for _ in range(self.hosts):
+            server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, '127.0.0.1', 0, backlog=1024)
+            )
+            self._servers.append(server)
+            self.ports.append(server.sockets[0].getsockname()[1])
+        self._ready.set()
+        self._loop.run_forever()
+        for server in self._servers:
+            server.close()
+        self._loop.close()
+
+    def companies(self, count: int) -> list:
+        """Company list spread round-robin over the farm's hosts"""
+        return [
+            {'name': f'Company {i}', 'website': f'http://127.0.0.1:{self.ports[i % self.hosts]}/company-{i}'}
+            for i in range(count)
+        ]
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def __exit__(self, *exc):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+class StubResolver:
+    """
+    getaddrinfo stand-in for DnsCache: every name resolves to 127.0.0.1 after
+    `latency` seconds, like a cold lookup, except a share missing_rate of
+    names (picked by crc32), which do not exist.
+    """
+
+    def __init__(self, latency: float = 0.1, missing_rate: float = 0.0):
+        self.latency = latency
+        self.missing_rate = missing_rate
+        self.lookups = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, host, port, family=0, type=0, proto=0, flags=0):
+        with self._lock:
+            self.lookups += 1
+        time.sleep(self.latency)
+        if zlib.crc32(host.encode('utf-8')) / 2 ** 32 < self.missing_rate:
+            raise socket.gaierror(socket.EAI_NONAME, 'Name or service not known')
+        return [(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, '', ('127.0.0.1', port or 0))]
+
+    def companies(self, server: FakeWebServer, count: int) -> list:
+        """Company list with one made-up host name per company, all served by server"""
+        port = server.server_address[1]
+        return [{'name': f'Company {i}', 'website': f'http://company-{i}.test:{port}/company-{i}'}
+                for i in range(count)]
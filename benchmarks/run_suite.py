@@ -0,0 +1,255 @@
+"""
+Benchmark suite with machine-readable results and baseline comparison.
+
+Runs, in one process:
+
+    end_to_end      ProbioticsProspector.process_companies against a local
+                    FakeWebServer (page size, latency, error rate and keyword
+                    density are configurable), with per-stage timings
+    analyze_text    TextAnalyzer.analyze_text on a synthetic page
+    clean_text      WebsiteScraper._get_clean_text on a parsed synthetic page
+    categorize      CompanyCategorizer.categorize_company per analysis, and
+                    categorize_batch over the same analyses
+    report          ReportGenerator.create_dataframe plus write_report
+
+Each micro-benchmark reports the best and median of --repeat runs. Results
+are written as JSON (--output); with --baseline, a results file from an
+earlier run, every timing is compared and the run fails when one got slower
+by more than --tolerance.
+
+Usage:
+    python benchmarks/run_suite.py [--quick] [--only analyze_text report]
+        [--output bench_results.json] [--baseline old_results.json] [--tolerance 0.1]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import time
+import logging
+import random
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from contextlib import contextmanager
+
+from bs4 import BeautifulSoup
+
+from analyzer import TextAnalyzer
+from categorizer import CompanyCategorizer, analysis_table
+from output import ReportGenerator
+from retry import RetryPolicy
+from scraper import WebsiteScraper
+from bench_analyzer import synthetic_page
+from bench_categorizer import random_analyses
+from bench_create_dataframe import synthetic_results
+from fake_web import FakeWebServer, PAGE_TEMPLATE
+
+# Problem sizes: (default, --quick)
+SIZES = {
+    'companies': (300, 60),
+    'page_words': (2000, 500),
+    'page_mb': (2.0, 0.5),
+    'analyses': (200_000, 20_000),
+    'report_rows': (100_000, 10_000)
+}
+
+
+def timings(func, repeat: int) -> dict:
+    """Best and median seconds over repeat calls of func"""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return {'best': min(runs), 'median': statistics.median(runs), 'runs': repeat}
+
+
+@contextmanager
+def working_directory(path: str):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def bench_end_to_end(args, sizes) -> dict:
+    # Imported here: main configures logging to a file in the working directory
+    with tempfile.TemporaryDirectory() as tmp, working_directory(tmp):
+        import main as pipeline
+        logging.getLogger().setLevel(logging.WARNING)
+
+        server = FakeWebServer(page_words=sizes['page_words'], latency=args.latency,
+                               error_rate=args.error_rate, keyword_density=args.keyword_density)
+        with server:
+            companies = server.companies(sizes['companies'])
+            # Every fake company shares one host, which the per-host rate limit would serialize
+            prospector = pipeline.ProbioticsProspector(report_formats=('csv',), host_rate=None)
+            # Short backoff so retried 503s do not dominate the timing
+            prospector.scraper.retry_policy = RetryPolicy(base_delay=0.05, max_delay=0.2)
+            random.seed(0)
+
+            start = time.perf_counter()
+            df = prospector.process_companies(companies)
+            elapsed = time.perf_counter() - start
+            prospector.close()
+
+        stages = prospector.metrics.to_dict()
+        return {
+            'best': elapsed,
+            'median': elapsed,
+            'runs': 1,
+            'companies': len(companies),
+            'pages_per_second': len(companies) / elapsed,
+            'scraped': int(df['Website Accessible'].sum()),
+            'requests': server.requests_served,
+            'stage_seconds': {stage: round(h['sum'], 6) for stage, h in stages['stages'].items()},
+            'counters': stages['counters']
+        }
+
+
+def bench_analyze_text(args, sizes) -> dict:
+    analyzer = TextAnalyzer()
+    page = synthetic_page(sizes['page_mb'], keyword_density=args.keyword_density)
+    result = timings(lambda: analyzer.analyze_text(page), args.repeat)
+    result['mb_per_second'] = sizes['page_mb'] / result['best']
+    return result
+
+
+def bench_clean_text(args, sizes) -> dict:
+    scraper = WebsiteScraper()
+    html = PAGE_TEMPLATE.format(name='Company', body=synthetic_page(sizes['page_mb'] / 4,
+                                                                   keyword_density=args.keyword_density))
+    # _get_clean_text strips tags from the tree, so each run gets a fresh parse
+    runs = []
+    for _ in range(args.repeat):
+        soup = BeautifulSoup(html, 'html.parser')
+        start = time.perf_counter()
+        scraper._get_clean_text(soup)
+        runs.append(time.perf_counter() - start)
+    scraper.close()
+    return {'best': min(runs), 'median': statistics.median(runs), 'runs': args.repeat}
+
+
+def bench_categorize(args, sizes) -> dict:
+    categorizer = CompanyCategorizer()
+    analyses = random_analyses(sizes['analyses'])
+    table = analysis_table(analyses)
+    result = timings(lambda: [categorizer.categorize_company(analysis) for analysis in analyses], args.repeat)
+    batch = timings(lambda: categorizer.categorize_batch(table), args.repeat)
+    result['batch'] = batch
+    result['analyses'] = sizes['analyses']
+    return result
+
+
+def bench_report(args, sizes) -> dict:
+    inputs = synthetic_results(sizes['report_rows'])
+    with tempfile.TemporaryDirectory() as tmp:
+        report = ReportGenerator(os.path.join(tmp, 'report.xlsx'))
+        result = timings(lambda: report.write_report(report.create_dataframe(*inputs)), args.repeat)
+    result['rows'] = sizes['report_rows']
+    return result
+
+
+BENCHMARKS = {
+    'end_to_end': bench_end_to_end,
+    'analyze_text': bench_analyze_text,
+    'clean_text': bench_clean_text,
+    'categorize': bench_categorize,
+    'report': bench_report
+}
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'commit': commit or None,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')
+    }
+
+
+def flatten_timings(results: dict, prefix: str = '') -> dict:
+    """{'categorize.batch.best': seconds, ...} for every best/median timing"""
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict) and key not in ('stage_seconds', 'counters'):
+            flat.update(flatten_timings(value, f'{prefix}{key}.'))
+        elif key in ('best', 'median'):
+            flat[f'{prefix}{key}'] = value
+    return flat
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Print each timing against the baseline; return the names that regressed"""
+    current = flatten_timings(results)
+    previous = flatten_timings(baseline.get('results', {}))
+    regressions = []
+    print(f"\n{'timing':<28} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name in sorted(current):
+        if name not in previous or not name.endswith('.best'):
+            continue
+        change = current[name] / previous[name] - 1
+        flag = ''
+        if change > tolerance:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print(f"{name:<28} {previous[name]:>10.4f} {current[name]:>10.4f} {change:>+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help='Benchmarks to run (default: all)')
+    parser.add_argument('--quick', action='store_true', help='Smaller problem sizes, e.g. for CI')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per micro-benchmark')
+    parser.add_argument('--latency', type=float, default=0.02, help='Fake web response latency in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.05, help='Share of fake sites answering 503/404')
+    parser.add_argument('--keyword-density', type=float, default=0.02, help='Share of page words that are keywords')
+    parser.add_argument('--output', default='bench_results.json', help='Results file to write')
+    parser.add_argument('--baseline', help='Earlier results file to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help='Allowed slowdown against the baseline before failing (default: 10%%)')
+    args = parser.parse_args()
+
+    sizes = {name: values[1 if args.quick else 0] for name, values in SIZES.items()}
+    results = {}
+    for name in args.only or BENCHMARKS:
+        print(f"{name}...", flush=True)
+        results[name] = BENCHMARKS[name](args, sizes)
+        print(f"  best {results[name]['best']:.4f}s, median {results[name]['median']:.4f}s")
+
+    document = {
+        'environment': environment(),
+        'parameters': {**sizes, 'quick': args.quick, 'repeat': args.repeat, 'latency': args.latency,
+                       'error_rate': args.error_rate, 'keyword_density': args.keyword_density},
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('parameters') != document['parameters']:
+            print("warning: baseline was run with different parameters")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} timings regressed by more than {args.tolerance:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,49 @@
-from typing import Dict
-from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
+
+from records import CompanyAnalysis, FLAG_BITS
+from project_constants import SCORING_WEIGHTS, MIN_SCORES
+
+# numpy and pandas are only needed by the batch API and imported there
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Category names; the batch API returns them as a categorical in this order
+CATEGORIES = ['F&B', 'Bulk (Manufacturer)', 'Bulk (Distributor)', 'Formulation', 'Not Relevant']
+
+# Boolean analysis flags used by the scoring and category rules
+FLAG_COLUMNS = ['is_fb', 'mentions_probiotics', 'is_manufacturer', 'is_brand', 'is_distributor']
+
+
+def analysis_table(analyses: Iterable[CompanyAnalysis]) -> 'pd.DataFrame':
+    """
+    Columnar view of analysis results for CompanyCategorizer.categorize_batch.
+    
+    Args:
+        analyses: Records from TextAnalyzer.analyze_text(), categorized or not
+            
+    Returns:
+        DataFrame with one bool column per FLAG_COLUMNS entry, 'health_segment_count'
+        and 'distributor_lists_probiotics'
+    """
+    import numpy as np
+    import pandas as pd
+    
+    flags = []
+    segment_counts = []
+    distributor_probiotics = []
+    
+    for analysis in analyses:
+        flags.append(analysis.flags)
+        segment_counts.append(analysis.segment_count)
+        distributor_probiotics.append('probiotics' in analysis.matched_keywords.get('distributor', ()))
+    
+    # The flag bitmasks are unpacked into one bool column each
+    flags = np.array(flags, dtype=np.uint8)
+    table = pd.DataFrame({name: (flags & FLAG_BITS[name]) != 0 for name in FLAG_COLUMNS})
+    table['health_segment_count'] = np.array(segment_counts, dtype=np.int64)
+    table['distributor_lists_probiotics'] = np.array(distributor_probiotics, dtype=bool)
+    return table
+
 
 class CompanyCategorizer:
     """
@@ -7,31 +51,21 @@ class CompanyCategorizer:
     Follows the flowchart logic from the original PDF.
     """
     
-    def __init__(self):
-        # Scoring weights for different factors
-        self.scoring_weights = {
-            'is_fb': 2,
-            'mentions_probiotics': 1.5,
-            'health_segment': 1,  # Per segment
-            'is_manufacturer': 1.5,
-            'is_brand': 1,
-            'is_distributor': 1
-        }
-        
-        # Minimum scores for relevance
-        self.min_scores = {
-            'F&B': 2,
-            'Bulk (Manufacturer)': 2.5,
-            'Bulk (Distributor)': 2,
-            'Formulation': 3
-        }
+    def __init__(self, scoring_weights: Optional[Dict] = None, min_scores: Optional[Dict] = None):
+        """
+        Args:
+            scoring_weights: Scoring weights for different factors (default SCORING_WEIGHTS)
+            min_scores: Minimum scores for relevance (default MIN_SCORES)
+        """
+        self.scoring_weights = dict(scoring_weights or SCORING_WEIGHTS)
+        self.min_scores = dict(min_scores or MIN_SCORES)
     
-    def calculate_relevance_score(self, analysis: Dict) -> float:
+    def calculate_relevance_score(self, analysis: CompanyAnalysis) -> float:
         """
         Calculate a relevance score (0-5) based on analysis results.
         
         Args:
-            analysis: Dictionary from TextAnalyzer.analyze_text()
+            analysis: Record from TextAnalyzer.analyze_text()
             
         Returns:
             Float score between 0 and 5
@@ -39,26 +73,26 @@ class CompanyCategorizer:
         score = 0.0
         
         # Add points for each relevant factor
-        if analysis['is_fb']:
+        if analysis.is_fb:
             score += self.scoring_weights['is_fb']
-        if analysis['mentions_probiotics']:
+        if analysis.mentions_probiotics:
             score += self.scoring_weights['mentions_probiotics']
         
         # Add points for health segments
-        score += len(analysis['health_segments']) * self.scoring_weights['health_segment']
+        score += analysis.segment_count * self.scoring_weights['health_segment']
         
         # Add points for company type
-        if analysis['is_manufacturer']:
+        if analysis.is_manufacturer:
             score += self.scoring_weights['is_manufacturer']
-        if analysis['is_brand']:
+        if analysis.is_brand:
             score += self.scoring_weights['is_brand']
-        if analysis['is_distributor']:
+        if analysis.is_distributor:
             score += self.scoring_weights['is_distributor']
         
         # Cap at 5
         return min(5.0, score)
     
-    def determine_category(self, analysis: Dict, score: float) -> str:
+    def determine_category(self, analysis: CompanyAnalysis, score: float) -> str:
         """
         Determine the company category based on analysis and score.
         
@@ -70,39 +104,86 @@ class CompanyCategorizer:
         - 'Not Relevant'
         """
         # Rule 1: F&B companies are always prospects
-        if analysis['is_fb']:
+        if analysis.is_fb:
             return 'F&B'
         
         # Rule 2: Manufacturers in relevant health segments
-        if analysis['is_manufacturer'] and score >= self.min_scores['Bulk (Manufacturer)']:
+        if analysis.is_manufacturer and score >= self.min_scores['Bulk (Manufacturer)']:
             return 'Bulk (Manufacturer)'
         
         # Rule 3: Distributors into nutraceuticals/probiotics
-        if analysis['is_distributor'] and (analysis['mentions_probiotics'] or 
-                                          'probiotics' in analysis['matched_keywords'].get('distributor', [])):
+        if analysis.is_distributor and (analysis.mentions_probiotics or 
+                                        'probiotics' in analysis.matched_keywords.get('distributor', ())):
             return 'Bulk (Distributor)'
         
         # Rule 4: Brands in relevant health segments
-        if analysis['is_brand'] and analysis['health_segments'] and score >= self.min_scores['Formulation']:
+        if analysis.is_brand and analysis.segments and score >= self.min_scores['Formulation']:
             return 'Formulation'
         
         return 'Not Relevant'
     
-    def categorize_company(self, analysis: Dict) -> Dict:
+    def categorize_company(self, analysis: CompanyAnalysis) -> CompanyAnalysis:
         """
         Complete categorization of a company.
         
-        Returns dictionary with:
+        Sets on the analysis record, and returns it:
         - category: The determined category
         - relevance_score: Calculated score
-        - is_relevant: Boolean if company is relevant
+        (is_relevant and the health_segments label follow from these and the analysis)
         """
         score = self.calculate_relevance_score(analysis)
-        category = self.determine_category(analysis, score)
-        
-        return {
-            'category': category,
-            'relevance_score': round(score, 2),
-            'is_relevant': category != 'Not Relevant',
-            'health_segments': ', '.join(analysis['health_segments'].keys()) or 'None'
-        }
\ No newline at end of file
+        analysis.category = self.determine_category(analysis, score)
+        analysis.relevance_score = round(score, 2)
+        return analysis
+    
+    def categorize_batch(self, table: 'pd.DataFrame') -> 'pd.DataFrame':
+        """
+        Score and categorize many companies at once.
+        
+        Applies the same weights and rules as calculate_relevance_score and
+        determine_category with array arithmetic and masks, producing exactly
+        the same scores and categories as categorize_company.
+        
+        Args:
+            table: Analysis table as built by analysis_table()
+            
+        Returns:
+            DataFrame on the table's index with 'category' (categorical of
+            CATEGORIES), 'relevance_score' and 'is_relevant'
+        """
+        import numpy as np
+        import pandas as pd
+        
+        flags = {name: table[name].to_numpy(dtype=bool) for name in FLAG_COLUMNS}
+        segment_counts = table['health_segment_count'].to_numpy()
+        weights = self.scoring_weights
+        
+        # Add weights in the scalar path's order so float sums are identical
+        score = np.zeros(len(table))
+        score += np.where(flags['is_fb'], weights['is_fb'], 0.0)
+        score += np.where(flags['mentions_probiotics'], weights['mentions_probiotics'], 0.0)
+        score += segment_counts * weights['health_segment']
+        score += np.where(flags['is_manufacturer'], weights['is_manufacturer'], 0.0)
+        score += np.where(flags['is_brand'], weights['is_brand'], 0.0)
+        score += np.where(flags['is_distributor'], weights['is_distributor'], 0.0)
+        score = np.minimum(score, 5.0)
+        
+        # First matching rule wins, as in determine_category
+        rules = [
+            flags['is_fb'],
+            flags['is_manufacturer'] & (score >= self.min_scores['Bulk (Manufacturer)']),
+            flags['is_distributor'] & (flags['mentions_probiotics'] |
+                                       table['distributor_lists_probiotics'].to_numpy(dtype=bool)),
+            flags['is_brand'] & (segment_counts > 0) & (score >= self.min_scores['Formulation'])
+        ]
+        codes = np.select(rules, range(len(rules)), default=len(rules))
+        
+        # Python's round() per distinct score; np.round can differ in the last digit
+        distinct, inverse = np.unique(score, return_inverse=True)
+        rounded = np.array([round(float(value), 2) for value in distinct])[inverse.reshape(-1)]
+        
+        return pd.DataFrame({
+            'category': pd.Categorical.from_codes(codes, CATEGORIES),
+            'relevance_score': rounded,
+            'is_relevant': codes != CATEGORIES.index('Not Relevant')
+        }, index=table.index)
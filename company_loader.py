@@ -0,0 +1,156 @@
+import os
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from project_constants import INPUT_CHUNK_ROWS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# tldextract knows the full public suffix list; without it a short list of
+# common multi-part suffixes is used to find the registered domain
+try:
+    import tldextract
+    _extract = tldextract.TLDExtract(suffix_list_urls=())
+except ImportError:
+    _extract = None
+
+# Two-label public suffixes under which the registered domain has three labels
+COMMON_SECOND_LEVEL_SUFFIXES = frozenset([
+    'co.uk', 'org.uk', 'ac.uk', 'gov.uk', 'co.jp', 'ne.jp', 'or.jp', 'co.kr', 'co.nz', 'co.za',
+    'co.in', 'net.in', 'org.in', 'co.id', 'co.il', 'co.th', 'com.au', 'net.au', 'org.au',
+    'com.br', 'com.cn', 'com.hk', 'com.mx', 'com.my', 'com.sg', 'com.tr', 'com.tw', 'com.ar',
+    'com.co', 'com.pe', 'com.ph', 'com.pk', 'com.vn', 'com.eg', 'com.sa', 'com.ng'
+])
+
+# Accepted input column names, compared case-insensitively
+NAME_COLUMNS = ('name', 'company', 'company name', 'company_name')
+WEBSITE_COLUMNS = ('website', 'url', 'domain', 'homepage', 'site')
+
+INPUT_FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.parquet': 'parquet'}
+
+
+def company_key(company: Dict) -> Tuple[str, str]:
+    """
+    Key of a company's results: companies can share a name (e.g. two
+    'Acme Foods' on different domains), so the website is part of it.
+    """
+    return company['name'], company['website']
+
+
+def normalize_website(website) -> Optional[str]:
+    """
+    Canonical https URL for a website cell (scheme added, host lowercased,
+    fragment and trailing slash dropped), or None if there is no usable host
+    (including malformed cells such as a non-numeric port).
+    """
+    if not isinstance(website, str) or not website.strip():
+        return None
+    website = website.strip()
+    if '://' not in website:
+        website = f'https://{website}'
+    try:
+        parts = urlsplit(website)
+        port = parts.port
+    except ValueError:
+        return None
+    host = (parts.hostname or '').rstrip('.')
+    if '.' not in host or parts.scheme.lower() not in ('http', 'https'):
+        return None
+    if port:
+        host = f'{host}:{port}'
+    return urlunsplit((parts.scheme.lower(), host, parts.path.rstrip('/'), parts.query, ''))
+
+
+def registered_domain(host: str) -> str:
+    """Registered domain of a host name, e.g. shop.nestle.co.uk -> nestle.co.uk"""
+    if _extract is not None:
+        parts = _extract(host)
+        if parts.domain and parts.suffix:
+            return f'{parts.domain}.{parts.suffix}'
+        return host
+
+    labels = host.split('.')
+    if len(labels) > 2 and '.'.join(labels[-2:]) in COMMON_SECOND_LEVEL_SUFFIXES:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+
+def _find_column(columns: List[str], wanted: Optional[str], aliases) -> str:
+    lookup = {str(column).strip().lower(): column for column in columns}
+    for alias in ([wanted] if wanted else aliases):
+        if alias.lower() in lookup:
+            return lookup[alias.lower()]
+    raise ValueError(f"No {wanted or aliases[0]} column in input (columns: {', '.join(map(str, columns))})")
+
+
+class CompanyLoader:
+    """
+    Lazy reader of a company list from a CSV, JSON Lines or Parquet file.
+    
+    Rows are read in chunks of chunk_rows and yielded as {'name', 'website'}
+    dicts, so lists of any size can be fed straight to the pipeline. Websites
+    are normalized, rows without one are skipped, and only the first company
+    per registered domain is kept, so no site is scraped twice under two names.
+    """
+    
+    def __init__(self, path: str, chunk_rows: int = INPUT_CHUNK_ROWS, name_column: Optional[str] = None,
+                 website_column: Optional[str] = None):
+        """
+        Args:
+            path: Input file; the format is taken from the extension
+                (.csv, .jsonl/.ndjson or .parquet, optionally .gz for text formats)
+            chunk_rows: Rows read from the file at a time
+            name_column: Column holding company names (default: a common name
+                such as 'name' or 'company')
+            website_column: Column holding websites (default: a common name
+                such as 'website' or 'url')
+        """
+        stem, extension = os.path.splitext(path.lower())
+        if extension == '.gz':
+            extension = os.path.splitext(stem)[1]
+        if extension not in INPUT_FORMATS:
+            raise ValueError(f"Unsupported company list {path}; expected {', '.join(INPUT_FORMATS)}")
+        self.path = path
+        self.format = INPUT_FORMATS[extension]
+        self.chunk_rows = chunk_rows
+        self.name_column = name_column
+        self.website_column = website_column
+        # Counts of 'loaded', 'duplicate' and 'invalid' rows
+        self.stats = Counter()
+    
+    def _chunks(self) -> Iterator['pd.DataFrame']:
+        import pandas as pd
+        if self.format == 'csv':
+            yield from pd.read_csv(self.path, chunksize=self.chunk_rows, dtype=str, keep_default_na=False)
+        elif self.format == 'jsonl':
+            yield from pd.read_json(self.path, lines=True, chunksize=self.chunk_rows, dtype=False)
+        else:
+            # Imported lazily so pyarrow is only needed for Parquet input
+            import pyarrow.parquet as pq
+            parquet = pq.ParquetFile(self.path)
+            for batch in parquet.iter_batches(batch_size=self.chunk_rows):
+                yield batch.to_pandas()
+    
+    def __iter__(self) -> Iterator[Dict]:
+        seen = set()
+        columns = None
+        for chunk in self._chunks():
+            if columns is None:
+                columns = (_find_column(list(chunk.columns), self.name_column, NAME_COLUMNS),
+                           _find_column(list(chunk.columns), self.website_column, WEBSITE_COLUMNS))
+            for name, website in zip(chunk[columns[0]].tolist(), chunk[columns[1]].tolist()):
+                website = normalize_website(website)
+                if website is None:
+                    self.stats['invalid'] += 1
+                    continue
+                # Normalized URLs are scheme://host[:port]/..., with a lowercase host
+                domain = registered_domain(website.split('/', 3)[2].split(':')[0])
+                if domain in seen:
+                    self.stats['duplicate'] += 1
+                    continue
+                seen.add(domain)
+                self.stats['loaded'] += 1
+                name = name.strip() if isinstance(name, str) and name.strip() else domain
+                yield {'name': name, 'website': website}
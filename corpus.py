@@ -0,0 +1,159 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Dict, Iterator, Optional, Tuple
+
+INDEX_SUFFIX = '.idx'
+
+
+class _MappedFile:
+    """Read-only memory map of a growing file, remapped when a read goes past its end"""
+    
+    def __init__(self, path: str):
+        self.file = open(path, 'rb')
+        self.map = None
+        self.size = 0
+    
+    def read(self, offset: int, length: int) -> str:
+        """Decode length bytes at offset straight from the mapped pages"""
+        if not length:
+            return ''
+        if offset + length > self.size:
+            if self.map is not None:
+                self.map.close()
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.size = len(self.map)
+        with memoryview(self.map) as view, view[offset:offset + length] as text:
+            return str(text, 'utf-8')
+    
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+        self.file.close()
+
+
+# Maps opened by read_text in this process, by corpus path
+_mapped_files: Dict[str, _MappedFile] = {}
+
+
+def read_text(path: str, offset: int, length: int) -> str:
+    """
+    Text of one document, read by span from the corpus file at path.
+    Used by analysis worker processes: each maps the file once and decodes
+    documents in place, so page text never travels through a pipe.
+    """
+    mapped = _mapped_files.get(path)
+    if mapped is None:
+        mapped = _mapped_files[path] = _MappedFile(path)
+    return mapped.read(offset, length)
+
+
+class TextCorpus:
+    """
+    Append-only corpus of page texts: one contiguous UTF-8 file plus an index
+    of (offset, length) and a key (the page URL) per document.
+    
+    Documents are written once and read back through a memory map, by this
+    process or by analysis workers given their span, so the texts do not have
+    to stay in memory. close() writes the index next to the data file
+    (path + '.idx'); TextCorpus.load() opens both again for re-analysis.
+    A corpus created without a path lives in a temporary file removed on close.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Data file to create (replacing any earlier corpus there),
+                or None for a temporary corpus
+        """
+        self.temporary = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix='corpus-', suffix='.bin')
+            os.close(fd)
+        self.path = path
+        self._file = open(path, 'wb')
+        self._size = 0
+        self._spans = array('Q')   # offset, length, offset, length, ...
+        self._keys = []
+        self._mapped = None
+    
+    @classmethod
+    def load(cls, path: str) -> 'TextCorpus':
+        """Open a saved corpus read-only"""
+        corpus = cls.__new__(cls)
+        corpus.temporary = False
+        corpus.path = path
+        corpus._file = None
+        corpus._size = os.path.getsize(path)
+        corpus._mapped = None
+        with open(path + INDEX_SUFFIX, 'rb') as f:
+            count, = struct.unpack('<Q', f.read(8))
+            corpus._spans = array('Q')
+            corpus._spans.frombytes(f.read(16 * count))
+            if sys.byteorder == 'big':
+                corpus._spans.byteswap()
+            corpus._keys = f.read().decode('utf-8').split('\n') if count else []
+        return corpus
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def add(self, key: str, text: str) -> int:
+        """Append a document; returns its number"""
+        data = text.encode('utf-8')
+        self._file.write(data)
+        self._spans.append(self._size)
+        self._spans.append(len(data))
+        self._size += len(data)
+        self._keys.append(key.replace('\n', ' '))
+        return len(self._keys) - 1
+    
+    def flush(self):
+        """Make added documents readable from other processes"""
+        if self._file is not None:
+            self._file.flush()
+    
+    def span(self, doc: int) -> Tuple[int, int]:
+        """(offset, length) of a document in the data file"""
+        return self._spans[2 * doc], self._spans[2 * doc + 1]
+    
+    def key(self, doc: int) -> str:
+        return self._keys[doc]
+    
+    def text(self, doc: int) -> str:
+        self.flush()
+        if self._mapped is None:
+            self._mapped = _MappedFile(self.path)
+        return self._mapped.read(*self.span(doc))
+    
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        """(key, text) for every document, in the order they were added"""
+        for doc in range(len(self)):
+            yield self._keys[doc], self.text(doc)
+    
+    def _write_index(self):
+        # Little-endian on disk, like the count
+        spans = array('Q', self._spans)
+        if sys.byteorder == 'big':
+            spans.byteswap()
+        with open(self.path + INDEX_SUFFIX, 'wb') as f:
+            f.write(struct.pack('<Q', len(self._keys)))
+            f.write(spans.tobytes())
+            f.write('\n'.join(self._keys).encode('utf-8'))
+    
+    def close(self):
+        """Write the index, or remove a temporary corpus"""
+        if self._mapped is not None:
+            self._mapped.close()
+            self._mapped = None
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        if self.temporary:
+            os.remove(self.path)
+        else:
+            self._write_index()
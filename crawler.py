@@ -0,0 +1,162 @@
+import heapq
+import html
+import itertools
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from bs4 import BeautifulSoup
+
+from extractor import extract_page
+from http_cache import normalize_url
+from project_constants import KEYWORDS, CRAWL_MAX_DEPTH, CRAWL_MAX_PAGES, CRAWL_SITE_WORKERS
+
+# Links to files that are never worth analyzing
+SKIPPED_EXTENSIONS = (
+    '.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.ico', '.css', '.js',
+    '.zip', '.gz', '.mp3', '.mp4', '.mov', '.avi', '.doc', '.docx', '.xls', '.xlsx', '.xml'
+)
+
+# Only the first entries of very large sitemaps are considered
+MAX_SITEMAP_URLS = 1000
+
+SITEMAP_LOC = re.compile(r'<loc>\s*([^<]+?)\s*</loc>', re.IGNORECASE)
+
+
+def _all_keywords(keywords: Dict) -> List[str]:
+    words = []
+    for value in keywords.values():
+        for category_keywords in (value.values() if isinstance(value, dict) else [value]):
+            words.extend(category_keywords)
+    return words
+
+
+class SiteCrawler:
+    """
+    Bounded crawl of one company site for WebsiteScraper.
+    Starting from the homepage and any sitemap.xml entries, follows same-domain
+    links up to a depth and page budget, visiting links whose anchor text or URL
+    mentions KEYWORDS first. Pages are fetched concurrently and their text is
+    aggregated into a single scraped result.
+    """
+    
+    def __init__(self, scraper, max_depth: int = CRAWL_MAX_DEPTH, max_pages: int = CRAWL_MAX_PAGES,
+                 workers: int = CRAWL_SITE_WORKERS):
+        self.scraper = scraper
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.workers = workers
+        # Keyword stems match at the start of words, so 'product' also ranks '/products'
+        self.link_pattern = re.compile(r'\b(?:' + '|'.join(_all_keywords(KEYWORDS)) + r')', re.IGNORECASE)
+    
+    def _site_key(self, url: str) -> str:
+        host = (urlsplit(url).hostname or '').lower()
+        return host[4:] if host.startswith('www.') else host
+    
+    def link_priority(self, url: str, anchor_text: str) -> int:
+        """Number of distinct keywords in a link's anchor text and URL path"""
+        text = anchor_text + ' ' + re.sub(r'[\W_]+', ' ', urlsplit(url).path)
+        return len({match.group(0).lower() for match in self.link_pattern.finditer(text)})
+    
+    def _accept(self, url: str, site: str) -> Optional[str]:
+        """Normalized URL if the link should be crawled, else None"""
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or self._site_key(url) != site:
+            return None
+        if parts.path.lower().endswith(SKIPPED_EXTENSIONS):
+            return None
+        return normalize_url(url)
+    
+    def _parse_with_links(self, content: bytes, url: str) -> Tuple[Dict, List[Tuple[str, str]]]:
+        """Scraped result plus (absolute URL, anchor text) for every link on the page"""
+        with self.scraper.metrics.time('parse'):
+            if self.scraper.extractor == 'stream':
+                result, links = extract_page(content, url, with_links=True)
+                return result, [(urljoin(url, href), anchor_text) for href, anchor_text in links]
+            
+            soup = BeautifulSoup(content, 'html.parser')
+            
+            # Collect links before nav/footer are stripped from the tree
+            links = [(urljoin(url, a['href']), a.get_text(' ', strip=True)) for a in soup.find_all('a', href=True)]
+            
+            return self.scraper._extract_from_soup(soup, url), links
+    
+    def _try_page(self, url: str) -> Optional[Tuple[Dict, List[Tuple[str, str]]]]:
+        """Fetch and parse a subpage with a single attempt; None if it fails"""
+        try:
+            return self._parse_with_links(self.scraper._fetch_page(url, retries=1)[0], url)
+        except Exception:
+            return None
+    
+    def _sitemap_urls(self, homepage: str) -> List[str]:
+        """Page URLs listed in the site's sitemap.xml, if it has one"""
+        parts = urlsplit(homepage)
+        try:
+            content, _ = self.scraper._fetch_page(f"{parts.scheme}://{parts.netloc}/sitemap.xml", retries=1,
+                                                  content_types=None)
+        except Exception:
+            return []
+        
+        urls = []
+        for match in SITEMAP_LOC.finditer(content.decode('utf-8', 'replace')):
+            url = html.unescape(match.group(1))
+            if not url.lower().endswith('.xml'):  # Skip nested sitemap indexes
+                urls.append(url)
+                if len(urls) == MAX_SITEMAP_URLS:
+                    break
+        return urls
+    
+    def crawl(self, url: str) -> Dict:
+        """
+        Crawl a company site starting at its homepage.
+        
+        Returns:
+            Scraped result dict with the homepage title and description, content
+            aggregated from all crawled pages, and 'pages_crawled'
+        
+        Raises:
+            The error of a failed homepage fetch, for the scraper to retry or report
+        """
+        site = self._site_key(url)
+        content, truncated = self.scraper._fetch_page(url)
+        result, links = self._parse_with_links(content, url)
+        if truncated:
+            self.scraper._mark_truncated(result)
+        
+        seen = {normalize_url(url)}
+        frontier = []
+        order = itertools.count()
+        
+        def enqueue(link: str, anchor_text: str, depth: int):
+            key = self._accept(link, site)
+            if key is None or key in seen or depth > self.max_depth:
+                return
+            seen.add(key)
+            heapq.heappush(frontier, (-self.link_priority(key, anchor_text), depth, next(order), key))
+        
+        for link, anchor_text in links:
+            enqueue(link, anchor_text, 1)
+        for link in self._sitemap_urls(url):
+            enqueue(link, '', 1)
+        
+        contents = [result['content']]
+        pages = 1
+        
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while frontier and pages < self.max_pages:
+                # Fetch the best-ranked links concurrently, one wave at a time
+                wave = [heapq.heappop(frontier) for _ in range(min(self.workers, self.max_pages - pages, len(frontier)))]
+                
+                for (_, depth, _, page_url), page in zip(wave, executor.map(self._try_page, [w[3] for w in wave])):
+                    if page is None:
+                        continue
+                    page_result, page_links = page
+                    pages += 1
+                    contents.append(page_result['content'])
+                    for link, anchor_text in page_links:
+                        enqueue(link, anchor_text, depth + 1)
+        
+        result['content'] = ' '.join(content for content in contents if content)
+        result['pages_crawled'] = pages
+        return result
@@ -0,0 +1,122 @@
+import socket
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+
+from metrics import Metrics
+from retry import PERMANENT_DNS_ERRORS
+from project_constants import DNS_CACHE_TTL, DNS_FAILURE_TTL, DNS_CACHE_SIZE, DNS_RESOLVE_WORKERS
+
+# (address family, IP address) pairs in resolver order
+Addresses = List[Tuple[int, str]]
+
+
+class DnsCache:
+    """
+    TTL cache of resolved host addresses shared by all fetches.
+    
+    The scraper's connections look their host up here instead of resolving
+    it on every new connection, and resolve_all() resolves a whole company
+    list's hosts concurrently before fetching starts. Names that do not exist
+    are cached (for a shorter time) as well; transient resolver failures are not.
+    """
+    
+    def __init__(self, ttl: float = DNS_CACHE_TTL, failure_ttl: float = DNS_FAILURE_TTL,
+                 max_entries: int = DNS_CACHE_SIZE, resolver: Callable = socket.getaddrinfo,
+                 metrics: Optional[Metrics] = None):
+        """
+        Args:
+            ttl: Seconds resolved addresses are reused
+            failure_ttl: Seconds a name that does not exist is remembered
+            max_entries: Least recently used hosts are dropped beyond this many
+            resolver: getaddrinfo-compatible function, e.g. a stub for benchmarks
+            metrics: Receives the time of each actual lookup as the 'dns' stage
+        """
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.max_entries = max_entries
+        self.resolver = resolver
+        self.metrics = metrics
+        # Counts of cache 'hits', 'lookups' made and names 'not_found'
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, Tuple[float, object]]' = OrderedDict()
+    
+    def lookup(self, host: str) -> Optional[Addresses]:
+        """
+        Cached addresses of host, or None if it is not cached (or expired).
+    
+        Raises:
+            socket.gaierror if host is cached as not existing
+        """
+        with self._lock:
+            entry = self._entries.get(host.lower())
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            self._entries.move_to_end(host.lower())
+            self.stats['hits'] += 1
+        if isinstance(entry[1], socket.gaierror):
+            raise entry[1]
+        return entry[1]
+    
+    def _store(self, host: str, ttl: float, value):
+        with self._lock:
+            self._entries[host] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(host)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def resolve(self, host: str) -> Addresses:
+        """
+        Addresses of host, from the cache or looked up now.
+    
+        Raises:
+            socket.gaierror if the name does not resolve
+        """
+        addresses = self.lookup(host)
+        if addresses is not None:
+            return addresses
+    
+        host = host.lower()
+        start = time.perf_counter()
+        try:
+            infos = self.resolver(host, None, 0, socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            if e.errno in PERMANENT_DNS_ERRORS:
+                self.stats['not_found'] += 1
+                self._store(host, self.failure_ttl, e)
+            raise
+        finally:
+            self.stats['lookups'] += 1
+            if self.metrics is not None:
+                self.metrics.observe('dns', time.perf_counter() - start)
+    
+        addresses = []
+        for family, _, _, _, sockaddr in infos:
+            if (family, sockaddr[0]) not in addresses:
+                addresses.append((family, sockaddr[0]))
+        self._store(host, self.ttl, addresses)
+        return addresses
+    
+    def _exists(self, host: str) -> bool:
+        """False only if the name definitely does not exist; lookup timeouts are left to the fetch"""
+        try:
+            self.resolve(host)
+        except socket.gaierror as e:
+            return e.errno not in PERMANENT_DNS_ERRORS
+        return True
+    
+    def resolve_all(self, hosts: Iterable[str], workers: int = DNS_RESOLVE_WORKERS) -> Set[str]:
+        """
+        Resolve host names concurrently into the cache.
+    
+        Returns:
+            The hosts whose names do not exist
+        """
+        hosts = list(dict.fromkeys(host.lower() for host in hosts))
+        if not hosts:
+            return set()
+        with ThreadPoolExecutor(max_workers=min(workers, len(hosts))) as executor:
+            return {host for host, exists in zip(hosts, executor.map(self._exists, hosts)) if not exists}
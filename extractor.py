@@ -0,0 +1,280 @@
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+from bs4 import CData, NavigableString, UnicodeDammit
+
+# The streaming extractor drives bs4's private html.parser subclass. If a bs4
+# release moves or changes it, STREAM_EXTRACTOR_AVAILABLE is False and
+# WebsiteScraper falls back to building BeautifulSoup trees.
+try:
+    from bs4.builder import HTMLParserTreeBuilder
+    from bs4.builder._htmlparser import BeautifulSoupHTMLParser
+except (ImportError, AttributeError):
+    HTMLParserTreeBuilder = BeautifulSoupHTMLParser = None
+
+# Tags whose text is dropped, and tags searched for main content, in search order
+UNWANTED_TAGS = frozenset(['script', 'style', 'nav', 'footer', 'iframe', 'noscript'])
+CONTENT_TAGS = ['main', 'article', 'div.content', 'section']
+
+# Tree-building rules of the html.parser builder that BeautifulSoup would use
+_BUILDER = HTMLParserTreeBuilder() if HTMLParserTreeBuilder is not None else None
+_TEXT_TYPES = (NavigableString, CData)
+
+
+def normalize_text(text: str) -> str:
+    """Collapse extracted text into single-spaced phrases"""
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return ' '.join(chunk for chunk in chunks if chunk)
+
+
+class _Tag:
+    __slots__ = ('name', 'is_empty_element')
+
+    def __init__(self, name: str, is_empty_element: bool):
+        self.name = name
+        self.is_empty_element = is_empty_element
+
+
+class _PageEvents:
+    """
+    Stand-in for the BeautifulSoup object behind BeautifulSoupHTMLParser.
+    Tokenizing, entity handling and empty-element rules stay in bs4's parser;
+    this class follows the same tag stack rules as BeautifulSoup but only keeps
+    what WebsiteScraper extracts (title, meta description, content text and
+    optionally links) instead of building a tree.
+    """
+
+    ROOT = '[document]'
+    NO_CONTENT = object()
+
+    def __init__(self, with_links: bool = False):
+        self.builder = SimpleNamespace(store_line_numbers=False,
+                                       attribute_dict_class=_BUILDER.attribute_dict_class)
+        self.contains_replacement_characters = False
+        self.with_links = with_links
+
+        self.current_data = []
+        self.names = [self.ROOT]
+        self.ids = [0]
+        self.unwanted = [0]  # Unwanted tags on the stack up to each level
+        self.open_counts = {}
+        self.preserve_whitespace = 0
+        self.container_stack = []
+        self.next_id = 1
+
+        # First <title>: direct children of it and of its descendants
+        self.title_id = None
+        self.title_children = {}
+
+        # First <meta name="description">
+        self.meta_found = False
+        self.description = None
+
+        # First usable element of each CONTENT_TAGS name: level while open, collected text
+        self.open_targets = {}
+        self.target_text = {}
+        self.fallback_text = []
+
+        # Links in document order, with anchor text collected while the <a> is open
+        self.links = []
+        self.open_links = []
+
+    def _removed(self, name: str) -> bool:
+        """Would the element being opened already be decomposed when find(name) runs?"""
+        for earlier in CONTENT_TAGS[:CONTENT_TAGS.index(name)]:
+            level = self.open_targets.get(earlier)
+            if level is not None and self.unwanted[-1] > self.unwanted[level]:
+                return True
+        return False
+
+    def handle_starttag(self, name, namespace, nsprefix, attrs, sourceline=None, sourcepos=None,
+                        namespaces=None) -> _Tag:
+        self.endData()
+        element_id = self.next_id
+        self.next_id += 1
+
+        parent_children = self.title_children.get(self.ids[-1])
+        if parent_children is not None:
+            parent_children.append(('tag', element_id))
+            self.title_children[element_id] = []
+        elif name == 'title' and self.title_id is None:
+            self.title_id = element_id
+            self.title_children[element_id] = []
+
+        if name == 'meta' and not self.meta_found and attrs.get('name') == 'description':
+            self.meta_found = True
+            self.description = attrs.get('content', self.NO_CONTENT)
+
+        level = len(self.names)
+        if name in CONTENT_TAGS and name not in self.target_text and not self._removed(name):
+            self.open_targets[name] = level
+            self.target_text[name] = []
+
+        if self.with_links and name == 'a' and 'href' in attrs:
+            link = [attrs['href'], []]
+            self.links.append(link)
+            self.open_links.append((level, link))
+
+        self.names.append(name)
+        self.ids.append(element_id)
+        self.unwanted.append(self.unwanted[-1] + (name in UNWANTED_TAGS))
+        self.open_counts[name] = self.open_counts.get(name, 0) + 1
+        if name in _BUILDER.preserve_whitespace_tags:
+            self.preserve_whitespace += 1
+        if name in _BUILDER.string_containers:
+            self.container_stack.append(name)
+
+        return _Tag(name, name in _BUILDER.empty_element_tags)
+
+    def popTag(self):
+        level = len(self.names) - 1
+        name = self.names.pop()
+        self.ids.pop()
+        self.unwanted.pop()
+        self.open_counts[name] -= 1
+        if name in _BUILDER.preserve_whitespace_tags:
+            self.preserve_whitespace -= 1
+        if name in _BUILDER.string_containers:
+            self.container_stack.pop()
+        if self.open_targets.get(name) == level:
+            del self.open_targets[name]
+        if self.open_links and self.open_links[-1][0] == level:
+            self.open_links.pop()
+
+    def handle_endtag(self, name, nsprefix=None):
+        self.endData()
+        if name == self.ROOT:
+            return
+
+        # Pop up to and including the most recent open tag with this name
+        for i in range(len(self.names) - 1, 0, -1):
+            if not self.open_counts.get(name):
+                break
+            found = self.names[i] == name
+            self.popTag()
+            if found:
+                break
+
+    def handle_data(self, data: str):
+        self.current_data.append(data)
+
+    def endData(self, containerClass=None):
+        if not self.current_data:
+            return
+
+        data = ''.join(self.current_data)
+        self.current_data = []
+
+        # Whitespace-only strings collapse to a single newline or space
+        if not self.preserve_whitespace and not data.strip('\x20\x0a\x09\x0c\x0d'):
+            data = '\n' if '\n' in data else ' '
+
+        container = containerClass or NavigableString
+        if self.container_stack and container is NavigableString:
+            container = _BUILDER.string_containers.get(self.container_stack[-1], container)
+
+        children = self.title_children.get(self.ids[-1])
+        if children is not None:
+            children.append(('string', data))
+
+        if container not in _TEXT_TYPES:
+            return
+
+        unwanted = self.unwanted[-1]
+        for name, level in self.open_targets.items():
+            if unwanted == self.unwanted[level]:
+                self.target_text[name].append(data)
+        if not unwanted:
+            self.fallback_text.append(data)
+
+        if self.open_links:
+            stripped = data.strip()
+            if stripped:
+                for _, link in self.open_links:
+                    link[1].append(stripped)
+
+    def close(self):
+        self.endData()
+        while len(self.names) > 1:
+            self.popTag()
+
+    def title_string(self, element_id: int) -> Optional[str]:
+        """Equivalent of Tag.string: the only string below single-child chains, else None"""
+        children = self.title_children[element_id]
+        if len(children) != 1:
+            return None
+        kind, value = children[0]
+        return value if kind == 'string' else self.title_string(value)
+
+
+def extract_page(content: bytes, url: str, with_links: bool = False) -> Tuple[Dict, List[Tuple[str, str]]]:
+    """
+    Extract title, meta description and main text in a single streaming pass.
+
+    Produces the same result (and raises the same errors) as parsing the page
+    into a BeautifulSoup html.parser tree and extracting from that, without
+    building the tree.
+
+    Args:
+        content: Raw page bytes
+        url: Page URL, stored in the result and used to resolve links
+        with_links: Also collect (href, anchor text) for every <a href>
+
+    Returns:
+        (scraped result dict, links)
+    """
+    markup = UnicodeDammit(content, is_html=True).unicode_markup
+    events = _PageEvents(with_links)
+    parser = BeautifulSoupHTMLParser(events, convert_charrefs=False)
+    parser.feed(markup)
+    parser.close()
+    events.close()
+
+    # Get meta data
+    description = ""
+    if events.meta_found:
+        if events.description is _PageEvents.NO_CONTENT:
+            raise KeyError('content')
+        description = events.description
+
+    title = events.title_string(events.title_id) if events.title_id is not None else ""
+
+    # Get main content
+    main_content = ""
+    for name in CONTENT_TAGS:
+        if name in events.target_text:
+            main_content += normalize_text(''.join(events.target_text[name])) + " "
+
+    # If no main content found, use entire page
+    if not main_content.strip():
+        main_content = normalize_text(''.join(events.fallback_text))
+
+    result = {
+        'title': title.strip(),
+        'description': description.strip(),
+        'content': main_content.strip(),
+        'url': url,
+        'status': 'success'
+    }
+    links = [(href, ' '.join(parts)) for href, parts in events.links]
+    return result, links
+
+
+# Page whose extraction checks that bs4's parser internals still behave as extract_page expects
+_CHECK_PAGE = (b'<html><head><title>Title</title><meta name="description" content="About"></head>'
+               b'<body><nav>Menu</nav><main><p>Main &amp; <a href="/more">more</a></p></main></body></html>')
+
+
+def _stream_extractor_works() -> bool:
+    if BeautifulSoupHTMLParser is None:
+        return False
+    try:
+        result, links = extract_page(_CHECK_PAGE, 'https://example.com/', with_links=True)
+    except Exception:
+        return False
+    return ((result['title'], result['description'], result['content']) == ('Title', 'About', 'Main & more')
+            and links == [('/more', 'more')])
+
+
+STREAM_EXTRACTOR_AVAILABLE = _stream_extractor_works()
@@ -0,0 +1,135 @@
+import sqlite3
+import threading
+import time
+from collections import Counter, namedtuple
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from project_constants import CACHE_TTL, CACHE_MAX_BYTES
+
+CachedResponse = namedtuple('CachedResponse', ['body', 'etag', 'last_modified', 'fetched_at', 'fresh'])
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL for use as a cache key (case, default port, fragment, empty path)"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    return urlunsplit((scheme, host, parts.path or '/', parts.query, ''))
+
+
+class ResponseCache:
+    """
+    Persistent SQLite cache of downloaded pages for WebsiteScraper.
+    Entries younger than the TTL are served without a request; older ones are
+    revalidated with If-None-Match/If-Modified-Since. The least recently used
+    entries are evicted to keep the stored bodies under a size budget.
+    """
+    
+    def __init__(self, path: str, ttl: float = CACHE_TTL, max_bytes: int = CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        # Counts of 'hit' (served from cache), 'revalidated' (304) and 'miss' (full download,
+        # counted by the scraper, as truncated or oversized pages are downloaded but not stored)
+        self.stats = Counter()
+        
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._db.commit()
+        self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+    
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """
+        Look up a cached page.
+        
+        Returns:
+            CachedResponse, with fresh=True if it can be used without revalidation,
+            or None if the URL is not cached
+        """
+        key = normalize_url(url)
+        now = time.time()
+        
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM responses WHERE url = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (now, key))
+            self._db.commit()
+        
+        fresh = now - row[3] < self.ttl
+        if fresh:
+            self.stats['hit'] += 1
+        return CachedResponse(row[0], row[1], row[2], row[3], fresh)
+    
+    def validators(self, cached: CachedResponse) -> Dict[str, str]:
+        """Conditional request headers for revalidating a cached page"""
+        headers = {}
+        if cached.etag:
+            headers['If-None-Match'] = cached.etag
+        if cached.last_modified:
+            headers['If-Modified-Since'] = cached.last_modified
+        return headers
+    
+    def refresh(self, url: str):
+        """Mark a cached page as revalidated (the server answered 304 Not Modified)"""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, normalize_url(url))
+            )
+            self._db.commit()
+        self.stats['revalidated'] += 1
+    
+    def put(self, url: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Store a freshly downloaded page and evict old entries if over budget"""
+        key = normalize_url(url)
+        now = time.time()
+        
+        if len(body) > self.max_bytes:
+            return
+        
+        with self._lock:
+            previous = self._db.execute("SELECT size FROM responses WHERE url = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, body, etag, last_modified, now, now, len(body))
+            )
+            self._total_bytes += len(body) - (previous[0] if previous else 0)
+            self._evict()
+            self._db.commit()
+    
+    def _evict(self):
+        """Delete least recently used entries until under max_bytes (lock held)"""
+        if self._total_bytes <= self.max_bytes:
+            return
+        
+        evicted = []
+        for url, size in self._db.execute("SELECT url, size FROM responses ORDER BY accessed_at"):
+            if self._total_bytes <= self.max_bytes:
+                break
+            evicted.append((url,))
+            self._total_bytes -= size
+        self._db.executemany("DELETE FROM responses WHERE url = ?", evicted)
+    
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,24 @@
+from importlib.util import find_spec
+
+# pyarrow is optional and slow to import, so it is imported by load_pyarrow()
+# on first use. Callers refer to the modules as lazy_pyarrow.pa/pc/pq.
+pa = pc = pq = None
+
+
+def pyarrow_available() -> bool:
+    """Whether pyarrow is installed, checked without importing it"""
+    return find_spec('pyarrow') is not None
+
+
+def load_pyarrow() -> bool:
+    """Import pyarrow on first use; False if it is not installed"""
+    global pa, pc, pq
+    if pa is None:
+        try:
+            import pyarrow
+            import pyarrow.compute
+            import pyarrow.parquet
+        except ImportError:
+            return False
+        pa, pc, pq = pyarrow, pyarrow.compute, pyarrow.parquet
+    return True
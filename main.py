@@ -3,16 +3,35 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import time
+import queue
 import logging
-from typing import Dict, List
-import pandas as pd
+import argparse
+import threading
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from scraper import WebsiteScraper
 from analyzer import TextAnalyzer
 from categorizer import CompanyCategorizer
-from output import ReportGenerator
+from output import ReportGenerator, FORMAT_SUFFIXES
+from analysis_pool import AnalysisPool, analyze_combined_text, combined_text
+from http_cache import ResponseCache
+from metrics import Metrics
+from analysis_store import AnalysisStore, rules_fingerprint
+from analysis_snapshot import AnalysisSnapshotWriter, rescore_snapshot, snapshot_available
+from run_journal import RunJournal
+from corpus import TextCorpus
+from records import CompanyAnalysis
+from company_loader import CompanyLoader, company_key
 from project_constants import COMPANIES
-from project_constants import HEADERS, TIMEOUT
+from project_constants import HEADERS, TIMEOUT, STREAM_QUEUE_SIZE, CACHE_PATH
+from project_constants import ANALYSIS_STORE_PATH, ANALYSIS_SNAPSHOT_PATH, RUN_JOURNAL_PATH, METRICS_PATH
+from project_constants import HOST_RATE_LIMIT, CORPUS_PATH
+
+# pandas, xlsxwriter and pyarrow are imported when a report or snapshot is
+# first written, and requests/bs4 when a scraper is built, so short runs
+# such as --rescore start quickly
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 # Configure logging
@@ -36,74 +55,369 @@ class ProbioticsProspector:
     4. Generates reports
     """
     
-    def __init__(self):
-        self.scraper = WebsiteScraper(max_workers=5)
-        self.analyzer = TextAnalyzer()
+    def __init__(self, analysis_workers: int = 0, cache_path: Optional[str] = None,
+                 analysis_store_path: Optional[str] = None, crawl: bool = False,
+                 snapshot_path: Optional[str] = None, report_formats: Iterable[str] = ('xlsx',),
+                 journal_path: Optional[str] = None, resume: bool = False,
+                 host_rate: Optional[float] = HOST_RATE_LIMIT, respect_robots: bool = True,
+                 preresolve_dns: bool = False, corpus_path: Optional[str] = None):
+        """
+        Args:
+            analysis_workers: Number of processes for text analysis;
+                0 analyzes in the main process
+            cache_path: SQLite file for the persistent HTTP response cache;
+                None disables caching
+            analysis_store_path: SQLite file of stored analysis results, reused
+                while page text and rules are unchanged; None disables it
+            crawl: Crawl several pages per company site instead of the homepage only
+            snapshot_path: Parquet file receiving each company's analysis, for
+                re-scoring with `--rescore`; None disables it
+            report_formats: Report outputs to write (xlsx, parquet, arrow, csv)
+            journal_path: SQLite file recording each finished company, so an
+                interrupted run can be resumed; None disables it
+            resume: Keep the journal of an earlier run and skip the companies
+                it already finished, instead of starting a new journal
+            host_rate: Requests per second allowed per website host; None for no limit
+            respect_robots: Skip pages disallowed by robots.txt and follow its Crawl-delay
+            preresolve_dns: Resolve upcoming companies' host names concurrently before
+                fetching, failing domains that do not exist without a fetch
+            corpus_path: File keeping every scraped page's text (plus an index) for
+                later re-analysis. With analysis workers a temporary corpus is
+                used otherwise, so workers read page text from it instead of
+                receiving copies
+        """
+        from scraper import WebsiteScraper
+        
+        # Per-stage timings, per-host latencies and counters of this run
+        self.metrics = Metrics()
+        cache = ResponseCache(cache_path) if cache_path else None
+        self.scraper = WebsiteScraper(max_workers=5, cache=cache, crawl=crawl, metrics=self.metrics,
+                                      host_rate=host_rate, respect_robots=respect_robots,
+                                      preresolve_dns=preresolve_dns)
+        self.analyzer = TextAnalyzer(self.metrics)
         self.categorizer = CompanyCategorizer()
-        self.report_generator = ReportGenerator()
+        self.report_generator = ReportGenerator(formats=report_formats, metrics=self.metrics)
+        # Page text goes to the corpus once analyzed, instead of staying in memory until the report
+        self.corpus = TextCorpus(corpus_path) if corpus_path or analysis_workers > 0 else None
+        self.analysis_pool = None
+        if analysis_workers > 0:
+            self.analysis_pool = AnalysisPool(analysis_workers, metrics=self.metrics, corpus=self.corpus)
+        self.analysis_store = None
+        if analysis_store_path:
+            fingerprint = rules_fingerprint(self.categorizer.scoring_weights, self.categorizer.min_scores)
+            self.analysis_store = AnalysisStore(analysis_store_path, fingerprint)
+        self.snapshot = AnalysisSnapshotWriter(snapshot_path) if snapshot_path else None
+        self.journal = RunJournal(journal_path, resume=resume) if journal_path else None
+        # Set once a run has written its report; until then close() keeps the previous snapshot
+        self.completed = False
+    
+    def close(self):
+        """Release scraper connections and analysis worker processes"""
+        self.scraper.close()
+        if self.analysis_pool is not None:
+            self.analysis_pool.close()
+        if self.analysis_store is not None:
+            self.analysis_store.close()
+        if self.snapshot is not None:
+            if self.completed:
+                self.snapshot.close()
+            else:
+                self.snapshot.discard()
+        if self.journal is not None:
+            self.journal.close()
+        if self.corpus is not None:
+            self.corpus.close()
     
-    def process_companies(self, companies: List[Dict]) -> pd.DataFrame:
+    def _analyze_company(self, data: Dict) -> CompanyAnalysis:
+        """Analyze and categorize one company's scraped data, reusing stored results"""
+        text = combined_text(data)
+        if text is not None and self.corpus is not None:
+            self.corpus.add(data.get('url', ''), text)
+        if text is None or self.analysis_store is None:
+            return analyze_combined_text(text, self.analyzer, self.categorizer)
+        
+        result = self.analysis_store.get(text)
+        if result is None:
+            result = analyze_combined_text(text, self.analyzer, self.categorizer)
+            self.analysis_store.put(text, result)
+        return result
+    
+    def _analyze_all(self, items: Iterable) -> Iterator:
+        """Analyze (key, scraped_data) pairs, in the process pool when enabled"""
+        if self.analysis_pool is not None:
+            yield from self.analysis_pool.map(items, store=self.analysis_store)
+            return
+        
+        for key, data in items:
+            yield key, self._analyze_company(data)
+    
+    def process_companies(self, companies: Iterable[Dict]) -> 'pd.DataFrame':
         """
         Run the complete prospecting pipeline for a list of companies.
         
         Args:
-            companies: List of companies with 'name' and 'website' keys
+            companies: Companies with 'name' and 'website' keys; an iterator
+                is consumed as scraping proceeds
             
         Returns:
             pandas DataFrame with all results
         """
-        logger.info(f"Starting prospecting for {len(companies)} companies")
-        
-        # Step 1: Scrape websites
-        logger.info("Scraping company websites...")
-        scraped_data = self.scraper.scrape_websites(companies)
-        logger.info(f"Successfully scraped {len([v for v in scraped_data.values() if v['status'] == 'success'])}/{len(companies)} websites")
-        
-        # Step 2: Analyze content
-        logger.info("Analyzing scraped content...")
-        analysis_results = {}
-        for company_name, data in scraped_data.items():
-            if data['status'] == 'success':
-                combined_text = f"{data['title']} {data['description']} {data['content']}"
-                analysis = self.analyzer.analyze_text(combined_text)
-                categorization = self.categorizer.categorize_company(analysis)
-                
-                # Combine all results
-                analysis_results[company_name] = {
-                    **analysis,
-                    **categorization
-                }
-            else:
-                analysis_results[company_name] = {
-                    'category': 'Not Relevant',
-                    'relevance_score': 0,
-                    'is_relevant': False,
-                    'health_segments': 'None',
-                    'is_fb': False,
-                    'mentions_probiotics': False,
-                    'is_manufacturer': False,
-                    'is_brand': False,
-                    'is_distributor': False
-                }
+        logger.info("Starting prospecting run")
+        
+        # Steps 1 and 2: Scrape websites and analyze content as pages arrive
+        logger.info("Scraping and analyzing company websites...")
+        loaded = []
+        
+        def load():
+            for company in companies:
+                loaded.append(company)
+                yield company
+        
+        # The report and snapshot only read each scrape result's status, so only that is kept
+        scraped_data, analysis_results = {}, {}
+        for company, data, analysis in self._iter_results(load()):
+            scraped_data[company_key(company)] = {'status': data['status']}
+            analysis_results[company_key(company)] = analysis
+        companies = loaded
+        logger.info(f"Successfully scraped {len([v for v in scraped_data.values() if v['status'].startswith('success')])}/{len(companies)} websites")
+        
+        if self.snapshot is not None:
+            for company in companies:
+                key = company_key(company)
+                self.snapshot.add(company, scraped_data.get(key, {}), analysis_results.get(key, CompanyAnalysis()))
         
         # Step 3: Generate report
-        logger.info("Generating Excel report...")
-        df = self.report_generator.create_dataframe(companies, scraped_data, analysis_results)
-        self.report_generator.generate_excel_report(df)
-        logger.info(f"Report generated: probiotics_prospects.xlsx")
+        logger.info("Generating report...")
+        with self.metrics.time('report'):
+            df = self.report_generator.create_dataframe(companies, scraped_data, analysis_results)
+        self.report_generator.write_report(df)
+        self.completed = True
+        logger.info(f"Report generated: {', '.join(self.report_generator.output_paths().values())}")
         
         return df
+    
+    def _scrape_into_queue(self, companies: Iterable[Dict], results: queue.Queue, errors: List[BaseException]):
+        """
+        Producer thread: push (company, scraped_data) into the bounded queue.
+        An exception ends the queue early and is left in errors for the consumer to raise.
+        """
+        try:
+            for item in self.scraper.iter_scrape_websites(companies):
+                results.put(item)
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            results.put(None)
+    
+    def _iter_results(self, companies: Iterable[Dict]) -> Iterator[Tuple[Dict, Dict, CompanyAnalysis]]:
+        """
+        Yield (company, scraped_data, analysis) as each company finishes.
+        
+        Scraping runs in a producer thread feeding a bounded queue and pages are
+        analyzed as they arrive. Each finished company is recorded in the run
+        journal; companies an earlier run already finished are not scraped
+        again but replayed from the journal at the end.
+        
+        Raises:
+            The exception that stopped scraping (e.g. an unreadable company
+            list) once the companies scraped before it are yielded
+        """
+        if self.journal is not None:
+            companies = self.journal.filter_pending(companies)
+        
+        results = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+        errors = []
+        producer = threading.Thread(target=self._scrape_into_queue, args=(companies, results, errors), daemon=True)
+        producer.start()
+        
+        scraped = (((company, data), data) for company, data in iter(results.get, None))
+        for (company, data), analysis in self._analyze_all(scraped):
+            if self.corpus is not None:
+                data.pop('content', None)  # Kept in the corpus
+            if self.journal is not None:
+                self.journal.record(company, data, analysis)
+            yield company, data, analysis
+        
+        producer.join()
+        if errors:
+            raise errors[0]
+        
+        if self.journal is not None:
+            yield from self.journal.replayed()
+    
+    def _iter_rows(self, companies: Iterable[Dict], summary: Counter) -> Iterator[Dict]:
+        """Yield finished report rows as companies complete"""
+        for company, data, analysis in self._iter_results(companies):
+            row = self.report_generator.build_row(company, data, analysis)
+            if self.snapshot is not None:
+                self.snapshot.add(company, data, analysis)
+            
+            summary['companies'] += 1
+            summary['scraped'] += data['status'].startswith('success')
+            summary[analysis.category] += 1
+            yield row
+    
+    def process_companies_streaming(self, companies: Iterable[Dict]) -> Counter:
+        """
+        Run the pipeline as a stream: scrape, analyze, categorize and write each
+        company as it completes.
+        
+        Scraping runs in a producer thread feeding a bounded queue, analysis runs
+        while pages are still downloading, and rows are written to the report as
+        soon as they are ready. Page text is dropped once its row is written, so
+        memory stays flat however many companies are processed.
+        
+        Args:
+            companies: Iterable of companies with 'name' and 'website' keys
+            
+        Returns:
+            Counter with 'companies', 'scraped' and per-category totals
+        """
+        logger.info("Starting streaming prospecting run")
+        summary = Counter()
+        
+        self.report_generator.write_rows(self._iter_rows(companies, summary))
+        self.completed = True
+        
+        logger.info(f"Successfully scraped {summary['scraped']}/{summary['companies']} websites")
+        logger.info(f"Report generated: {', '.join(self.report_generator.output_paths().values())}")
+        return summary
 
 def main():
+    parser = argparse.ArgumentParser(description='Probiotics company prospecting')
+    parser.add_argument('--input', metavar='FILE',
+                        help='Company list to process (.csv, .jsonl or .parquet, read in chunks and '
+                             'deduplicated by domain) instead of the built-in COMPANIES')
+    parser.add_argument('--name-column', help='Company name column of --input (default: name/company)')
+    parser.add_argument('--website-column', help='Website column of --input (default: website/url/domain)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Process companies as a stream with flat memory use')
+    parser.add_argument('--crawl', action='store_true',
+                        help='Crawl product/about/science pages, not just the homepage')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Download every page instead of using the HTTP response cache')
+    parser.add_argument('--reanalyze', action='store_true',
+                        help='Recompute every analysis instead of reusing stored results')
+    parser.add_argument('--analysis-workers', type=int, default=0,
+                        help='Processes used for text analysis (default: analyze in the main process)')
+    parser.add_argument('--rescore', action='store_true',
+                        help='Re-apply SCORING_WEIGHTS/MIN_SCORES to the last run\'s saved analysis '
+                             'and write a new report, without scraping')
+    parser.add_argument('--host-rate', type=float, default=HOST_RATE_LIMIT,
+                        help=f'Requests per second per website host (default: {HOST_RATE_LIMIT}; 0 for no limit '
+                             f'other than robots.txt Crawl-delay)')
+    parser.add_argument('--ignore-robots', action='store_true',
+                        help='Fetch pages even where robots.txt disallows them')
+    parser.add_argument('--preresolve-dns', action='store_true',
+                        help='Resolve all website host names concurrently ahead of scraping and '
+                             'skip domains that do not exist')
+    parser.add_argument('--keep-corpus', action='store_true',
+                        help=f'Save the scraped page text to {CORPUS_PATH} (indexed by URL) for later re-analysis')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted run, skipping companies it already scraped successfully '
+                             'and retrying the rest')
+    parser.add_argument('--metrics-port', type=int,
+                        help=f'Serve Prometheus-format metrics at http://127.0.0.1:PORT/metrics during the run '
+                             f'(per-stage timings are always written to {METRICS_PATH})')
+    parser.add_argument('--formats', nargs='+', default=['xlsx'], choices=list(FORMAT_SUFFIXES),
+                        help='Report outputs to write (default: xlsx)')
+    args = parser.parse_args()
+    
     try:
         start_time = time.time()
         
-        prospector = ProbioticsProspector()
-        df = prospector.process_companies(COMPANIES)
+        if args.rescore:
+            df = rescore_snapshot(ANALYSIS_SNAPSHOT_PATH, CompanyCategorizer())
+            ReportGenerator(formats=args.formats).write_report(df)
+            logger.info(f"Re-scored {len(df)} companies from {ANALYSIS_SNAPSHOT_PATH}")
+            
+            print("\nProspecting Summary:")
+            print(df['Category'].value_counts().to_string())
+            print(f"\nCompleted in {time.time() - start_time:.2f} seconds")
+            return
+        
+        if not snapshot_available():
+            logger.warning("pyarrow is not installed; no analysis snapshot will be saved for --rescore")
+        
+        prospector = ProbioticsProspector(
+            analysis_workers=args.analysis_workers,
+            cache_path=None if args.no_cache else CACHE_PATH,
+            analysis_store_path=None if args.reanalyze else ANALYSIS_STORE_PATH,
+            crawl=args.crawl,
+            snapshot_path=ANALYSIS_SNAPSHOT_PATH if snapshot_available() else None,
+            report_formats=args.formats,
+            journal_path=RUN_JOURNAL_PATH,
+            resume=args.resume,
+            host_rate=args.host_rate or None,
+            respect_robots=not args.ignore_robots,
+            preresolve_dns=args.preresolve_dns,
+            corpus_path=CORPUS_PATH if args.keep_corpus else None
+        )
+        try:
+            if args.metrics_port:
+                prospector.metrics.serve(args.metrics_port)
+                logger.info(f"Serving metrics at http://127.0.0.1:{args.metrics_port}/metrics")
+            
+            companies = COMPANIES
+            if args.input:
+                companies = CompanyLoader(args.input, name_column=args.name_column, website_column=args.website_column)
+            
+            if args.stream:
+                summary = prospector.process_companies_streaming(companies)
+                
+                # Print summary
+                print("\nProspecting Summary:")
+                for key, count in summary.most_common():
+                    print(f"{key}: {count}")
+            else:
+                df = prospector.process_companies(companies)
+                
+                # Print summary
+                print("\nProspecting Summary:")
+                print(df[['Company Name', 'Category', 'Relevance Score']].to_string(index=False))
+            
+            if args.input:
+                print(f"\nInput: {companies.stats['loaded']} companies loaded, "
+                      f"{companies.stats['duplicate']} duplicate domains and {companies.stats['invalid']} "
+                      f"rows without a usable website skipped")
+            
+            cache = prospector.scraper.cache
+            if cache is not None:
+                print(f"\nCache: {cache.stats['hit']} hits, {cache.stats['revalidated']} revalidated, "
+                      f"{cache.stats['miss']} downloaded")
+            
+            breaker = prospector.scraper.breaker
+            if breaker.stats['opened']:
+                print(f"Circuit breaker: opened for {breaker.stats['opened']} hosts, "
+                      f"{breaker.stats['rejected']} requests skipped")
+            
+            counters = prospector.metrics.counters
+            if counters['rate_limited'] or counters['robots_disallowed'] or counters['robots_errors']:
+                print(f"Politeness: {counters['rate_limited']} rate-limited responses, "
+                      f"{counters['robots_disallowed']} pages disallowed by robots.txt, "
+                      f"{counters['robots_errors']} robots.txt files unreachable (allowed)")
+            
+            if counters['dns_failed']:
+                print(f"DNS: {counters['dns_failed']} domains do not exist")
+            
+            journal = prospector.journal
+            if journal.stats['resumed'] or journal.stats['retried']:
+                print(f"Resumed: {journal.stats['resumed']} companies from the run journal, "
+                      f"{journal.stats['retried']} unsuccessful ones retried, {journal.stats['recorded']} processed")
+            
+            store = prospector.analysis_store
+            if store is not None:
+                print(f"Analysis: {store.stats['reused']} reused, {store.stats['computed']} computed")
+        finally:
+            prospector.close()
         
-        # Print summary
-        print("\nProspecting Summary:")
-        print(df[['Company Name', 'Category', 'Relevance Score']].to_string(index=False))
+        metrics = prospector.metrics
+        metrics.write_json(METRICS_PATH)
+        print("\nStage timings (total / mean seconds):")
+        for stage, histogram in metrics.to_dict()['stages'].items():
+            print(f"  {stage:>10}: {histogram['sum']:9.2f} / {histogram['mean']:.4f} over {histogram['count']}")
+        print(f"  {metrics.counters['bytes_fetched'] / 1024 ** 2:.1f} MB fetched, "
+              f"{metrics.counters['retries']} retries; details in {METRICS_PATH}")
         
         elapsed_time = time.time() - start_time
         print(f"\nCompleted in {elapsed_time:.2f} seconds")
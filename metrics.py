@@ -0,0 +1,194 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, Optional, Tuple
+
+from project_constants import METRICS_BUCKETS
+
+# Pipeline stages in the order a company passes through them
+STAGES = ('resolve', 'throttle', 'dns', 'connect', 'ttfb', 'download', 'parse', 'clean', 'match', 'categorize', 'report')
+
+METRIC_PREFIX = 'probiotics'
+
+
+class Histogram:
+    """Latency histogram with fixed upper bounds in seconds, plus an overflow bucket"""
+    
+    __slots__ = ('bounds', 'counts', 'count', 'sum')
+    
+    def __init__(self, bounds: Tuple[float, ...] = METRICS_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+    
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+    
+    def merge(self, other: 'Histogram'):
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.count += other.count
+        self.sum += other.sum
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th quantile (inf if it overflowed)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds + (float('inf'),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+    
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'buckets': {str(bound): count for bound, count in zip(self.bounds + ('inf',), self.counts)}
+        }
+
+
+class Metrics:
+    """
+    Thread-safe run metrics: a latency histogram per pipeline stage, a fetch
+    latency histogram per host, and counters such as bytes fetched and retries.
+    
+    The scraper, analyzer and report generator record into it; the result is
+    exported with write_json() or served in the Prometheus text format by serve().
+    """
+    
+    def __init__(self, buckets: Tuple[float, ...] = METRICS_BUCKETS):
+        self.buckets = buckets
+        self.stages: Dict[str, Histogram] = {}
+        self.hosts: Dict[str, Histogram] = {}
+        self.counters = Counter()
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+    
+    def observe(self, stage: str, seconds: float):
+        with self._lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+    
+    def observe_host(self, host: str, seconds: float):
+        """Record one page fetch's total latency for its host"""
+        with self._lock:
+            histogram = self.hosts.get(host)
+            if histogram is None:
+                histogram = self.hosts[host] = Histogram(self.buckets)
+            histogram.observe(seconds)
+    
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+    
+    @contextmanager
+    def time(self, stage: str):
+        """Record the time spent in the with block under stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+    
+    def merge_stages(self, stages: Dict[str, Histogram]):
+        """Add stage histograms recorded elsewhere, e.g. in an analysis worker process"""
+        with self._lock:
+            for stage, other in stages.items():
+                histogram = self.stages.get(stage)
+                if histogram is None:
+                    histogram = self.stages[stage] = Histogram(self.buckets)
+                histogram.merge(other)
+    
+    def take_stages(self) -> Dict[str, Histogram]:
+        """Return the stage histograms recorded so far and start new ones"""
+        with self._lock:
+            stages, self.stages = self.stages, {}
+        return stages
+    
+    def begin_request(self):
+        """Start attributing connection setup time in this thread to a new request"""
+        self._local.connection_time = 0.0
+    
+    def add_connection_time(self, seconds: float):
+        self._local.connection_time = getattr(self._local, 'connection_time', 0.0) + seconds
+    
+    def connection_time(self) -> float:
+        """DNS and connect time spent by this thread since begin_request()"""
+        return getattr(self._local, 'connection_time', 0.0)
+    
+    def to_dict(self) -> Dict:
+        with self._lock:
+            ordered = sorted(self.stages, key=lambda stage: (STAGES.index(stage) if stage in STAGES else len(STAGES), stage))
+            return {
+                'elapsed_seconds': round(time.time() - self.started, 3),
+                'stages': {stage: self.stages[stage].to_dict() for stage in ordered},
+                'counters': dict(self.counters),
+                'hosts': {host: histogram.to_dict() for host, histogram in sorted(self.hosts.items())}
+            }
+    
+    def write_json(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+    
+    def _histogram_lines(self, name: str, label: str, histograms: Iterable[Tuple[str, Histogram]]):
+        yield f'# TYPE {name} histogram'
+        for value, histogram in histograms:
+            labels = f'{label}="{value}"'
+            cumulative = 0
+            for bound, count in zip(histogram.bounds + ('+Inf',), histogram.counts):
+                cumulative += count
+                yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+            yield f'{name}_sum{{{labels}}} {histogram.sum}'
+            yield f'{name}_count{{{labels}}} {histogram.count}'
+    
+    def prometheus_text(self) -> str:
+        """
+        Metrics in the Prometheus text exposition format. Per-host histograms
+        are left out, since a large company list would produce one series per site.
+        """
+        with self._lock:
+            lines = list(self._histogram_lines(f'{METRIC_PREFIX}_stage_seconds', 'stage', sorted(self.stages.items())))
+            for name, value in sorted(self.counters.items()):
+                lines.append(f'# TYPE {METRIC_PREFIX}_{name}_total counter')
+                lines.append(f'{METRIC_PREFIX}_{name}_total {value}')
+        lines.append(f'{METRIC_PREFIX}_elapsed_seconds {time.time() - self.started:.3f}')
+        return '\n'.join(lines) + '\n'
+    
+    def serve(self, port: int, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+        """Serve prometheus_text() at /metrics from a daemon thread; call shutdown() on the result to stop"""
+        metrics = self
+    
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus_text().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+    
+            def log_message(self, format, *args):
+                pass
+    
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
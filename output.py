@@ -1,74 +1,264 @@
-import pandas as pd
-from typing import List, Dict
-import xlsxwriter
-from xlsxwriter.utility import xl_rowcol_to_cell
+import os
+import warnings
+from contextlib import nullcontext
+from itertools import islice
+from typing import TYPE_CHECKING, List, Dict, Iterable, Optional, Sequence, Tuple
+
+from company_loader import company_key
+from metrics import Metrics
+from records import CompanyAnalysis, FLAG_BITS, segment_label
+from report_sinks import ReportSink, CsvSink, ArrowSink, ParquetSink, widen_float_columns
+from project_constants import REPORT_BATCH_ROWS
+
+# pandas, numpy and xlsxwriter are imported when a report is built or written,
+# so importing this module (and main.py) stays fast
+if TYPE_CHECKING:
+    import pandas as pd
+    import xlsxwriter
+
+# Report columns, in output order
+COLUMNS = [
+    'Company Name', 'Website', 'Website Accessible', 'Category', 'Relevance Score',
+    'Is F&B', 'Mentions Probiotics', 'Health Segments', 'Is Manufacturer',
+    'Is Brand', 'Is Distributor', 'Scraping Status'
+]
+
+# Boolean columns colored green/red
+BOOLEAN_COLUMNS = ['Is F&B', 'Mentions Probiotics', 'Is Manufacturer', 'Is Brand', 'Is Distributor']
+
+# Analysis flag behind each boolean column
+FLAG_FIELDS = {
+    'Is F&B': 'is_fb',
+    'Mentions Probiotics': 'mentions_probiotics',
+    'Is Manufacturer': 'is_manufacturer',
+    'Is Brand': 'is_brand',
+    'Is Distributor': 'is_distributor'
+}
+
+# Excel's limits per worksheet; later websites are written as plain text, later rows are dropped
+MAX_WORKSHEET_URLS = 65530
+MAX_WORKSHEET_ROWS = 1048575
+
+# Output formats and the suffix replacing the report's .xlsx extension
+FORMAT_SUFFIXES = {
+    'xlsx': '.xlsx',
+    'parquet': '.parquet',   # Directory partitioned by Category
+    'arrow': '.arrow',
+    'csv': '.csv.gz'
+}
+
+
+class ExcelSink(ReportSink):
+    """
+    Formatted .xlsx report written in xlsxwriter's constant_memory mode.
+    Each row is flushed to disk once the next one starts, so memory use does
+    not grow with the number of rows.
+    """
+    
+    def __init__(self, path: str, columns: List[str], report: 'ReportGenerator'):
+        super().__init__(path, columns)
+        self.rows_dropped = 0
+        self._report = report
+        import xlsxwriter
+        self._workbook = xlsxwriter.Workbook(self._tmp_path, {
+            'constant_memory': True,
+            'strings_to_urls': False,
+            'strings_to_formulas': False
+        })
+        self._worksheet = self._workbook.add_worksheet('Prospects')
+        self._worksheet.write_row(0, 0, columns, report._header_format(self._workbook))
+        self._url_col = columns.index('Website') if 'Website' in columns else None
+    
+    def write_values(self, values: Sequence):
+        """Write one row of cell values in column order"""
+        if self.rows_written == MAX_WORKSHEET_ROWS:
+            self.rows_dropped += 1
+            return
+        
+        self.rows_written += 1
+        self._worksheet.write_row(self.rows_written, 0, values)
+        
+        # Link websites while under Excel's limit instead of dropping cells beyond it
+        if self._url_col is not None and self.rows_written <= MAX_WORKSHEET_URLS:
+            url = values[self._url_col]
+            if isinstance(url, str) and url.startswith(('http://', 'https://')):
+                self._worksheet.write_url(self.rows_written, self._url_col, url)
+    
+    def write_batch(self, rows: List[Dict]):
+        for row in rows:
+            self.write_values([row[column] for column in self.columns])
+    
+    def write_frame(self, df: 'pd.DataFrame'):
+        df = widen_float_columns(df[self.columns])
+        
+        # Missing values become empty cells
+        if df.isna().values.any():
+            df = df.astype(object).where(df.notna(), None)
+        
+        for values in df.itertuples(index=False, name=None):
+            self.write_values(values)
+    
+    def _finish(self):
+        self._report._format_worksheet(self._workbook, self._worksheet, self.rows_written, self.columns)
+        self._workbook.close()
+    
+    def close(self):
+        super().close()
+        if self.rows_dropped:
+            warnings.warn(f"{self.rows_dropped} rows exceed Excel's sheet size and are missing from {self.path}; "
+                          f"use the parquet, arrow or csv output for the full report")
+
 
 class ReportGenerator:
     """
     Handles generation of Excel reports with formatted output.
     Implements conditional formatting and professional styling.
+    Reports can also be written as Parquet, Arrow or gzip CSV, alongside or
+    instead of Excel.
     """
     
-    def __init__(self, output_path: str = 'probiotics_prospects.xlsx'):
+    def __init__(self, output_path: str = 'probiotics_prospects.xlsx', formats: Iterable[str] = ('xlsx',),
+                 metrics: Optional[Metrics] = None):
+        """
+        Args:
+            output_path: Excel report path; other formats replace its extension
+            formats: Any of FORMAT_SUFFIXES
+            metrics: Optional run metrics receiving report writing time
+        """
+        self.formats = list(formats)
+        unknown = [fmt for fmt in self.formats if fmt not in FORMAT_SUFFIXES]
+        if unknown:
+            raise ValueError(f"Unknown report formats {unknown}, expected some of {list(FORMAT_SUFFIXES)}")
         self.output_path = output_path
+        self.metrics = metrics
+    
+    def _timed(self):
+        """Context manager timing report work, when metrics are recorded"""
+        return self.metrics.time('report') if self.metrics is not None else nullcontext()
+    
+    def output_paths(self) -> Dict[str, str]:
+        """Path written for each selected format"""
+        base = os.path.splitext(self.output_path)[0]
+        return {fmt: self.output_path if fmt == 'xlsx' else base + FORMAT_SUFFIXES[fmt]
+                for fmt in self.formats}
     
-    def create_dataframe(self, companies: List[Dict], scraped_data: Dict, analysis_results: Dict) -> pd.DataFrame:
+    def _open_sinks(self, columns: List[str]) -> List[ReportSink]:
+        sink_types = {'parquet': ParquetSink, 'arrow': ArrowSink, 'csv': CsvSink}
+        sinks = []
+        try:
+            for fmt, path in self.output_paths().items():
+                if fmt == 'xlsx':
+                    sinks.append(ExcelSink(path, columns, self))
+                else:
+                    sinks.append(sink_types[fmt](path, columns))
+        except Exception:
+            self._close_sinks(sinks, failed=True)
+            raise
+        return sinks
+    
+    def _close_sinks(self, sinks: List[ReportSink], failed: bool = False):
+        """Finalize the sinks' reports, or discard them all when writing failed"""
+        for sink in sinks:
+            if failed:
+                sink.discard()
+            else:
+                sink.close()
+    
+    def build_row(self, company: Dict, scraped: Dict, analysis: CompanyAnalysis) -> Dict:
         """
-        Combine all data into a structured DataFrame.
+        Build a single report row for a company.
         
         Args:
-            companies: Original list of companies
-            scraped_data: Scraped website data
-            analysis_results: Categorization results
+            company: Company with 'name' and 'website' keys
+            scraped: Scraped website data for the company
+            analysis: Categorized analysis of the company
             
         Returns:
-            pandas DataFrame with all relevant information
+            Dictionary keyed by report column name
         """
-        rows = []
-        
-        for company in companies:
-            name = company['name']
-            website = company['website']
-            
-            scraped = scraped_data.get(name, {})
-            analysis = analysis_results.get(name, {})
-            
-            row = {
-                'Company Name': name,
-                'Website': website,
-                'Website Accessible': scraped.get('status', '') == 'success',
-                'Category': analysis.get('category', ''),
-                'Relevance Score': analysis.get('relevance_score', 0),
-                'Is F&B': analysis.get('is_fb', False),
-                'Mentions Probiotics': analysis.get('mentions_probiotics', False),
-                'Health Segments': analysis.get('health_segments', 'None'),
-                'Is Manufacturer': analysis.get('is_manufacturer', False),
-                'Is Brand': analysis.get('is_brand', False),
-                'Is Distributor': analysis.get('is_distributor', False),
-                'Scraping Status': scraped.get('status', 'unknown')
-            }
-            
-            rows.append(row)
-        
-        return pd.DataFrame(rows)
+        return {
+            'Company Name': company['name'],
+            'Website': company['website'],
+            'Website Accessible': scraped.get('status', '').startswith('success'),
+            'Category': analysis.category,
+            'Relevance Score': analysis.relevance_score,
+            'Is F&B': analysis.is_fb,
+            'Mentions Probiotics': analysis.mentions_probiotics,
+            'Health Segments': analysis.health_segments,
+            'Is Manufacturer': analysis.is_manufacturer,
+            'Is Brand': analysis.is_brand,
+            'Is Distributor': analysis.is_distributor,
+            'Scraping Status': scraped.get('status', 'unknown')
+        }
     
-    def generate_excel_report(self, df: pd.DataFrame):
+    def create_dataframe(self, companies: List[Dict], scraped_data: Dict,
+                         analysis_results: Dict[Tuple[str, str], CompanyAnalysis]) -> 'pd.DataFrame':
         """
-        Generate formatted Excel report with conditional formatting.
+        Combine all data into a structured DataFrame.
         
         Args:
-            df: DataFrame with analysis results
+            companies: Original list of companies
+            scraped_data: Scraped website data per company_key() (only 'status' is used)
+            analysis_results: Categorized analysis per company_key()
+            
+        Returns:
+            pandas DataFrame with all relevant information, with the same
+            values as build_row() gives per company: bool flag columns, a
+            float32 'Relevance Score' and categorical 'Category' and
+            'Scraping Status'
         """
-        # Create Excel writer
-        writer = pd.ExcelWriter(self.output_path, engine='xlsxwriter')
-        df.to_excel(writer, index=False, sheet_name='Prospects')
+        import numpy as np
+        import pandas as pd
         
-        # Get workbook and worksheet objects
-        workbook = writer.book
-        worksheet = writer.sheets['Prospects']
+        for results in (scraped_data, analysis_results):
+            if results and not isinstance(next(iter(results)), tuple):
+                raise TypeError("Results must be keyed by company_key(), not by company name")
         
-        # Define formats
-        header_format = workbook.add_format({
+        n = len(companies)
+        names = np.empty(n, dtype=object)
+        websites = np.empty(n, dtype=object)
+        segments = np.empty(n, dtype=object)
+        accessible = np.zeros(n, dtype=bool)
+        scores = np.zeros(n, dtype=np.float32)
+        flags = np.zeros(n, dtype=np.uint8)
+        unanalyzed = CompanyAnalysis()
+        
+        # Categorical codes, numbered in order of first appearance
+        category_codes = np.empty(n, dtype=np.int32)
+        status_codes = np.empty(n, dtype=np.int32)
+        categories = {}
+        statuses = {}
+        
+        for i, company in enumerate(companies):
+            name = company['name']
+            key = company_key(company)
+            scraped = scraped_data.get(key, {})
+            analysis = analysis_results.get(key, unanalyzed)
+            status = scraped.get('status', 'unknown')
+            
+            names[i] = name
+            websites[i] = company['website']
+            accessible[i] = status.startswith('success')
+            category_codes[i] = categories.setdefault(analysis.category, len(categories))
+            scores[i] = analysis.relevance_score
+            flags[i] = analysis.flags
+            segments[i] = segment_label(analysis.segments)
+            status_codes[i] = statuses.setdefault(status, len(statuses))
+        
+        columns = {
+            'Company Name': names,
+            'Website': websites,
+            'Website Accessible': accessible,
+            'Category': pd.Categorical.from_codes(category_codes, list(categories)),
+            'Relevance Score': scores,
+            'Health Segments': segments,
+            'Scraping Status': pd.Categorical.from_codes(status_codes, list(statuses))
+        }
+        columns.update({column: (flags & FLAG_BITS[flag]) != 0 for column, flag in FLAG_FIELDS.items()})
+        return pd.DataFrame({column: columns[column] for column in COLUMNS}, copy=False)
+    
+    def _header_format(self, workbook: 'xlsxwriter.Workbook'):
+        return workbook.add_format({
             'bold': True,
             'text_wrap': True,
             'valign': 'top',
@@ -76,7 +266,21 @@ class ReportGenerator:
             'font_color': 'white',
             'border': 1
         })
+    
+    def _format_worksheet(self, workbook: 'xlsxwriter.Workbook', worksheet, n_rows: int, columns: List[str]):
+        """
+        Apply column widths, conditional formatting, autofilter and frozen header.
+        
+        Conditional formats cover exactly the written data rows and only use
+        plain cell-value rules, which Excel evaluates without recalculating
+        the sheet.
         
+        Args:
+            workbook: Workbook owning the worksheet
+            worksheet: Prospects worksheet
+            n_rows: Number of data rows written
+            columns: Column names written, in order
+        """
         # Score formats
         score_format_high = workbook.add_format({'bg_color': '#C6EFCE', 'font_color': '#006100'})
         score_format_med = workbook.add_format({'bg_color': '#FFEB9C', 'font_color': '#9C6500'})
@@ -86,10 +290,6 @@ class ReportGenerator:
         true_format = workbook.add_format({'bg_color': '#C6EFCE', 'font_color': '#006100'})
         false_format = workbook.add_format({'bg_color': '#FFC7CE', 'font_color': '#9C0006'})
         
-        # Apply header formatting
-        for col_num, value in enumerate(df.columns.values):
-            worksheet.write(0, col_num, value, header_format)
-        
         # Set column widths
         worksheet.set_column('A:A', 25)  # Company Name
         worksheet.set_column('B:B', 30)  # Website
@@ -105,49 +305,138 @@ class ReportGenerator:
         worksheet.set_column('L:L', 30)  # Scraping Status
         
         # Apply conditional formatting
-        # Relevance Score
-        worksheet.conditional_format('E2:E100', {
-            'type': 'cell',
-            'criteria': '>=',
-            'value': 3.5,
-            'format': score_format_high
-        })
-        worksheet.conditional_format('E2:E100', {
-            'type': 'cell',
-            'criteria': 'between',
-            'minimum': 2,
-            'maximum': 3.49,
-            'format': score_format_med
-        })
-        worksheet.conditional_format('E2:E100', {
-            'type': 'cell',
-            'criteria': '<',
-            'value': 2,
-            'format': score_format_low
-        })
-        
-        # Boolean columns
-        for col in ['F', 'G', 'I', 'J', 'K']:
-            col_letter = col
-            range_start = xl_rowcol_to_cell(1, ord(col) - ord('A'))
-            range_end = xl_rowcol_to_cell(100, ord(col) - ord('A'))
+        if n_rows:
+            # Relevance Score
+            if 'Relevance Score' in columns:
+                col = columns.index('Relevance Score')
+                worksheet.conditional_format(1, col, n_rows, col, {
+                    'type': 'cell',
+                    'criteria': '>=',
+                    'value': 3.5,
+                    'format': score_format_high
+                })
+                worksheet.conditional_format(1, col, n_rows, col, {
+                    'type': 'cell',
+                    'criteria': 'between',
+                    'minimum': 2,
+                    'maximum': 3.49,
+                    'format': score_format_med
+                })
+                worksheet.conditional_format(1, col, n_rows, col, {
+                    'type': 'cell',
+                    'criteria': '<',
+                    'value': 2,
+                    'format': score_format_low
+                })
             
-            worksheet.conditional_format(f'{range_start}:{range_end}', {
-                'type': 'formula',
-                'criteria': '=INDIRECT("RC", FALSE)=TRUE',
-                'format': true_format
-            })
-            worksheet.conditional_format(f'{range_start}:{range_end}', {
-                'type': 'formula',
-                'criteria': '=INDIRECT("RC", FALSE)=FALSE',
-                'format': false_format
-            })
+            # Boolean columns
+            for name in BOOLEAN_COLUMNS:
+                if name not in columns:
+                    continue
+                col = columns.index(name)
+                worksheet.conditional_format(1, col, n_rows, col, {
+                    'type': 'cell',
+                    'criteria': '==',
+                    'value': 'TRUE',
+                    'format': true_format
+                })
+                worksheet.conditional_format(1, col, n_rows, col, {
+                    'type': 'cell',
+                    'criteria': '==',
+                    'value': 'FALSE',
+                    'format': false_format
+                })
         
         # Add autofilter
-        worksheet.autofilter(0, 0, len(df), len(df.columns) - 1)
+        worksheet.autofilter(0, 0, n_rows, len(columns) - 1)
         
         # Freeze header row
         worksheet.freeze_panes(1, 0)
+    
+    def write_report(self, df: 'pd.DataFrame'):
+        """
+        Write a report DataFrame in every selected format.
+        
+        Args:
+            df: DataFrame with analysis results
+        """
+        with self._timed():
+            sinks = self._open_sinks(list(df.columns))
+            try:
+                for sink in sinks:
+                    sink.write_frame(df)
+            except BaseException:
+                self._close_sinks(sinks, failed=True)
+                raise
+            self._close_sinks(sinks)
+    
+    def write_rows(self, rows: Iterable[Dict], batch_rows: int = REPORT_BATCH_ROWS) -> int:
+        """
+        Write report rows in every selected format as they arrive, in batches
+        of batch_rows, without building a DataFrame.
+        
+        Args:
+            rows: Iterable of rows as returned by build_row()
+            batch_rows: Rows handed to the sinks at a time
+            
+        Returns:
+            Number of data rows written
+        """
+        rows = iter(rows)
+        n_rows = 0
+        with self._timed():
+            sinks = self._open_sinks(COLUMNS)
+        try:
+            while True:
+                # Only the writes are timed; pulling rows runs the rest of the pipeline
+                batch = list(islice(rows, batch_rows))
+                if not batch:
+                    break
+                with self._timed():
+                    for sink in sinks:
+                        sink.write_batch(batch)
+                n_rows += len(batch)
+        except BaseException:
+            # A run that fails part way keeps the previous report
+            self._close_sinks(sinks, failed=True)
+            raise
+        with self._timed():
+            self._close_sinks(sinks)
+        
+        return n_rows
+    
+    def generate_excel_report(self, df: 'pd.DataFrame'):
+        """
+        Generate formatted Excel report with conditional formatting.
+        
+        Args:
+            df: DataFrame with analysis results
+        """
+        sink = ExcelSink(self.output_path, list(df.columns), self)
+        try:
+            sink.write_frame(df)
+        except BaseException:
+            sink.discard()
+            raise
+        sink.close()
+    
+    def stream_excel_report(self, rows: Iterable[Dict]) -> int:
+        """
+        Write report rows to Excel as they arrive, without building a DataFrame.
+        
+        Args:
+            rows: Iterable of rows as returned by build_row()
+            
+        Returns:
+            Number of data rows written
+        """
+        sink = ExcelSink(self.output_path, COLUMNS, self)
+        try:
+            for row in rows:
+                sink.write_values([row[column] for column in COLUMNS])
+        except BaseException:
+            sink.discard()
+            raise
+        sink.close()
         
-        # Save the Excel file
-        writer.close()
\ No newline at end of file
+        return sink.rows_written
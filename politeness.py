@@ -0,0 +1,230 @@
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+from project_constants import (HOST_RATE_LIMIT, HOST_RATE_BURST, HOST_RATE_MIN, ROBOTS_CACHE_SIZE,
+                               ROBOTS_CACHE_TTL, ROBOTS_ERROR_TTL)
+
+
+class _Bucket:
+    __slots__ = ('tokens', 'updated', 'rate', 'burst', 'slowed_until')
+    
+    def __init__(self, tokens: float, updated: float, rate: float, burst: float):
+        self.tokens = tokens
+        self.updated = updated
+        self.rate = rate
+        self.burst = burst
+        self.slowed_until = 0.0
+    
+    def refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class HostRateLimiter:
+    """
+    Token bucket per host shared by all fetches, so that however many workers
+    scrape one site, it gets at most `rate` requests per second after an initial
+    burst. Requests reserve their slot up front: a host's waiting callers are
+    spread evenly over the following seconds instead of retrying together.
+    
+    A host's rate can only be lowered, by its robots.txt Crawl-delay or by
+    answering 429 Too Many Requests, and stays lowered for the rest of the run.
+    Without a default rate, hosts are unlimited except for their Crawl-delay.
+    """
+    
+    def __init__(self, rate: Optional[float] = HOST_RATE_LIMIT, burst: int = HOST_RATE_BURST,
+                 min_rate: float = HOST_RATE_MIN, max_hosts: int = 10000):
+        """
+        Args:
+            rate: Sustained requests per second per host, or None for no limit
+            burst: Requests a host may get at once before the rate applies
+            min_rate: Lowest rate 429 responses can push a host down to
+            max_hosts: Idle hosts at the default rate are forgotten beyond this many
+        """
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_hosts = max_hosts
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, _Bucket] = {}
+    
+    def _bucket(self, host: str, now: float) -> _Bucket:
+        """The host's bucket refilled up to now; call with the lock held"""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            if len(self._buckets) >= self.max_hosts:
+                self._forget_idle(now)
+            bucket = self._buckets[host] = _Bucket(self.burst, now, self.rate, self.burst)
+        else:
+            bucket.refill(now)
+        return bucket
+    
+    def _forget_idle(self, now: float):
+        """Drop buckets that are full again at the default rate; they behave like new ones"""
+        for host, bucket in list(self._buckets.items()):
+            if bucket.rate == self.rate and bucket.tokens + (now - bucket.updated) * bucket.rate >= bucket.burst:
+                del self._buckets[host]
+    
+    def reserve(self, host: str) -> float:
+        """Take a request slot for host; returns the seconds to wait before sending it"""
+        if self.rate is None and host not in self._buckets:
+            return 0.0
+        with self._lock:
+            bucket = self._bucket(host, time.monotonic())
+            bucket.tokens -= 1
+            return -bucket.tokens / bucket.rate if bucket.tokens < 0 else 0.0
+    
+    def acquire(self, host: str) -> float:
+        """Block until a request to host may be sent; returns the seconds waited"""
+        delay = self.reserve(host)
+        if delay:
+            time.sleep(delay)
+        return delay
+    
+    def set_rate(self, host: str, rate: float):
+        """Lower a host's rate, e.g. to its robots.txt Crawl-delay, with no bursts"""
+        with self._lock:
+            now = time.monotonic()
+            if self.rate is None and host not in self._buckets:
+                self._buckets[host] = _Bucket(1, now, rate, 1)
+                return
+            bucket = self._bucket(host, now)
+            if rate < bucket.rate:
+                bucket.rate = rate
+                bucket.burst = 1
+                bucket.tokens = min(bucket.tokens, 1)
+    
+    def throttled(self, host: str, pause: float = 0.0):
+        """
+        Record a 429 from host: halve its rate, stop bursts and hold back its
+        next request for pause seconds (the server's Retry-After, if it sent one).
+        
+        Requests already in flight when the rate was halved answer 429 as well;
+        those count as the same slowdown, not one halving each.
+        """
+        if self.rate is None:
+            return
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(host, now)
+            if now >= bucket.slowed_until:
+                bucket.rate = max(self.min_rate, bucket.rate / 2)
+                bucket.burst = 1
+            bucket.tokens = min(bucket.tokens, 0.0, 1 - pause * bucket.rate)
+            bucket.slowed_until = max(bucket.slowed_until, now + pause + 1 / bucket.rate)
+
+
+def robots_url(url: str) -> str:
+    """robots.txt URL of the site serving url"""
+    parts = urlsplit(url)
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}/robots.txt"
+
+
+def parse_robots(status: Optional[int], body: bytes) -> RobotFileParser:
+    """
+    Rules from a robots.txt response. Following RFC 9309, a missing file
+    (4xx) allows everything and a server error (5xx) disallows everything.
+    No response at all (status None: connection error, timeout) allows
+    everything, a deliberate deviation from the RFC's complete disallow so
+    that a site whose robots.txt merely times out stays in the report.
+    RobotsCache keeps both error cases for its short error_ttl only.
+    """
+    rules = RobotFileParser()
+    if status is not None and 200 <= status < 300:
+        rules.parse(body.decode('utf-8', 'replace').splitlines())
+    elif status is not None and status >= 500:
+        rules.disallow_all = True
+    else:
+        rules.allow_all = True
+    return rules
+
+
+class RobotsCache:
+    """
+    In-memory LRU cache of parsed robots.txt files per site, each kept for ttl
+    seconds. Shared by all fetches; when several threads need the same site's
+    rules, one fetches them while the others wait for the result.
+    
+    Rules from a failed robots.txt download (server error, connection error
+    or timeout; see parse_robots) are kept for error_ttl seconds only, so the
+    site's real rules are picked up soon after it recovers.
+    """
+    
+    def __init__(self, max_entries: int = ROBOTS_CACHE_SIZE, ttl: float = ROBOTS_CACHE_TTL,
+                 error_ttl: float = ROBOTS_ERROR_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        # Counts of cache 'hits', 'misses' (files fetched and stored) and LRU 'evictions'
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, Tuple[float, RobotFileParser]]' = OrderedDict()
+        self._loading: Dict[str, threading.Event] = {}
+    
+    def lookup(self, url: str) -> Optional[RobotFileParser]:
+        """Cached rules for url's site, or None if they are missing or expired"""
+        key = robots_url(url)
+        with self._lock:
+            return self._lookup(key)
+    
+    def _lookup(self, key: str) -> Optional[RobotFileParser]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        self._entries.move_to_end(key)
+        self.stats['hits'] += 1
+        return entry[1]
+    
+    def store(self, url: str, status: Optional[int], body: bytes) -> RobotFileParser:
+        """
+        Parse and cache the robots.txt response for url's site; status None
+        means the download failed. Failures and server errors are cached for
+        error_ttl seconds only.
+        """
+        key = robots_url(url)
+        rules = parse_robots(status, body)
+        ttl = self.ttl if status is not None and status < 500 else self.error_ttl
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, rules)
+            self.stats['misses'] += 1
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+        return rules
+    
+    def get(self, url: str, fetch: Callable[[str], Tuple[Optional[int], bytes]]) -> RobotFileParser:
+        """
+        Rules for url's site, fetched and cached on a miss.
+    
+        Args:
+            url: Any URL on the site
+            fetch: Called with the robots.txt URL; returns (status, body), with
+                status None if the file could not be downloaded
+    
+        Raises:
+            Whatever else fetch raised (nothing is cached then)
+        """
+        key = robots_url(url)
+        while True:
+            with self._lock:
+                rules = self._lookup(key)
+                if rules is not None:
+                    return rules
+                loading = self._loading.get(key)
+                if loading is None:
+                    loading = self._loading[key] = threading.Event()
+                    break
+            loading.wait()
+    
+        try:
+            status, body = fetch(key)
+            return self.store(key, status, body)
+        finally:
+            with self._lock:
+                del self._loading[key]
+            loading.set()
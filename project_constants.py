@@ -83,6 +83,9 @@ COMPANIES = [
     {'name': 'BioGaia', 'website': 'https://www.biogaia.com'}
 ]
 
+# Company list files (`main.py --input`) are read this many rows at a time
+INPUT_CHUNK_ROWS = 10000
+
 # Request headers for web scraping
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -93,6 +96,88 @@ HEADERS = {
 # Timeout settings
 TIMEOUT = 15
 
+# Upper bounds (seconds) of the latency histogram buckets in run metrics
+METRICS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRICS_PATH = 'run_metrics.json'
+
+# Response downloads: pages are streamed and cut off at MAX_DOWNLOAD_BYTES
+# (after decompression); other content types are skipped before reading the body
+MAX_DOWNLOAD_BYTES = 2 * 1024 ** 2
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+
+# Retries: exponential backoff with jitter, capped; Retry-After (429/503) honored up to a limit
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+RETRY_AFTER_MAX = 120.0
+
+# Per-host circuit breaker: consecutive failures before a host is skipped, and for how long
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 120.0
+
+# Connection pooling: concurrent keep-alive connections allowed per host
+MAX_CONNECTIONS_PER_HOST = 4
+
+# Per-host rate limit shared by all fetches (token bucket); 429 responses halve a host's rate
+HOST_RATE_LIMIT = 2.0    # Sustained requests per second per host
+HOST_RATE_BURST = 4      # Requests a host may get at once before the rate applies
+HOST_RATE_MIN = 0.5      # Lowest rate after repeated 429s
+
+# robots.txt rules, parsed once per site and kept in an in-memory LRU cache.
+# Rules are matched against ROBOTS_USER_AGENT, not the rotating browser
+# User-Agent the requests send (see WebsiteScraper._check_robots).
+ROBOTS_USER_AGENT = 'ProbioticsProspector'
+ROBOTS_CACHE_SIZE = 10000       # Sites kept
+ROBOTS_CACHE_TTL = 3600         # Seconds before a site's robots.txt is fetched again
+ROBOTS_ERROR_TTL = 60           # Seconds a robots.txt server error (disallow) or download failure (allow) is kept
+ROBOTS_MAX_BYTES = 512 * 1024   # Rules beyond this size are ignored
+ROBOTS_MAX_CRAWL_DELAY = 10.0   # Longer Crawl-delay values are capped to this
+
+# DNS cache shared by all connections; names that do not exist are remembered for less time
+DNS_CACHE_TTL = 300
+DNS_FAILURE_TTL = 60
+DNS_CACHE_SIZE = 100000
+# Optional concurrent pre-resolution of company host names (`main.py --preresolve-dns`)
+DNS_RESOLVE_WORKERS = 64       # Concurrent lookups
+DNS_PRERESOLVE_BATCH = 1000    # Companies whose hosts are resolved at a time
+
+# Persistent HTTP response cache
+CACHE_PATH = 'http_cache.sqlite'
+CACHE_TTL = 24 * 3600               # Seconds before a cached page is revalidated
+CACHE_MAX_BYTES = 512 * 1024 ** 2   # Evict least recently used pages above this size
+
+# Per-company site crawl budgets
+CRAWL_MAX_DEPTH = 2        # Links followed away from the homepage
+CRAWL_MAX_PAGES = 10       # Pages fetched per company, homepage included
+CRAWL_SITE_WORKERS = 3     # Concurrent page fetches within one site
+
+# Stored analysis results, reused while page text and rules are unchanged
+ANALYSIS_STORE_PATH = 'analysis_store.sqlite'
+
+# Per-company analysis snapshot of the last run, re-scored by `main.py --rescore`
+ANALYSIS_SNAPSHOT_PATH = 'analysis_snapshot.parquet'
+SNAPSHOT_BATCH_ROWS = 10000    # Rows per Parquet row group
+
+# Scraped page text kept by `main.py --keep-corpus`: UTF-8 data file plus CORPUS_PATH + '.idx'
+CORPUS_PATH = 'page_corpus.bin'
+
+# Journal of finished companies, for continuing an interrupted run with `main.py --resume`
+RUN_JOURNAL_PATH = 'run_journal.sqlite'
+
+# Async scraping engine limits
+ASYNC_MAX_CONCURRENCY = 500    # Requests in flight across all hosts
+ASYNC_MAX_PER_HOST = 2         # Requests in flight per host
+
+# Streaming pipeline: scraped pages waiting for analysis
+STREAM_QUEUE_SIZE = 20
+
+# Report rows handed to the output sinks at a time
+REPORT_BATCH_ROWS = 10000
+
+# Process-pool analysis: companies sent to a worker per batch
+ANALYSIS_BATCH_SIZE = 32
+
 # Scoring weights for different factors
 SCORING_WEIGHTS = {
     'is_fb': 2,
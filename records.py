@@ -0,0 +1,144 @@
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from project_constants import KEYWORDS
+
+# Bit of each boolean analysis flag in CompanyAnalysis.flags
+FLAG_BITS = {
+    'is_fb': 1,
+    'mentions_probiotics': 2,
+    'is_manufacturer': 4,
+    'is_brand': 8,
+    'is_distributor': 16
+}
+
+# Health segments in detection order; segment i is bit 1 << i of CompanyAnalysis.segments
+SEGMENTS = tuple(KEYWORDS['health_segments'])
+SEGMENT_BITS = {segment: 1 << i for i, segment in enumerate(SEGMENTS)}
+
+
+def segment_mask(names: Iterable[str]) -> int:
+    """Bitmask of health segment names"""
+    mask = 0
+    for name in names:
+        mask |= SEGMENT_BITS[name]
+    return mask
+
+
+@lru_cache(maxsize=None)
+def segment_names(mask: int) -> Tuple[str, ...]:
+    """Health segment names in a bitmask, in SEGMENTS order"""
+    return tuple(segment for segment in SEGMENTS if mask & SEGMENT_BITS[segment])
+
+
+@lru_cache(maxsize=None)
+def segment_label(mask: int) -> str:
+    """'Health Segments' report value of a bitmask: 'a, b', or 'None' when empty"""
+    return ', '.join(segment_names(mask)) or 'None'
+
+
+def _flag(name: str) -> property:
+    bit = FLAG_BITS[name]
+    
+    def get(self) -> bool:
+        return bool(self.flags & bit)
+    
+    get.__name__ = name
+    return property(get)
+
+
+class CompanyAnalysis:
+    """
+    Analysis and categorization result of one company.
+    
+    TextAnalyzer.analyze_text() fills in the flags, health segments and matched
+    keywords, and CompanyCategorizer.categorize_company() the category and
+    score, on the same record. The five boolean flags and the health segments
+    are bitmasks, so a result costs one small slotted object (plus the matched
+    keyword lists) instead of several nested dicts. to_dict() and from_dict()
+    convert losslessly to and from the combined result dict stored by
+    AnalysisStore and RunJournal.
+    """
+    
+    __slots__ = ('flags', 'segments', 'matched_keywords', 'category', 'relevance_score')
+    
+    def __init__(self, flags: int = 0, segments: int = 0, matched_keywords: Optional[Dict[str, List[str]]] = None,
+                 category: str = '', relevance_score: float = 0):
+        """
+        Args:
+            flags: FLAG_BITS of the flags that are set
+            segments: Bitmask of detected health segments (see SEGMENT_BITS)
+            matched_keywords: Matched keywords of each keyword category that matched
+            category: Category set by categorization; '' while uncategorized
+            relevance_score: Score set by categorization
+        """
+        self.flags = flags
+        self.segments = segments
+        self.matched_keywords = matched_keywords if matched_keywords is not None else {}
+        self.category = category
+        self.relevance_score = relevance_score
+    
+    is_fb = _flag('is_fb')
+    mentions_probiotics = _flag('mentions_probiotics')
+    is_manufacturer = _flag('is_manufacturer')
+    is_brand = _flag('is_brand')
+    is_distributor = _flag('is_distributor')
+    
+    @property
+    def segment_names(self) -> Tuple[str, ...]:
+        return segment_names(self.segments)
+    
+    @property
+    def segment_count(self) -> int:
+        return bin(self.segments).count('1')
+    
+    @property
+    def health_segments(self) -> str:
+        """Detected health segments as written to the report"""
+        return segment_label(self.segments)
+    
+    @property
+    def is_relevant(self) -> bool:
+        return self.category != 'Not Relevant'
+    
+    def to_dict(self) -> Dict:
+        """Combined analysis/categorization dict, as results were stored before records"""
+        return {
+            'is_fb': self.is_fb,
+            'mentions_probiotics': self.mentions_probiotics,
+            'health_segments': self.health_segments,
+            'is_manufacturer': self.is_manufacturer,
+            'is_brand': self.is_brand,
+            'is_distributor': self.is_distributor,
+            'matched_keywords': self.matched_keywords,
+            'category': self.category,
+            'relevance_score': self.relevance_score,
+            'is_relevant': self.is_relevant
+        }
+    
+    @classmethod
+    def from_dict(cls, result: Dict) -> 'CompanyAnalysis':
+        """Record of a dict written by to_dict()"""
+        flags = 0
+        for name, bit in FLAG_BITS.items():
+            if result.get(name):
+                flags |= bit
+        segments = result.get('health_segments', 'None')
+        names = [] if segments in ('', 'None') else segments.split(', ')
+        return cls(flags, segment_mask(names), dict(result.get('matched_keywords', {})),
+                   result.get('category', ''), result.get('relevance_score', 0))
+    
+    def __reduce__(self):
+        # Positional state only, so results pickle compactly on their way back from analysis workers
+        return CompanyAnalysis, (self.flags, self.segments, self.matched_keywords,
+                                 self.category, self.relevance_score)
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CompanyAnalysis):
+            return NotImplemented
+        return self.__reduce__()[1] == other.__reduce__()[1]
+    
+    def __repr__(self) -> str:
+        flags = [name for name, bit in FLAG_BITS.items() if self.flags & bit]
+        return (f"CompanyAnalysis(category={self.category!r}, relevance_score={self.relevance_score!r}, "
+                f"flags={flags}, health_segments={self.health_segments!r})")
@@ -0,0 +1,205 @@
+import csv
+import gzip
+import os
+import shutil
+from itertools import islice
+from typing import TYPE_CHECKING, Dict, List
+from urllib.parse import quote
+
+import lazy_pyarrow as arrow
+from lazy_pyarrow import load_pyarrow
+from project_constants import REPORT_BATCH_ROWS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Typed report columns; every other column is a string
+BOOL_COLUMNS = frozenset(['Website Accessible', 'Is F&B', 'Mentions Probiotics', 'Is Manufacturer',
+                          'Is Brand', 'Is Distributor'])
+FLOAT_COLUMNS = frozenset(['Relevance Score'])
+
+# Scores are rounded to this many decimals by the categorizer
+SCORE_DECIMALS = 2
+
+
+def report_schema(columns: List[str]):
+    """Arrow schema with bool, float64 and string report columns"""
+    def column_type(name):
+        if name in BOOL_COLUMNS:
+            return arrow.pa.bool_()
+        if name in FLOAT_COLUMNS:
+            return arrow.pa.float64()
+        return arrow.pa.string()
+    return arrow.pa.schema([(name, column_type(name)) for name in columns])
+
+
+def widen_float_columns(df: 'pd.DataFrame') -> 'pd.DataFrame':
+    """
+    Return float32 report columns as the float64 values they were rounded to,
+    so 2.33 is written as 2.33 rather than 2.3299999237060547.
+    """
+    import numpy as np
+    widened = {
+        name: df[name].astype(np.float64).round(SCORE_DECIMALS)
+        for name in FLOAT_COLUMNS if name in df.columns and df[name].dtype == np.float32
+    }
+    return df.assign(**widened) if widened else df
+
+
+class ReportSink:
+    """
+    Destination for report rows. Rows arrive in batches as the pipeline
+    produces them, and the output is finalized by close().
+    
+    Output is written next to path and only replaces an earlier report there
+    on close(); discard() drops it instead, e.g. when the run fails.
+    """
+    
+    def __init__(self, path: str, columns: List[str]):
+        self.path = path
+        self.columns = columns
+        self.rows_written = 0
+        self._tmp_path = f'{path}.tmp'
+    
+    def write_batch(self, rows: List[Dict]):
+        """Write rows keyed by column name"""
+        raise NotImplementedError
+    
+    def write_frame(self, df: 'pd.DataFrame'):
+        """Write a whole DataFrame of report rows"""
+        rows = iter(widen_float_columns(df[self.columns]).to_dict('records'))
+        while True:
+            batch = list(islice(rows, REPORT_BATCH_ROWS))
+            if not batch:
+                return
+            self.write_batch(batch)
+    
+    def _finish(self):
+        """Complete the output file at _tmp_path"""
+        raise NotImplementedError
+    
+    def close(self):
+        """Finish the output and replace the report at path with it"""
+        self._finish()
+        os.replace(self._tmp_path, self.path)
+    
+    def discard(self):
+        """Drop the output, leaving any earlier report at path in place"""
+        self._finish()
+        os.remove(self._tmp_path)
+
+
+class CsvSink(ReportSink):
+    """gzip-compressed CSV with a header row"""
+    
+    def __init__(self, path: str, columns: List[str], compresslevel: int = 6):
+        super().__init__(path, columns)
+        self._file = gzip.open(self._tmp_path, 'wt', newline='', encoding='utf-8', compresslevel=compresslevel)
+        self._writer = csv.DictWriter(self._file, fieldnames=columns, extrasaction='ignore')
+        self._writer.writeheader()
+    
+    def write_batch(self, rows: List[Dict]):
+        self._writer.writerows(rows)
+        self.rows_written += len(rows)
+    
+    def _finish(self):
+        self._file.close()
+
+
+class _ArrowSink(ReportSink):
+    """Base for sinks that convert batches to Arrow tables with the typed report schema"""
+    
+    def __init__(self, path: str, columns: List[str]):
+        if not load_pyarrow():
+            raise ImportError(f"Writing {type(self).__name__} output requires pyarrow")
+        super().__init__(path, columns)
+        self.schema = report_schema(columns)
+    
+    def write_batch(self, rows: List[Dict]):
+        if rows:
+            self._write_table(arrow.pa.Table.from_pylist(rows, schema=self.schema))
+    
+    def write_frame(self, df: 'pd.DataFrame'):
+        if len(df):
+            self._write_table(arrow.pa.Table.from_pandas(widen_float_columns(df[self.columns]),
+                                                         schema=self.schema, preserve_index=False))
+    
+    def _write_table(self, table):
+        raise NotImplementedError
+
+
+class ArrowSink(_ArrowSink):
+    """Arrow IPC file, which readers can memory-map without copying"""
+    
+    def __init__(self, path: str, columns: List[str]):
+        super().__init__(path, columns)
+        self._writer = arrow.pa.ipc.new_file(self._tmp_path, self.schema)
+    
+    def _write_table(self, table):
+        self._writer.write_table(table)
+        self.rows_written += table.num_rows
+    
+    def _finish(self):
+        self._writer.close()
+
+
+class ParquetSink(_ArrowSink):
+    """
+    Hive-partitioned Parquet dataset: one directory per value of the partition
+    column (path/Category=F%26B/part-0.parquet), each file written in row
+    groups as batches arrive. The partition column is kept in the path only.
+    The dataset is built next to path and replaces it on close(), so no
+    partitions of an earlier report are left behind.
+    """
+    
+    def __init__(self, path: str, columns: List[str], partition_by: str = 'Category',
+                 compression: str = 'zstd'):
+        super().__init__(path, columns)
+        self.partition_by = partition_by if partition_by in columns else None
+        self.compression = compression
+        self._writers = {}
+        shutil.rmtree(self._tmp_path, ignore_errors=True)
+        os.makedirs(self._tmp_path)
+        if self.partition_by is not None:
+            self._file_schema = self.schema.remove(self.schema.get_field_index(self.partition_by))
+        else:
+            self._file_schema = self.schema
+    
+    def _writer(self, value):
+        writer = self._writers.get(value)
+        if writer is None:
+            directory = self._tmp_path
+            if self.partition_by is not None:
+                directory = os.path.join(self._tmp_path, f"{self.partition_by}={quote(str(value), safe='')}")
+                os.makedirs(directory, exist_ok=True)
+            writer = arrow.pq.ParquetWriter(os.path.join(directory, 'part-0.parquet'), self._file_schema,
+                                            compression=self.compression)
+            self._writers[value] = writer
+        return writer
+    
+    def _write_table(self, table):
+        self.rows_written += table.num_rows
+        if self.partition_by is None:
+            self._writer(None).write_table(table)
+            return
+    
+        keys = table[self.partition_by]
+        rest = table.drop_columns([self.partition_by])
+        for value in keys.unique().to_pylist():
+            mask = arrow.pc.equal(keys, value)
+            self._writer(value).write_table(rest.filter(mask))
+    
+    def _finish(self):
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+    
+    def close(self):
+        self._finish()
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.replace(self._tmp_path, self.path)
+    
+    def discard(self):
+        self._finish()
+        shutil.rmtree(self._tmp_path, ignore_errors=True)
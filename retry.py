@@ -0,0 +1,188 @@
+import random
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from project_constants import (RETRY_ATTEMPTS, RETRY_BASE_DELAY, RETRY_MAX_DELAY, RETRY_AFTER_MAX,
+                               BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT)
+
+# Statuses worth retrying; Retry-After is honored for the rate limiting ones
+RETRYABLE_STATUSES = frozenset([408, 425, 429, 500, 502, 503, 504])
+RETRY_AFTER_STATUSES = frozenset([429, 503])
+
+# Resolver answers that mean the name does not exist, as opposed to a lookup timeout
+PERMANENT_DNS_ERRORS = frozenset(code for code in (getattr(socket, 'EAI_NONAME', None),
+                                                    getattr(socket, 'EAI_NODATA', None)) if code is not None)
+
+
+def network_errors() -> Tuple[type, ...]:
+    """
+    Connection, timeout and protocol errors of requests, asyncio and aiohttp.
+    aiohttp is not imported here: if nothing has imported it, none of its
+    errors can have been raised.
+    """
+    aiohttp = sys.modules.get('aiohttp')
+    return (OSError, aiohttp.ClientError) if aiohttp is not None else (OSError,)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of contacting a host whose circuit breaker is open"""
+
+
+def _causes(error: BaseException):
+    """The error and every exception it wraps (requests, urllib3 and aiohttp style)"""
+    stack, seen = [error], set()
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        yield current
+        linked = [current.__cause__, current.__context__,
+                  getattr(current, 'reason', None), getattr(current, 'os_error', None)]
+        linked.extend(current.args)
+        stack.extend(e for e in linked if isinstance(e, BaseException))
+
+
+def http_status(error: BaseException) -> Optional[int]:
+    """HTTP status of a requests HTTPError or aiohttp ClientResponseError"""
+    response = getattr(error, 'response', None)
+    if response is not None and getattr(response, 'status_code', None) is not None:
+        return response.status_code
+    status = getattr(error, 'status', None)
+    return status if isinstance(status, int) else None
+
+
+def is_dns_failure(error: BaseException) -> bool:
+    """Did the host name fail to resolve (not merely time out)?"""
+    return any(isinstance(e, socket.gaierror) and e.errno in PERMANENT_DNS_ERRORS for e in _causes(error))
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds requested by a Retry-After header on a 429/503 response, if any"""
+    if http_status(error) not in RETRY_AFTER_STATUSES:
+        return None
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or getattr(error, 'headers', None) or {}
+    value = headers.get('Retry-After')
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Transient network errors and retryable HTTP statuses are retried; other
+    HTTP errors (404, 403, ...), unresolvable hosts, open circuits and
+    content errors are permanent.
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    status = http_status(error)
+    if status is not None:
+        return status in RETRYABLE_STATUSES
+    if is_dns_failure(error):
+        return False
+    # requests errors are OSErrors; malformed URLs are also ValueErrors
+    return isinstance(error, network_errors()) and not isinstance(error, ValueError)
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed fetch is retried and after how long: exponential
+    backoff with full jitter, or the server's Retry-After for 429/503 (capped).
+    """
+    
+    def __init__(self, attempts: int = RETRY_ATTEMPTS, base_delay: float = RETRY_BASE_DELAY,
+                 max_delay: float = RETRY_MAX_DELAY, retry_after_max: float = RETRY_AFTER_MAX):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_after_max = retry_after_max
+    
+    def delay(self, attempt: int, error: BaseException) -> Optional[float]:
+        """
+        Seconds to wait before retrying, or None if the error is not worth retrying.
+    
+        Args:
+            attempt: Number of the attempt that just failed, starting at 0; callers
+                stop once attempts have been made
+            error: The exception it raised
+        """
+        if not is_retryable(error):
+            return None
+    
+        requested = retry_after(error)
+        if requested is not None:
+            return requested if requested <= self.retry_after_max else None
+    
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker shared by all fetches.
+    After failure_threshold consecutive transient failures a host's circuit
+    opens and requests to it fail immediately; after reset_timeout one trial
+    request is let through, which closes the circuit again if it succeeds.
+    """
+    
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        # Counts of 'opened' circuits and 'rejected' requests
+        self.stats = Counter()
+    
+        self._lock = threading.Lock()
+        self._failures: Dict[str, int] = {}
+        self._open_until: Dict[str, float] = {}
+        self._trial_running = set()
+    
+    def before_request(self, host: str):
+        """
+        Raises:
+            CircuitOpenError if the host's circuit is open
+        """
+        with self._lock:
+            open_until = self._open_until.get(host)
+            if open_until is None:
+                return
+            if time.monotonic() >= open_until and host not in self._trial_running:
+                self._trial_running.add(host)  # Half-open: let one request through
+                return
+            self.stats['rejected'] += 1
+        raise CircuitOpenError(f'circuit open for {host}')
+    
+    def record(self, host: str, error: Optional[BaseException] = None):
+        """Record the outcome of a request: None for success, otherwise the error it raised"""
+        if isinstance(error, CircuitOpenError):
+            return
+        # Only failures that say something about the host's health count
+        unhealthy = error is not None and (is_retryable(error) or is_dns_failure(error))
+    
+        with self._lock:
+            self._trial_running.discard(host)
+            if not unhealthy:
+                self._failures.pop(host, None)
+                self._open_until.pop(host, None)
+                return
+    
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if failures >= self.failure_threshold:
+                if host not in self._open_until:
+                    self.stats['opened'] += 1
+                self._open_until[host] = time.monotonic() + self.reset_timeout
+    
\ No newline at end of file
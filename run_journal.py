@@ -0,0 +1,102 @@
+import json
+import sqlite3
+import threading
+from collections import Counter
+from typing import Dict, Iterable, Iterator, Tuple
+
+from records import CompanyAnalysis
+
+
+class RunJournal:
+    """
+    Durable SQLite journal of a run's finished companies, so an interrupted
+    run can be resumed without scraping or analyzing them again.
+    
+    Each company's scrape result (without page text) and analysis result is
+    committed as soon as it completes. A journal opened without resume starts
+    empty; with resume, filter_pending() skips the companies already scraped
+    successfully and replayed() yields their stored results instead. Companies
+    recorded with any other status (network errors, timeouts, ...) are
+    scraped again.
+    """
+    
+    REPLAY_BATCH = 500
+    
+    def __init__(self, path: str, resume: bool = False):
+        self.path = path
+        # Counts of 'recorded', 'resumed' and 'retried' companies
+        self.stats = Counter()
+    
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS companies (
+                name TEXT NOT NULL,
+                website TEXT NOT NULL,
+                company TEXT NOT NULL,
+                scraped TEXT NOT NULL,
+                analysis TEXT NOT NULL,
+                replay INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (name, website)
+            )
+        """)
+        if resume:
+            self._db.execute("UPDATE companies SET replay = 0")
+        else:
+            self._db.execute("DELETE FROM companies")
+        self._db.commit()
+    
+    def filter_pending(self, companies: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Yield the companies not finished yet, or whose scrape did not succeed.
+        Successfully finished ones are marked for replayed() instead;
+        companies are consumed lazily.
+        """
+        for company in companies:
+            key = (company['name'], company['website'])
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT scraped FROM companies WHERE name = ? AND website = ?", key
+                ).fetchone()
+                done = row is not None and json.loads(row[0]).get('status', '').startswith('success')
+                if done:
+                    self._db.execute("UPDATE companies SET replay = 1 WHERE name = ? AND website = ?", key)
+            if done:
+                self.stats['resumed'] += 1
+            else:
+                if row is not None:
+                    self.stats['retried'] += 1
+                yield company
+    
+    def record(self, company: Dict, scraped: Dict, analysis: CompanyAnalysis):
+        """Commit one finished company's scrape and analysis results"""
+        scraped = {key: value for key, value in scraped.items() if key != 'content'}
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO companies VALUES (?, ?, ?, ?, ?, 0)",
+                (company['name'], company['website'], json.dumps(company),
+                 json.dumps(scraped), json.dumps(analysis.to_dict()))
+            )
+            self._db.commit()
+        self.stats['recorded'] += 1
+    
+    def replayed(self) -> Iterator[Tuple[Dict, Dict, CompanyAnalysis]]:
+        """(company, scraped_data, analysis) for each company skipped by filter_pending()"""
+        with self._lock:
+            cursor = self._db.execute(
+                "SELECT company, scraped, analysis FROM companies WHERE replay = 1"
+            )
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(self.REPLAY_BATCH)
+            if not rows:
+                return
+            for company, scraped, analysis in rows:
+                yield json.loads(company), json.loads(scraped), CompanyAnalysis.from_dict(json.loads(analysis))
+    
+    def close(self):
+        with self._lock:
+            self._db.commit()
+            self._db.close()
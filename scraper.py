@@ -1,13 +1,127 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
 from bs4 import BeautifulSoup
 import re
 from urllib.parse import urlparse
-from fake_useragent import UserAgent
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import count, islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import heapq
+import socket
 import time
+import warnings
 
-from project_constants import HEADERS, TIMEOUT
+from company_loader import company_key
+from crawler import SiteCrawler
+from dns_cache import DnsCache
+from extractor import STREAM_EXTRACTOR_AVAILABLE, extract_page, normalize_text
+from http_cache import ResponseCache
+from metrics import Metrics
+from politeness import HostRateLimiter, RobotsCache
+from retry import CircuitBreaker, RetryPolicy, http_status, network_errors, retry_after
+from user_agents import UserAgentPool
+from project_constants import (HEADERS, TIMEOUT, MAX_CONNECTIONS_PER_HOST, MAX_DOWNLOAD_BYTES,
+                               DOWNLOAD_CHUNK_SIZE, HTML_CONTENT_TYPES, HOST_RATE_LIMIT, ROBOTS_USER_AGENT,
+                               ROBOTS_MAX_BYTES, ROBOTS_MAX_CRAWL_DELAY, DNS_PRERESOLVE_BATCH)
+
+# Only advertise brotli when urllib3 can decode it
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = 'gzip, deflate, br'
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip, deflate'
+
+class SkippedResponse(Exception):
+    """Raised for responses that are not worth downloading, e.g. PDFs or images"""
+
+def _batches(items: Iterable, size: int) -> Iterator[List]:
+    """Yield lists of up to size items from any iterable"""
+    items = iter(items)
+    while True:
+        batch = list(islice(items, size))
+        if not batch:
+            return
+        yield batch
+
+try:
+    from urllib3.exceptions import NameResolutionError
+except ImportError:
+    # urllib3 1.x has no NameResolutionError and reports failed lookups as NewConnectionError
+    def NameResolutionError(host: str, conn, reason: socket.gaierror) -> NewConnectionError:
+        return NewConnectionError(conn, f"Failed to resolve '{host}' ({reason})")
+
+class _TimedConnectionMixin:
+    """
+    Records the DNS and connect (TCP and TLS) time of each new connection.
+    The host is resolved here, through the scraper's DNS cache, so the lookup
+    can be timed on its own; the resolved addresses are then tried in order
+    as urllib3 would.
+    """
+    
+    metrics: Metrics = None
+    dns_cache: DnsCache = None
+    
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            addresses = self.dns_cache.resolve(self._dns_host)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        finally:
+            self._dns_time = time.perf_counter() - start
+            self.metrics.add_connection_time(self._dns_time)
+        
+        dns_host = self._dns_host
+        error = None
+        try:
+            for _, address in addresses:
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except NewConnectionError as e:
+                    error = e
+            raise error
+        finally:
+            self._dns_host = dns_host
+    
+    def connect(self):
+        start = time.perf_counter()
+        self._dns_time = 0.0
+        super().connect()
+        elapsed = time.perf_counter() - start - self._dns_time
+        self.metrics.observe('connect', elapsed)
+        self.metrics.add_connection_time(elapsed)
+
+class _TimedAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose connection pools resolve hosts through a DnsCache and
+    record connection setup times in metrics
+    """
+    
+    def __init__(self, metrics: Metrics, dns_cache: DnsCache, **kwargs):
+        # Set first: HTTPAdapter.__init__ calls init_poolmanager
+        self.metrics = metrics
+        self.dns_cache = dns_cache
+        super().__init__(**kwargs)
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        # The subclasses keep urllib3's names, which show up in error messages and so in scraping statuses
+        attrs = {'metrics': self.metrics, 'dns_cache': self.dns_cache, '__module__': HTTPConnection.__module__}
+        http = type(HTTPConnection.__name__, (_TimedConnectionMixin, HTTPConnection), attrs)
+        https = type(HTTPSConnection.__name__, (_TimedConnectionMixin, HTTPSConnection), attrs)
+        pool_attrs = {'__module__': HTTPConnectionPool.__module__}
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': type(HTTPConnectionPool.__name__, (HTTPConnectionPool,), dict(pool_attrs, ConnectionCls=http)),
+            'https': type(HTTPSConnectionPool.__name__, (HTTPSConnectionPool,), dict(pool_attrs, ConnectionCls=https))
+        }
 
 class WebsiteScraper:
     """
@@ -15,9 +129,87 @@ class WebsiteScraper:
     Implements retry logic and parallel processing for efficient scraping.
     """
     
-    def __init__(self, max_workers: int = 5):
+    ENGINES = ('threads', 'async')
+    EXTRACTORS = ('stream', 'bs4')
+    
+    def __init__(self, max_workers: int = 5, engine: str = 'threads', cache: Optional[ResponseCache] = None,
+                 crawl: bool = False, extractor: str = 'stream', max_download_bytes: int = MAX_DOWNLOAD_BYTES,
+                 metrics: Optional[Metrics] = None, host_rate: Optional[float] = HOST_RATE_LIMIT,
+                 respect_robots: bool = True, preresolve_dns: bool = False):
+        """
+        Args:
+            max_workers: Worker threads for the thread pool engine
+            engine: 'threads' or 'async'
+            cache: Optional persistent response cache shared by all fetches
+            crawl: Crawl a bounded set of pages per site instead of the homepage only
+            extractor: 'stream' for the single-pass extractor, or 'bs4' to build
+                a full BeautifulSoup tree per page (same output, slower)
+            max_download_bytes: Pages are cut off after this many (decompressed) bytes
+            metrics: Run metrics receiving per-stage fetch timings, per-host
+                latencies, bytes fetched and retries; a private one by default
+            host_rate: Requests per second allowed per host across all workers,
+                or None for no limit
+            respect_robots: Skip pages disallowed by the site's robots.txt and
+                follow its Crawl-delay
+            preresolve_dns: Resolve the host names of upcoming companies
+                concurrently before fetching them, and fail companies whose
+                domain does not exist with 'failed: dns' without fetching
+        """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown scraping engine '{engine}', expected one of {self.ENGINES}")
+        if extractor not in self.EXTRACTORS:
+            raise ValueError(f"Unknown extractor '{extractor}', expected one of {self.EXTRACTORS}")
+        if crawl and engine != 'threads':
+            raise ValueError("Site crawling is only supported by the 'threads' engine")
+        
         self.max_workers = max_workers
-        self.ua = UserAgent()
+        self.engine = engine
+        if extractor == 'stream' and not STREAM_EXTRACTOR_AVAILABLE:
+            warnings.warn("This bs4 version does not support the streaming extractor; "
+                          "building BeautifulSoup trees instead")
+            extractor = 'bs4'
+        self.extractor = extractor
+        self.cache = cache
+        self.max_download_bytes = max_download_bytes
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.retry_policy = RetryPolicy()
+        self.breaker = CircuitBreaker()
+        self.rate_limiter = HostRateLimiter(host_rate)
+        self.robots = RobotsCache() if respect_robots else None
+        self.dns_cache = DnsCache(metrics=self.metrics)
+        self.preresolve_dns = preresolve_dns
+        self.crawler = SiteCrawler(self) if crawl else None
+        self.ua = UserAgentPool()
+        self.session = self._create_session()
+    
+    def _create_session(self) -> requests.Session:
+        """
+        Create a keep-alive session shared by all worker threads.
+        
+        The adapter keeps a connection pool per host, sized so that no host gets
+        more than MAX_CONNECTIONS_PER_HOST concurrent connections, resolves
+        hosts through the scraper's DNS cache, and records DNS and connect
+        times of new connections in the scraper's metrics.
+        """
+        session = requests.Session()
+        adapter = _TimedAdapter(
+            self.metrics,
+            self.dns_cache,
+            pool_connections=max(self.max_workers, 10),
+            pool_maxsize=min(self.max_workers, MAX_CONNECTIONS_PER_HOST),
+            pool_block=True
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update(HEADERS)
+        session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        return session
+    
+    def close(self):
+        """Close pooled connections and the response cache"""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
         
     def _get_clean_text(self, soup: BeautifulSoup) -> str:
         """Extract and clean text from BeautifulSoup object"""
@@ -26,97 +218,350 @@ class WebsiteScraper:
             element.decompose()
             
         # Get text and clean it
-        text = soup.get_text()
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        return ' '.join(chunk for chunk in chunks if chunk)
+        return normalize_text(soup.get_text())
+    
+    def _parse_page(self, content: bytes, url: str) -> Dict:
+        """Extract title, meta description and main text from a downloaded page"""
+        with self.metrics.time('parse'):
+            if self.extractor == 'stream':
+                return extract_page(content, url)[0]
+            return self._extract_from_soup(BeautifulSoup(content, 'html.parser'), url)
+    
+    def _extract_from_soup(self, soup: BeautifulSoup, url: str) -> Dict:
+        """Build the scraped result dict from a parsed page"""
+        # Get meta data
+        meta_desc = soup.find('meta', attrs={'name': 'description'})
+        description = meta_desc['content'] if meta_desc else ""
+        
+        title = soup.title.string if soup.title else ""
+        
+        # Get main content
+        main_content = ""
+        for tag in ['main', 'article', 'div.content', 'section']:
+            element = soup.find(tag)
+            if element:
+                main_content += self._get_clean_text(element) + " "
+        
+        # If no main content found, use entire page
+        if not main_content.strip():
+            main_content = self._get_clean_text(soup)
+        
+        return {
+            'title': title.strip(),
+            'description': description.strip(),
+            'content': main_content.strip(),
+            'url': url,
+            'status': 'success'
+        }
+    
+    def _failed_result(self, url: str, error) -> Dict:
+        """Result dict for a page that could not be scraped"""
+        outcome = 'skipped' if isinstance(error, SkippedResponse) else 'failed'
+        return {
+            'title': "",
+            'description': "",
+            'content': "",
+            'url': url,
+            'status': f'{outcome}: {str(error)}'
+        }
+    
+    def _mark_truncated(self, result: Dict) -> Dict:
+        """Record in the status that only the first max_download_bytes of the page were used"""
+        result['status'] = f'success: truncated at {self.max_download_bytes} bytes'
+        return result
+    
+    def _check_content_type(self, content_type: Optional[str], allowed: Optional[Tuple[str, ...]] = HTML_CONTENT_TYPES):
+        """Raise SkippedResponse unless the Content-Type header is one of the allowed types"""
+        if allowed is None or not content_type:
+            return
+        media_type = content_type.split(';', 1)[0].strip().lower()
+        if media_type not in allowed:
+            raise SkippedResponse(f'content-type {media_type}')
+    
+    def _read_body(self, response: requests.Response) -> Tuple[bytes, bool]:
+        """
+        Read a streamed response body up to max_download_bytes.
+        
+        Returns:
+            (body, truncated)
+        """
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > self.max_download_bytes:
+                return b''.join(chunks)[:self.max_download_bytes], True
+        return b''.join(chunks), False
+    
+    def _throttle(self, host: str):
+        """Wait for the host's rate limit, recording the time spent waiting"""
+        waited = self.rate_limiter.acquire(host)
+        if waited:
+            self.metrics.observe('throttle', waited)
+    
+    def _fetch_robots(self, url: str) -> Tuple[Optional[int], bytes]:
+        """
+        Download a robots.txt for the robots cache; returns (status, body).
+        
+        A connection error or timeout returns status None (allow everything for
+        a while) instead of raising, so it neither fails the page with a
+        robots.txt error nor counts against the host's circuit breaker; the
+        page fetch itself finds out whether the host is really down.
+        """
+        self._throttle(urlparse(url).netloc.lower())
+        headers = HEADERS.copy()
+        headers['User-Agent'] = self.ua.random
+        try:
+            with self.session.get(url, headers=headers, timeout=TIMEOUT, allow_redirects=True,
+                                  stream=True) as response:
+                body = response.raw.read(ROBOTS_MAX_BYTES, decode_content=True) if response.ok else b''
+        except network_errors():
+            self.metrics.count('robots_errors')
+            return None, b''
+        self.metrics.count('robots_fetched')
+        return response.status_code, body
+    
+    def _check_robots(self, url: str, host: str, rules):
+        """
+        Apply the site's robots.txt rules to a page fetch: slow the host down
+        to its Crawl-delay, and skip the page if it is disallowed.
+        
+        Rules are matched against ROBOTS_USER_AGENT, the crawler's own product
+        token, not the rotating browser User-Agent header actually sent: sites
+        write their rules for crawlers, and a browser string would only match
+        the '*' group (or a group aimed at browsers) anyway.
+        """
+        crawl_delay = rules.crawl_delay(ROBOTS_USER_AGENT)
+        if crawl_delay:
+            self.rate_limiter.set_rate(host, 1 / min(float(crawl_delay), ROBOTS_MAX_CRAWL_DELAY))
+        if not rules.can_fetch(ROBOTS_USER_AGENT, url):
+            self.metrics.count('robots_disallowed')
+            raise SkippedResponse('disallowed by robots.txt')
     
-    def _scrape_single_page(self, url: str, retries: int = 3) -> Optional[Dict]:
-        """Scrape a single webpage with retry logic"""
+    def _throttled(self, host: str, error: BaseException):
+        """Slow down every worker's requests to a host that answered 429"""
+        if http_status(error) == 429:
+            self.rate_limiter.throttled(host, retry_after(error) or 0.0)
+            self.metrics.count('rate_limited')
+    
+    def _fetch_once(self, url: str, content_types: Optional[Tuple[str, ...]]) -> Tuple[bytes, bool]:
+        """
+        Single download attempt for _fetch_page, guarded by the host's circuit
+        breaker and rate limit and by the site's robots.txt
+        """
+        cached = self.cache.get(url) if self.cache is not None else None
+        if cached is not None and cached.fresh:
+            return cached.body, False
+        
+        host = urlparse(url).netloc.lower()
+        self.breaker.before_request(host)
+        
+        # Rotate user agent
+        headers = HEADERS.copy()
+        headers['User-Agent'] = self.ua.random
+        if cached is not None:
+            headers.update(self.cache.validators(cached))
+        
+        metrics = self.metrics
+        try:
+            if self.robots is not None:
+                self._check_robots(url, host, self.robots.get(url, self._fetch_robots))
+            self._throttle(host)
+            start = time.perf_counter()
+            metrics.begin_request()
+            with self.session.get(
+                url, 
+                headers=headers, 
+                timeout=TIMEOUT,
+                allow_redirects=True,
+                stream=True
+            ) as response:
+                # Headers are in; time to first byte excludes new connection setup
+                metrics.observe('ttfb', time.perf_counter() - start - metrics.connection_time())
+                if cached is not None and response.status_code == 304:
+                    content, truncated = cached.body, False
+                    self.cache.refresh(url)
+                else:
+                    response.raise_for_status()
+                    self._check_content_type(response.headers.get('Content-Type'), content_types)
+                    download_start = time.perf_counter()
+                    content, truncated = self._read_body(response)
+                    metrics.observe('download', time.perf_counter() - download_start)
+                    metrics.count('bytes_fetched', len(content))
+                    if self.cache is not None:
+                        self.cache.stats['miss'] += 1
+                        if not truncated:
+                            self.cache.put(url, content, response.headers.get('ETag'),
+                                           response.headers.get('Last-Modified'))
+        except Exception as e:
+            metrics.count('fetch_errors')
+            self._throttled(host, e)
+            self.breaker.record(host, e)
+            raise
+        
+        metrics.observe_host(host, time.perf_counter() - start)
+        metrics.count('pages_fetched')
+        self.breaker.record(host)
+        return content, truncated
+    
+    def _fetch_page(self, url: str, retries: int = 1,
+                    content_types: Optional[Tuple[str, ...]] = HTML_CONTENT_TYPES) -> Tuple[bytes, bool]:
+        """
+        Download a page, or take it from the response cache.
+        
+        The body is streamed: the Content-Type is checked before anything is
+        read, and reading stops once max_download_bytes have arrived.
+        Truncated pages are not cached. With retries > 1 this blocks through
+        the retry policy's backoff; the scraping engines instead make single
+        attempts and reschedule failures themselves.
+        
+        Args:
+            url: Page URL
+            retries: Attempts before giving up
+            content_types: Accepted media types, or None to accept any
+        
+        Returns:
+            (body, truncated)
+        
+        Raises:
+            The last error once attempts run out, or at once for errors that are
+            not worth retrying (unwanted content type, disallowed by robots.txt,
+            404, unknown host, open circuit)
+        """
         for attempt in range(retries):
             try:
-                # Rotate user agent
-                headers = HEADERS.copy()
-                headers['User-Agent'] = self.ua.random
-                
-                response = requests.get(
-                    url, 
-                    headers=headers, 
-                    timeout=TIMEOUT,
-                    allow_redirects=True
-                )
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Get meta data
-                meta_desc = soup.find('meta', attrs={'name': 'description'})
-                description = meta_desc['content'] if meta_desc else ""
-                
-                title = soup.title.string if soup.title else ""
-                
-                # Get main content
-                main_content = ""
-                for tag in ['main', 'article', 'div.content', 'section']:
-                    element = soup.find(tag)
-                    if element:
-                        main_content += self._get_clean_text(element) + " "
-                
-                # If no main content found, use entire page
-                if not main_content.strip():
-                    main_content = self._get_clean_text(soup)
-                
-                return {
-                    'title': title.strip(),
-                    'description': description.strip(),
-                    'content': main_content.strip(),
-                    'url': url,
-                    'status': 'success'
-                }
-                
+                return self._fetch_once(url, content_types)
             except Exception as e:
-                if attempt == retries - 1:
-                    return {
-                        'title': "",
-                        'description': "",
-                        'content': "",
-                        'url': url,
-                        'status': f'failed: {str(e)}'
-                    }
-                time.sleep(1)  # Wait before retry
-                
-        return None
+                delay = self.retry_policy.delay(attempt, e) if attempt + 1 < retries else None
+                if delay is None:
+                    raise
+                self.metrics.count('retries')
+                time.sleep(delay)
     
-    def scrape_websites(self, companies: list) -> Dict[str, Dict]:
+    def _scrape_attempt(self, url: str) -> Dict:
+        """
+        Scrape a single webpage, or crawl the site when crawling is enabled,
+        with one attempt at the page.
+        
+        Raises:
+            The fetch or parse error, for the caller to retry or report
+        """
+        if self.crawler is not None:
+            return self.crawler.crawl(url)
+        
+        content, truncated = self._fetch_page(url)
+        result = self._parse_page(content, url)
+        return self._mark_truncated(result) if truncated else result
+    
+    def _preresolved(self, companies: Iterable[Dict]) -> Iterator[Tuple[Dict, Optional[Dict]]]:
+        """
+        Companies paired with a 'failed: dns' result if their domain does not
+        exist, else None. With preresolve_dns the hosts of every
+        DNS_PRERESOLVE_BATCH companies are resolved concurrently before any of
+        them is handed out; otherwise every company is paired with None.
+        """
+        if not self.preresolve_dns:
+            for company in companies:
+                yield company, None
+            return
+        
+        for batch in _batches(companies, DNS_PRERESOLVE_BATCH):
+            with self.metrics.time('resolve'):
+                missing = self.dns_cache.resolve_all(filter(None, (urlparse(c['website']).hostname for c in batch)))
+            for company in batch:
+                if urlparse(company['website']).hostname in missing:
+                    self.metrics.count('dns_failed')
+                    yield company, self._failed_result(company['website'], 'dns')
+                else:
+                    yield company, None
+    
+    def scrape_websites(self, companies: list) -> Dict[Tuple[str, str], Dict]:
         """
         Scrape multiple websites in parallel.
         
+        Uses a thread pool of max_workers blocking requests, or the asyncio
+        engine when the scraper was created with engine='async'.
+        
         Args:
             companies: List of companies with 'name' and 'website' keys
             
         Returns:
-            Dictionary with company names as keys and scraped data as values
+            Scraped data per company_key() of each company
+        """
+        return {company_key(company): scraped_data for company, scraped_data in self.iter_scrape_websites(companies)}
+    
+    def iter_scrape_websites(self, companies: Iterable[Dict]) -> Iterator[Tuple[Dict, Dict]]:
         """
-        results = {}
+        Scrape websites in parallel, yielding results as they complete.
+        
+        Companies are pulled from the iterable lazily and at most 2 * max_workers
+        pages are in flight or waiting to be consumed, so memory stays bounded
+        however many companies there are. The async engine keeps up to its
+        max_concurrency pages in flight instead, and likewise hands each one
+        over as it completes.
+        
+        Failed attempts that the retry policy allows to be retried wait in a
+        delayed queue instead of sleeping in a worker thread, so workers keep
+        scraping other sites in the meantime. With preresolve_dns, companies
+        whose domain does not exist are yielded as failed without a fetch.
+        
+        Args:
+            companies: Iterable of companies with 'name' and 'website' keys
+            
+        Yields:
+            (company, scraped_data) tuples in completion order
+        """
+        if self.engine == 'async':
+            # Imported lazily so aiohttp is only needed for the async engine
+            from async_scraper import AsyncFetchEngine
+            yield from AsyncFetchEngine(self).iter_scrape_websites(companies)
+            return
+        
+        companies = self._preresolved(companies)
+        max_pending = self.max_workers * 2
         
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_company = {
-                executor.submit(self._scrape_single_page, company['website']): company
-                for company in companies
-            }
+            pending = {}   # future -> (company, attempt)
+            delayed = []   # heap of (due time, tie breaker, company, attempt)
+            order = count()
+            exhausted = False
             
-            for future in as_completed(future_to_company):
-                company = future_to_company[future]
-                try:
-                    scraped_data = future.result()
-                    results[company['name']] = scraped_data
-                except Exception as e:
-                    results[company['name']] = {
-                        'title': "",
-                        'description': "",
-                        'content': "",
-                        'url': company['website'],
-                        'status': f'failed: {str(e)}'
-                    }
-        
-        return results
\ No newline at end of file
+            while True:
+                # Due retries go ahead of new companies
+                now = time.monotonic()
+                while delayed and delayed[0][0] <= now:
+                    _, _, company, attempt = heapq.heappop(delayed)
+                    pending[executor.submit(self._scrape_attempt, company['website'])] = (company, attempt)
+                
+                # Top up the in-flight window; waiting retries count towards a larger bound
+                while not exhausted and len(pending) < max_pending and len(pending) + len(delayed) < 2 * max_pending:
+                    company, failed = next(companies, (None, None))
+                    if company is None:
+                        exhausted = True
+                    elif failed is not None:
+                        yield company, failed
+                    else:
+                        pending[executor.submit(self._scrape_attempt, company['website'])] = (company, 0)
+                
+                if not pending and not delayed:
+                    break
+                
+                timeout = max(0.0, delayed[0][0] - time.monotonic()) if delayed else None
+                if not pending:
+                    time.sleep(timeout)
+                    continue
+                
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    company, attempt = pending.pop(future)
+                    try:
+                        scraped_data = future.result()
+                    except Exception as e:
+                        delay = self.retry_policy.delay(attempt, e)
+                        if delay is not None and attempt + 1 < self.retry_policy.attempts:
+                            self.metrics.count('retries')
+                            heapq.heappush(delayed, (time.monotonic() + delay, next(order), company, attempt + 1))
+                            continue
+                        scraped_data = self._failed_result(company['website'], e)
+                    yield company, scraped_data
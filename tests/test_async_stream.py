@@ -0,0 +1,66 @@
+"""
+The async engine hands results over as they complete, pulling companies only
+as pages finish, instead of scraping the whole list (or batch) first.
+
+Usage:
+    python -m pytest tests
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import pytest
+
+from async_scraper import AsyncFetchEngine
+from scraper import WebsiteScraper
+from fake_web import FakeWebServer
+
+
+def counted(companies, pulled):
+    for company in companies:
+        pulled.append(company)
+        yield company
+
+
+def test_results_stream_with_bounded_lookahead():
+    with FakeWebServer(page_words=50) as server:
+        scraper = WebsiteScraper(engine='async', host_rate=None, respect_robots=False)
+        engine = AsyncFetchEngine(scraper, max_concurrency=4)
+        pulled = []
+        try:
+            results = engine.iter_scrape_websites(counted(server.companies(100), pulled), max_waiting=2)
+            company, data = next(results)
+            assert data['status'] == 'success'
+            assert len(pulled) <= 4 + 2 + 1
+
+            assert len(list(results)) == 99
+            assert len(pulled) == 100
+        finally:
+            scraper.close()
+
+
+def test_stopping_early_cancels_the_rest():
+    with FakeWebServer(page_words=50, latency=0.05) as server:
+        scraper = WebsiteScraper(engine='async', host_rate=None, respect_robots=False)
+        pulled = []
+        try:
+            for _ in scraper.iter_scrape_websites(counted(server.companies(1000), pulled)):
+                break
+        finally:
+            scraper.close()
+
+    assert len(pulled) < 1000
+
+
+def test_company_list_errors_reach_the_consumer():
+    def broken():
+        yield {'name': 'Acme', 'website': 'http://127.0.0.1:1/'}
+        raise OSError('unreadable company list')
+
+    scraper = WebsiteScraper(engine='async', host_rate=None, respect_robots=False)
+    try:
+        with pytest.raises(OSError, match='unreadable'):
+            list(scraper.iter_scrape_websites(broken()))
+    finally:
+        scraper.close()
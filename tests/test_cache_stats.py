@@ -0,0 +1,33 @@
+"""
+Every full download counts as a cache miss, including truncated pages that
+are not stored, with both scraping engines.
+
+Usage:
+    python -m pytest tests
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import pytest
+
+from http_cache import ResponseCache
+from scraper import WebsiteScraper
+from fake_web import FakeWebServer
+
+
+@pytest.mark.parametrize('engine', WebsiteScraper.ENGINES)
+def test_truncated_downloads_count_as_misses(tmp_path, engine):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'))
+    with FakeWebServer(page_words=2000) as server:
+        scraper = WebsiteScraper(engine=engine, cache=cache, max_download_bytes=1000, host_rate=None,
+                                 respect_robots=False)
+        try:
+            results = scraper.scrape_websites(server.companies(3))
+            assert cache.get(server.companies(1)[0]['website']) is None
+        finally:
+            scraper.close()
+
+    assert all(data['status'].startswith('success: truncated') for data in results.values())
+    assert cache.stats['miss'] == 3
@@ -0,0 +1,84 @@
+"""
+Companies that share a name but not a website keep their own results, with
+both scraping engines; rows whose website is malformed are skipped, not fatal.
+
+Usage:
+    python -m pytest tests
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import pytest
+
+from company_loader import CompanyLoader
+from output import ReportGenerator
+from scraper import WebsiteScraper
+from retry import RetryPolicy
+from fake_web import FakeWebServer
+
+
+def test_loader_keeps_same_name_on_different_domains(tmp_path):
+    path = tmp_path / 'companies.csv'
+    path.write_text('name,website\nAcme Foods,acme-foods.com\nAcme Foods,acmefoods.co.uk\n')
+
+    assert [company['website'] for company in CompanyLoader(str(path))] == \
+        ['https://acme-foods.com', 'https://acmefoods.co.uk']
+
+
+def test_same_name_companies_are_reported_separately(tmp_path, monkeypatch):
+    # main configures logging to a file in the working directory
+    monkeypatch.chdir(tmp_path)
+    import main as pipeline
+
+    with FakeWebServer(page_words=50) as server:
+        port = server.server_address[1]
+        reachable = {'name': 'Acme Foods', 'website': f'http://localhost:{port}/company-0'}
+        dead = {'name': 'Acme Foods', 'website': 'http://127.0.0.1:1/'}
+
+        prospector = pipeline.ProbioticsProspector(report_formats=('csv',), host_rate=None, respect_robots=False)
+        prospector.scraper.retry_policy = RetryPolicy(base_delay=0.01, max_delay=0.02)
+        try:
+            df = prospector.process_companies([reachable, dead])
+        finally:
+            prospector.close()
+
+    rows = df.set_index('Website')
+    assert rows.loc[reachable['website'], 'Scraping Status'] == 'success'
+    assert rows.loc[reachable['website'], 'Category'] != 'Not Relevant'
+    assert rows.loc[dead['website'], 'Scraping Status'].startswith('failed')
+    assert rows.loc[dead['website'], 'Category'] == 'Not Relevant'
+
+
+def test_async_engine_pairs_same_name_companies_with_their_pages():
+    with FakeWebServer(page_words=50) as server:
+        companies = [{'name': 'Acme Foods', 'website': f'{server.base_url}/company-{i}'} for i in range(4)]
+        scraper = WebsiteScraper(engine='async', host_rate=None, respect_robots=False)
+        try:
+            streamed = list(scraper.iter_scrape_websites(companies))
+            results = scraper.scrape_websites(companies)
+        finally:
+            scraper.close()
+
+    assert sorted(company['website'] for company, _ in streamed) == [company['website'] for company in companies]
+    for company, data in streamed:
+        assert data['url'].startswith(company['website'])
+    assert sorted(results) == [(company['name'], company['website']) for company in companies]
+    assert all(data['url'].startswith(website) for (_, website), data in results.items())
+
+
+def test_report_rejects_name_keyed_results():
+
+    companies = [{'name': 'Acme Foods', 'website': 'https://acme-foods.com'}]
+    with pytest.raises(TypeError):
+        ReportGenerator(formats=('csv',)).create_dataframe(companies, {'Acme Foods': {'status': 'success'}}, {})
+
+
+def test_loader_skips_malformed_websites(tmp_path):
+    path = tmp_path / 'companies.csv'
+    path.write_text('name,website\nAcme,acme.com:abc\nBeta,http://[beta.com\nGamma,gamma.com:8080\n')
+
+    loader = CompanyLoader(str(path))
+    assert [company['website'] for company in loader] == ['https://gamma.com:8080']
+    assert loader.stats['invalid'] == 2
@@ -0,0 +1,73 @@
+"""
+Resuming a run with the run journal skips companies scraped successfully,
+scrapes failed and unfinished ones again, and writes the same report rows for
+the skipped companies as the earlier run, in batch and streaming mode.
+
+Usage:
+    python -m pytest tests
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import pandas as pd
+import pytest
+
+from retry import RetryPolicy
+from fake_web import FakeWebServer
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    # main configures logging to a file in the working directory
+    monkeypatch.chdir(tmp_path)
+    import main
+    return main
+
+
+def run(pipeline, companies, resume: bool, stream: bool):
+    """Run the pipeline with a journal; returns the CSV report by website and the journal stats"""
+    prospector = pipeline.ProbioticsProspector(report_formats=('csv',), journal_path='journal.sqlite',
+                                               resume=resume, host_rate=None, respect_robots=False)
+    prospector.scraper.retry_policy = RetryPolicy(base_delay=0.01, max_delay=0.02)
+    try:
+        if stream:
+            prospector.process_companies_streaming(companies)
+        else:
+            prospector.process_companies(companies)
+        path = prospector.report_generator.output_paths()['csv']
+        stats = dict(prospector.journal.stats)
+    finally:
+        prospector.close()
+    return pd.read_csv(path).set_index('Website'), stats
+
+
+@pytest.mark.parametrize('stream', [False, True], ids=['batch', 'stream'])
+def test_resume_skips_successful_and_retries_the_rest(pipeline, stream):
+    # A site that is down during the first run and back for the resumed one
+    down = FakeWebServer(page_words=50)
+    port = down.server_address[1]
+    down.server_close()
+    flaky = {'name': 'Flaky Foods', 'website': f'http://127.0.0.1:{port}/company-7'}
+
+    with FakeWebServer(page_words=50) as server:
+        companies = server.companies(3) + [flaky]
+        unreached = {'name': 'Late Foods', 'website': f'{server.base_url}/company-8'}
+
+        first, stats = run(pipeline, companies, resume=False, stream=stream)
+        assert first.loc[flaky['website'], 'Scraping Status'].startswith('failed')
+        assert stats['recorded'] == 4
+
+        served = server.requests_served
+        with FakeWebServer(page_words=50, port=port) as revived:
+            second, stats = run(pipeline, companies + [unreached], resume=True, stream=stream)
+            assert revived.requests_served == 1
+        # Only the company missing from the journal was fetched again
+        assert server.requests_served == served + 1
+
+    assert stats == {'resumed': 3, 'retried': 1, 'recorded': 2}
+    assert sorted(second.index) == sorted(company['website'] for company in companies + [unreached])
+    assert second['Scraping Status'].eq('success').all()
+    done = [company['website'] for company in companies[:3]]
+    pd.testing.assert_frame_equal(second.loc[done], first.loc[done])
@@ -0,0 +1,68 @@
+"""
+A robots.txt that cannot be downloaded allows the site for a while instead of
+failing its pages or tripping its circuit breaker; a server error disallows it
+for a while; Crawl-delay applies even without a host rate limit.
+
+Usage:
+    python -m pytest tests
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import pytest
+import requests
+
+from politeness import HostRateLimiter, RobotsCache
+from scraper import WebsiteScraper
+from fake_web import FakeWebServer
+
+
+def test_unreachable_robots_is_cached_briefly():
+    robots = RobotsCache(ttl=3600, error_ttl=0)
+    rules = robots.store('http://example.com/page', None, b'')
+
+    assert rules.can_fetch('ProbioticsProspector', 'http://example.com/page')
+    assert robots.lookup('http://example.com/page') is None
+
+
+def test_robots_timeout_does_not_fail_page(monkeypatch):
+    with FakeWebServer(page_words=50, robots='User-agent: *\nDisallow: /\n') as server:
+        url = f'http://localhost:{server.server_address[1]}/company-0'
+        scraper = WebsiteScraper(host_rate=None)
+        get = scraper.session.get
+
+        def robots_times_out(request_url, **kwargs):
+            if request_url.endswith('/robots.txt'):
+                raise requests.Timeout('robots.txt timed out')
+            return get(request_url, **kwargs)
+
+        monkeypatch.setattr(scraper.session, 'get', robots_times_out)
+        for _ in range(scraper.breaker.failure_threshold + 1):
+            content, _ = scraper._fetch_once(url, None)
+            assert content
+
+    assert scraper.metrics.counters['robots_errors'] == 1
+    assert scraper.metrics.counters['fetch_errors'] == 0
+    assert not scraper.breaker._failures
+
+
+def test_robots_server_error_disallows_briefly():
+    robots = RobotsCache(ttl=3600, error_ttl=0)
+    rules = robots.store('http://example.com/page', 503, b'')
+
+    assert not rules.can_fetch('ProbioticsProspector', 'http://example.com/page')
+    assert robots.lookup('http://example.com/page') is None
+    assert robots.store('http://example.com/page', 404, b'').can_fetch('ProbioticsProspector',
+                                                                        'http://example.com/page')
+
+
+def test_crawl_delay_applies_without_host_rate():
+    limiter = HostRateLimiter(rate=None)
+    assert limiter.reserve('slow.example') == 0.0
+
+    limiter.set_rate('slow.example', 0.5)
+    assert limiter.reserve('slow.example') == 0.0
+    assert limiter.reserve('slow.example') == pytest.approx(2.0, abs=0.1)
+    assert limiter.reserve('other.example') == 0.0
@@ -0,0 +1,25 @@
+"""
+Failure statuses name urllib3's own connection classes, not the scraper's
+timed subclasses.
+
+Usage:
+    python -m pytest tests
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from retry import RetryPolicy
+from scraper import WebsiteScraper
+
+
+def test_connection_failure_status_keeps_urllib3_names():
+    scraper = WebsiteScraper(host_rate=None, respect_robots=False)
+    scraper.retry_policy = RetryPolicy(attempts=1)
+    try:
+        [(_, data)] = scraper.iter_scrape_websites([{'name': 'Dead', 'website': 'http://127.0.0.1:1/'}])
+    finally:
+        scraper.close()
+
+    assert data['status'].startswith("failed: HTTPConnectionPool(host='127.0.0.1', port=1)")
+    assert 'Timed' not in data['status']
@@ -0,0 +1,81 @@
+"""
+Only a run that finishes its report replaces the analysis snapshot; a failed
+or interrupted run, or one that recorded no rows, keeps the previous one.
+
+Usage:
+    python -m pytest tests
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import pytest
+import pyarrow.parquet as pq
+
+from analysis_snapshot import AnalysisSnapshotWriter
+from report_sinks import CsvSink
+from fake_web import FakeWebServer
+
+
+def run(pipeline, snapshot_path, companies, stream=False):
+    prospector = pipeline.ProbioticsProspector(snapshot_path=snapshot_path, report_formats=('csv',),
+                                               host_rate=None, respect_robots=False)
+    try:
+        if stream:
+            prospector.process_companies_streaming(companies)
+        else:
+            prospector.process_companies(companies)
+    finally:
+        prospector.close()
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    # main configures logging to a file in the working directory
+    monkeypatch.chdir(tmp_path)
+    import main
+    return main
+
+
+def test_failed_streaming_report_keeps_snapshot(pipeline, tmp_path, monkeypatch):
+    snapshot_path = str(tmp_path / 'snapshot.parquet')
+    with FakeWebServer(page_words=50) as server:
+        run(pipeline, snapshot_path, server.companies(10))
+        assert pq.read_table(snapshot_path).num_rows == 10
+
+        def disk_full(self, rows):
+            raise OSError('No space left on device')
+
+        monkeypatch.setattr(CsvSink, 'write_batch', disk_full)
+        with pytest.raises(OSError):
+            run(pipeline, snapshot_path, server.companies(3), stream=True)
+
+    assert pq.read_table(snapshot_path).num_rows == 10
+    assert not os.path.exists(snapshot_path + '.tmp')
+
+
+def test_interrupted_batch_run_keeps_snapshot(pipeline, tmp_path, monkeypatch):
+    snapshot_path = str(tmp_path / 'snapshot.parquet')
+    with FakeWebServer(page_words=50) as server:
+        run(pipeline, snapshot_path, server.companies(10))
+
+        def interrupt(self, data):
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(pipeline.ProbioticsProspector, '_analyze_company', interrupt)
+        with pytest.raises(KeyboardInterrupt):
+            run(pipeline, snapshot_path, server.companies(3))
+
+    assert pq.read_table(snapshot_path).num_rows == 10
+
+
+def test_run_without_rows_keeps_snapshot(pipeline, tmp_path):
+    snapshot_path = str(tmp_path / 'snapshot.parquet')
+    with FakeWebServer(page_words=50) as server:
+        run(pipeline, snapshot_path, server.companies(10))
+
+    AnalysisSnapshotWriter(snapshot_path).close()
+
+    assert pq.read_table(snapshot_path).num_rows == 10
+    assert not os.path.exists(snapshot_path + '.tmp')